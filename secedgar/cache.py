@@ -0,0 +1,324 @@
+"""Persistent HTTP cache for :class:`secedgar.client.NetworkClient` metadata requests."""
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from secedgar.utils import add_quarter, get_month, make_path
+
+IMMUTABLE = float("inf")
+"""TTL for responses that never change and never need to be revalidated."""
+
+
+CLOSED_QUARTER_GRACE_DAYS = 7
+"""Days after the end of a quarter during which its index files may still be rebuilt."""
+
+
+def closed_quarter_ttl(match, stored_at=None):
+    """TTL policy treating index files of quarters that have ended as immutable.
+
+    Only entries stored more than :data:`CLOSED_QUARTER_GRACE_DAYS` days after the end of
+    their quarter are immutable. Entries stored while the quarter was open, or before EDGAR
+    had finished rebuilding its index files, may be incomplete and are always revalidated.
+
+    Args:
+        match (re.Match): Match with year as first group and quarter as second group.
+        stored_at (float, optional): Time (seconds since epoch) at which the entry was
+            stored. Defaults to None, which uses the current time.
+
+    Returns:
+        float: ``IMMUTABLE`` if entry was stored after quarter ended, otherwise 0
+        (always revalidate).
+    """
+    year, quarter = int(match.group(1)), int(match.group(2))
+    next_year, next_quarter = add_quarter(year, quarter)
+    next_quarter_start = datetime.date(next_year, get_month(next_quarter), 1)
+    if stored_at is None:
+        stored_at = time.time()
+    stored_on = datetime.date.fromtimestamp(stored_at)
+    if stored_on >= next_quarter_start + datetime.timedelta(days=CLOSED_QUARTER_GRACE_DAYS):
+        return IMMUTABLE
+    return 0
+
+
+DEFAULT_TTL_POLICIES = [
+    (r"Archives/edgar/(?:full|daily)-index/(\d{4})/QTR(\d)/", closed_quarter_ttl),
+    (r"Archives/edgar/Feed/(\d{4})/QTR(\d)/", closed_quarter_ttl),
+]
+"""Default TTL policies. Indexes and listings stored after their quarter ended are immutable."""
+
+
+class CacheEntry:
+    """Cached response body along with its metadata.
+
+    Args:
+        url (str): URL of cached response.
+        body (bytes): Body of response.
+        meta (dict): Headers and validators of response.
+    """
+
+    def __init__(self, url, body, meta):
+        self.url = url
+        self.body = body
+        self.meta = meta
+
+    @property
+    def stored_at(self):
+        """float: Time (seconds since epoch) at which the entry was stored or revalidated."""
+        return self.meta["stored_at"]
+
+    @property
+    def validators(self):
+        """dict: Conditional request headers to revalidate entry."""
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        return headers
+
+    def to_response(self):
+        """Build ``requests.Response`` from entry.
+
+        Returns:
+            response (requests.Response): Response with cached status, headers and body.
+        """
+        response = requests.Response()
+        response.status_code = self.meta.get("status_code", 200)
+        response.headers = CaseInsensitiveDict(self.meta.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response._content = self.body
+        response._content_consumed = True
+        return response
+
+
+class HTTPCache:
+    """On-disk cache of HTTP responses revalidated with conditional requests.
+
+    Responses are stored with their ``ETag`` and ``Last-Modified`` validators. While an
+    entry is fresh according to its TTL policy, it is returned without any request. Once
+    stale, it is revalidated using ``If-None-Match``/``If-Modified-Since`` so unchanged
+    responses are not downloaded again. When the total size of cached bodies exceeds
+    ``max_size``, the least recently used entries are evicted.
+
+    Several processes can share a cache directory. Entries written by another process are
+    picked up when they are looked up, and entries another process has evicted are treated
+    as missing. Each process only counts the entries it knows of towards ``max_size``.
+
+    Args:
+        directory (str): Directory to store cached responses in.
+        max_size (int, optional): Maximum number of bytes of response bodies to keep.
+            Defaults to 1 GiB.
+        ttl_policies (list of tuples, optional): List of ``(pattern, ttl)`` pairs. The first
+            pattern found in a URL (using ``re.search``) decides for how many seconds its
+            entry is fresh. ``ttl`` can be a number, :data:`IMMUTABLE`, or a callable given
+            the ``re.Match`` and the time the entry was stored (seconds since epoch, or None
+            if not stored yet) and returning either. Defaults to :data:`DEFAULT_TTL_POLICIES`.
+        default_ttl (float, optional): TTL for URLs not matching any policy. Defaults to 0,
+            which revalidates entries on every request.
+
+    Examples:
+        .. code-block:: python
+
+            from secedgar.cache import HTTPCache
+            from secedgar.client import NetworkClient
+
+            cache = HTTPCache("~/.cache/secedgar", ttl_policies=[(r"browse-edgar", 3600)])
+            client = NetworkClient(user_agent="Name (email)", cache=cache)
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, directory, max_size=2 ** 30, ttl_policies=None, default_ttl=0):
+        self._directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        if ttl_policies is None:
+            ttl_policies = DEFAULT_TTL_POLICIES
+        self._ttl_policies = [(re.compile(pattern), ttl) for pattern, ttl in ttl_policies]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._index = OrderedDict()  # key -> body size, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        make_path(self._directory, exist_ok=True)
+        self._load_index()
+
+    @property
+    def directory(self):
+        """str: Directory where cached responses are stored."""
+        return self._directory
+
+    @property
+    def size(self):
+        """int: Total number of bytes of cached response bodies."""
+        with self._lock:
+            return sum(self._index.values())
+
+    @property
+    def stats(self):
+        """dict: Counters for hits, misses, revalidations and evictions."""
+        with self._stats_lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "revalidations": self.revalidations,
+                    "evictions": self.evictions}
+
+    def record_hit(self):
+        """Count a response served from the cache."""
+        with self._stats_lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a response which had to be fetched."""
+        with self._stats_lock:
+            self.misses += 1
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self._directory, key)
+        return base + ".body", base + ".json"
+
+    def _load_index(self):
+        """Load existing entries, least recently used first.
+
+        The modification time of an entry's metadata file is its last access time.
+        """
+        entries = []
+        for filename in os.listdir(self._directory):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[:-len(".json")]
+            body_path, meta_path = self._paths(key)
+            try:
+                entries.append((os.path.getmtime(meta_path), key, os.path.getsize(body_path)))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+
+    def ttl(self, url, stored_at=None):
+        """Get number of seconds for which an entry for ``url`` is fresh.
+
+        Args:
+            url (str): URL to get TTL for.
+            stored_at (float, optional): Time (seconds since epoch) at which the entry was
+                stored. Defaults to None, which uses the current time.
+
+        Returns:
+            float: TTL in seconds. May be :data:`IMMUTABLE`.
+        """
+        for pattern, ttl in self._ttl_policies:
+            match = pattern.search(url)
+            if match:
+                return ttl(match, stored_at) if callable(ttl) else ttl
+        return self.default_ttl
+
+    def is_fresh(self, entry):
+        """Whether entry can be used without revalidating it."""
+        return time.time() - entry.stored_at < self.ttl(entry.url, entry.stored_at)
+
+    def get(self, url):
+        """Get cached entry for url.
+
+        Args:
+            url (str): Full URL (including query string).
+
+        Returns:
+            Union[CacheEntry, NoneType]: Entry if cached, otherwise None.
+        """
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            # Read from disk even if not indexed, as another process may have stored it
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                with open(body_path, "rb") as f:
+                    body = f.read()
+                os.utime(meta_path)  # record access for LRU order across processes
+            except (OSError, ValueError):
+                self._index.pop(key, None)
+                return None
+            self._index[key] = len(body)
+            self._index.move_to_end(key)
+        return CacheEntry(url, body, meta)
+
+    def put(self, url, response):
+        """Store response for url.
+
+        Args:
+            url (str): Full URL (including query string).
+            response (requests.Response): Successful response to store.
+        """
+        body = response.content
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": {k: v for k, v in response.headers.items()
+                        if k.lower() in ("content-type", "etag", "last-modified")},
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "size": len(body),
+        }
+        self._write(self._key(url), body, meta)
+
+    def refresh(self, entry):
+        """Mark entry as revalidated (e.g. after a ``304 Not Modified`` response)."""
+        with self._stats_lock:
+            self.revalidations += 1
+        self._write(self._key(entry.url), None, entry.meta)
+
+    def _write(self, key, body, meta):
+        body_path, meta_path = self._paths(key)
+        meta["stored_at"] = time.time()
+        with self._lock:
+            if body is not None:
+                tmp_path = "{0}.{1}.tmp".format(body_path, threading.get_ident())
+                with open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, body_path)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+            self._index[key] = meta["size"]
+            self._index.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until cache fits in ``max_size``."""
+        total = sum(self._index.values())
+        while total > self.max_size and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            with self._stats_lock:
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            for key in list(self._index):
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            self._index.clear()
@@ -7,12 +7,56 @@ from secedgar.client import NetworkClient
 from secedgar.exceptions import CIKError, EDGARQueryError
 
 
+class _CIKMapSource:
+    """Key of the map cache, which holds the client to fetch the map with once.
+
+    Only the user agent is compared, so the map is fetched once per user agent whichever
+    client asks for it, and the client is dropped after fetching so the cache does not keep
+    clients and their sessions alive.
+    """
+
+    def __init__(self, user_agent, client=None):
+        self.user_agent = user_agent
+        self.client = client
+
+    def __hash__(self):
+        return hash(self.user_agent)
+
+    def __eq__(self, other):
+        return isinstance(other, _CIKMapSource) and other.user_agent == self.user_agent
+
+    def fetch(self):
+        """Get ticker map as JSON."""
+        client, self.client = self.client, None
+        if client is not None:
+            response = client.get_response("files/company_tickers.json")
+        else:
+            headers = {'user-agent': self.user_agent}
+            response = requests.get("https://www.sec.gov/files/company_tickers.json",
+                                    headers=headers)
+        return response.json()
+
+
 @functools.lru_cache()
-def get_cik_map(user_agent):
+def _get_cik_map(source):
+    json_response = source.fetch()
+    return {key: {v[key].upper(): str(v["cik_str"]) for v in json_response.values()
+                  if v[key] is not None}
+            for key in ("ticker", "title")}
+
+
+def get_cik_map(user_agent, client=None):
     """Get dictionary of tickers and company names to CIK numbers.
 
-    Uses ``functools.lru_cache`` to cache response if used in later calls.
-    To clear cache, use ``get_cik_map.cache_clear()``.
+    Uses ``functools.lru_cache`` to cache the map of each user agent for later calls,
+    whichever client they pass. To clear cache, use ``get_cik_map.cache_clear()``.
+
+    Args:
+        user_agent (str): Value used for HTTP header "User-Agent".
+        client (Union[secedgar.client.NetworkClient, NoneType], optional): Client to fetch
+            map with if it is not cached, so the client's session, rate limit and retries are
+            used, along with its cache if it has one. Defaults to None, which makes a plain
+            request.
 
     .. note::
        All company names and tickers are normalized by converting to upper case.
@@ -28,13 +72,15 @@ def get_cik_map(user_agent):
        be excluded from the returned dictionary.
 
     .. versionadded:: 0.1.6
+
+    .. versionchanged:: 0.7.0
+       Added ``client`` argument.
     """
-    headers = {'user-agent': user_agent}
-    response = requests.get("https://www.sec.gov/files/company_tickers.json", headers=headers)
-    json_response = response.json()
-    return {key: {v[key].upper(): str(v["cik_str"]) for v in json_response.values()
-                  if v[key] is not None}
-            for key in ("ticker", "title")}
+    return _get_cik_map(_CIKMapSource(user_agent, client))
+
+
+get_cik_map.cache_clear = _get_cik_map.cache_clear
+get_cik_map.cache_info = _get_cik_map.cache_info
 
 
 class CIKLookup:
@@ -201,8 +247,11 @@ class CIKLookup:
         """
         ciks = {}
         to_lookup = set(self.lookups)
+        if all(lookup.isdigit() for lookup in to_lookup):
+            return {lookup: lookup for lookup in to_lookup}  # no need to fetch map
 
-        cik_map = get_cik_map(self.client.user_agent)
+        # Go through client, so its rate limit, retries and cache (if any) are used
+        cik_map = get_cik_map(self.client.user_agent, client=self.client)
 
         # all keys upper case
         ticker_map = cik_map["ticker"]
@@ -1,19 +1,416 @@
 """Client to communicate with EDGAR database."""
 import asyncio
+import contextlib
+import json
 import os
+import random
+import tempfile
+import threading
 import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import aiohttp
 import requests
 import tqdm
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from urllib3.util.retry import Retry
 
 from secedgar.exceptions import EDGARQueryError
+from secedgar.metrics import ClientMetrics
+from secedgar.rate_limit import AdaptiveRateController, RateLimiter
+from secedgar.storage import (FileSystemSink, compressed_path, open_compressed,
+                              validate_compression)
+from secedgar.transport import HTTPTransport
 from secedgar.utils import make_path
 
 
+class DownloadFailure:
+    """Download which failed permanently in :meth:`NetworkClient.wait_for_download_async`.
+
+    Args:
+        url (str): URL which could not be downloaded.
+        path (str): Path the URL was to be saved to.
+        status (Union[int, NoneType]): HTTP status of the last attempt, if any.
+        attempts (int): Number of attempts made, including one cut off by the run timeout.
+        error (Union[BaseException, NoneType]): Error of the last attempt.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, url, path, status=None, attempts=0, error=None):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+
+    def __repr__(self):
+        return ("DownloadFailure(url={0!r}, path={1!r}, status={2}, attempts={3}, "
+                "error={4!r})").format(self.url, self.path, self.status, self.attempts,
+                                       self.error)
+
+
+class DownloadReport:
+    """Summary of a run of :meth:`NetworkClient.wait_for_download_async`.
+
+    Examples:
+        Failed downloads can be submitted again.
+
+        .. code-block:: python
+
+            report = asyncio.run(client.wait_for_download_async(inputs))
+            if report.failures:
+                report = asyncio.run(client.wait_for_download_async(report.failed_inputs))
+
+    Attributes:
+        requests (int): Number of downloads which were attempted and finished.
+        failures (list of DownloadFailure): Downloads which failed or were cut off.
+        abandoned (Union[int, NoneType]): Number of inputs never taken because the run
+            timed out. None if some were left but their number is unknown, since the inputs
+            had no length.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = []
+        self.abandoned = 0
+        self.start = time.monotonic()
+        self.end = None
+
+    @property
+    def failed_inputs(self):
+        """List of tuples of str: ``(url, path)`` of failed downloads, to submit again."""
+        return [(f.url, f.path) for f in self.failures]
+
+    def merge(self, other):
+        """Add requests and failures of another report to this one.
+
+        Args:
+            other (DownloadReport): Report of a later run.
+
+        Returns:
+            DownloadReport: This report.
+        """
+        self.requests += other.requests
+        self.failures.extend(other.failures)
+        if self.abandoned is None or other.abandoned is None:
+            self.abandoned = None
+        else:
+            self.abandoned += other.abandoned
+        self.start = min(self.start, other.start)
+        if other.end is not None:
+            self.end = max(self.end or other.end, other.end)
+        return self
+
+    @property
+    def elapsed(self):
+        """float: Number of seconds the run took (or has taken so far)."""
+        end = self.end if self.end is not None else time.monotonic()
+        return end - self.start
+
+    @property
+    def requests_per_second(self):
+        """float: Achieved number of completed requests per second."""
+        elapsed = self.elapsed
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return ("DownloadReport(requests={0}, failures={1}, elapsed={2:.2f}s, "
+                "requests_per_second={3:.2f})").format(
+            self.requests, len(self.failures), self.elapsed, self.requests_per_second)
+
+
+class FetchResult:
+    """Outcome of a single request made by :meth:`NetworkClient.get_many`.
+
+    Args:
+        path (str): Path which was requested.
+        params (Union[dict, NoneType]): Parameters sent with the request.
+        response (Union[requests.Response, NoneType]): Response, if the request succeeded.
+        error (Union[BaseException, NoneType]): Error raised by the request, if it failed.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, path, params=None, response=None, error=None):
+        self.path = path
+        self.params = params
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        """bool: Whether the request succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        return "FetchResult(path={0!r}, params={1!r}, response={2!r}, error={3!r})".format(
+            self.path, self.params, self.response, self.error)
+
+
+class _SingleFlight:
+    """Share one call among identical concurrent calls and remember results briefly.
+
+    Calls are identified by a hashable key. While a call for a key is running, other
+    threads (or coroutines) asking for the same key wait for it and get its result or
+    error. Successful results are kept for ``ttl`` seconds afterwards.
+
+    Args:
+        ttl (float): Number of seconds results are remembered for. 0 only shares calls
+            which are in flight.
+    """
+
+    _clock = staticmethod(time.monotonic)
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._memo = {}
+
+    def _remembered(self, key):
+        """Get remembered result for key, dropping expired results. Must hold lock."""
+        now = self._clock()
+        for expired in [k for k, (expires, _) in self._memo.items() if expires <= now]:
+            del self._memo[expired]
+        return self._memo.get(key)
+
+    def _remember(self, key, result):
+        if self.ttl > 0:
+            with self._lock:
+                self._memo[key] = (self._clock() + self.ttl, result)
+
+    def clear(self):
+        """Forget remembered results."""
+        with self._lock:
+            self._memo.clear()
+
+    def do(self, key, fn):
+        """Call ``fn()`` unless a call for ``key`` is in flight or remembered.
+
+        Returns:
+            tuple: Result and whether it was shared with another call.
+        """
+        with self._lock:
+            remembered = self._remembered(key)
+            if remembered is not None:
+                return remembered[1], True
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.error is None:
+                self._remember(key, call.result)
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key, fn):
+        """Await ``fn()`` unless a call for ``key`` is in flight in this loop or remembered.
+
+        Returns:
+            tuple: Result and whether it was shared with another call.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            remembered = self._remembered(key)
+        if remembered is not None:
+            return remembered[1], True
+        future = self._async_calls.get((loop, key))
+        if future is not None:
+            # Waiters being cancelled must not cancel the call they wait for
+            return await asyncio.shield(future), True
+        future = self._async_calls[loop, key] = loop.create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            self._remember(key, result)
+        finally:
+            del self._async_calls[loop, key]
+        return result, False
+
+
+class _DiskWriter:
+    """Run blocking file operations of async downloads on a dedicated thread pool.
+
+    Directories which have already been created are remembered, so they are only
+    created (and stat'ed) once per run.
+
+    Args:
+        max_workers (int): Number of writer threads.
+        compression (Union[str, NoneType], optional): Compression method to store files with.
+            See :func:`secedgar.storage.open_compressed`. Defaults to None.
+        compression_level (Union[int, NoneType], optional): Compression level.
+            Defaults to None.
+    """
+
+    SPOOL_SIZE = 2 ** 23  # filings larger than this are spooled to disk for sinks
+
+    def __init__(self, max_workers, compression=None, compression_level=None):
+        validate_compression(compression)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="secedgar-writer")
+        self._directories = set()
+        self._compression = compression
+        self._compression_level = compression_level
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` on a writer thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def _make_dirs(self, directory):
+        make_path(directory, exist_ok=True)
+        self._directories.add(directory)
+
+    async def make_dirs(self, directory):
+        """Create directory if it has not been created during this run."""
+        if directory not in self._directories:
+            await self.run(self._make_dirs, directory)
+
+    def _partial_paths(self, path):
+        """Get paths of partial download and its metadata for ``path``."""
+        path = compressed_path(path, self._compression)
+        return "{0}.part".format(path), "{0}.part.json".format(path)
+
+    def resume_headers(self, link, path):
+        """Get headers to continue an interrupted download of ``link`` into ``path``.
+
+        Returns:
+            dict: ``Range`` and ``If-Range`` headers if a partial download with a
+                validator exists, otherwise an empty dictionary. Compressed downloads
+                are never resumed, since the size of their partial file does not tell
+                how much of the response was received.
+        """
+        if self._compression is not None:
+            return {}
+        part_path, meta_path = self._partial_paths(path)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            size = os.path.getsize(part_path)
+        except (OSError, ValueError):
+            return {}
+        validator = meta.get("etag") or meta.get("last_modified")
+        if meta.get("url") != link or not validator or size == 0:
+            return {}
+        return {"Range": "bytes={0}-".format(size), "If-Range": validator}
+
+    def save_validators(self, link, path, headers):
+        """Record validators of response so an interrupted download can be resumed."""
+        _, meta_path = self._partial_paths(path)
+        etag = headers.get("ETag")
+        if etag is not None and etag.startswith("W/"):
+            etag = None  # weak validators cannot be used with If-Range
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(meta_path)
+            return
+        with open(meta_path, "w") as f:
+            json.dump({"url": link, "etag": etag, "last_modified": last_modified}, f)
+
+    def discard_partial(self, path):
+        """Remove partial download and its metadata for ``path``."""
+        for p in self._partial_paths(path):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(p)
+
+    async def write_stream(self, chunks, path, append=False):
+        """Write asynchronous iterable of byte chunks to ``path``.
+
+        Chunks are written to ``<path>.part``, which is renamed to ``path`` once all chunks
+        are written. At most one write per stream is pending at a time, so receiving the
+        next chunk overlaps with writing the previous one while memory stays bounded.
+        If writing is interrupted, the ``.part`` file is kept so the download can be resumed.
+        If the writer compresses files, chunks are compressed as they are written and the
+        suffix for the compression method is added to ``path``.
+
+        Args:
+            chunks: Asynchronous iterable of bytes.
+            path (str): Final path of file (without compression suffix).
+            append (bool, optional): Whether to append to an existing ``.part`` file.
+                Defaults to False.
+        """
+        part_path, _ = self._partial_paths(path)
+        await self.make_dirs(os.path.dirname(path))
+        if append:
+            f = await self.run(open, part_path, "ab")
+        else:
+            f = await self.run(open_compressed, part_path,
+                               self._compression, self._compression_level)
+        pending = None
+        try:
+            async for chunk in chunks:
+                if pending is not None:
+                    await pending
+                pending = asyncio.ensure_future(self.run(f.write, chunk))
+            if pending is not None:
+                await pending
+        finally:
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            await self.run(f.close)
+        await self.run(os.replace, part_path, compressed_path(path, self._compression))
+        await self.run(self.discard_partial, path)
+
+    async def store_stream(self, chunks, sink, path):
+        """Collect asynchronous iterable of byte chunks and pass it to ``sink``.
+
+        Chunks are spooled in memory, or in a temporary file for large filings, and the
+        complete filing is given to ``sink.store`` on a writer thread.
+
+        Args:
+            chunks: Asynchronous iterable of bytes.
+            sink (secedgar.storage.StorageSink): Sink to store filing in.
+            path (str): Path of filing given to the downloader.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE)
+        try:
+            async for chunk in chunks:
+                await self.run(spool.write, chunk)
+            await self.run(spool.seek, 0)
+            await self.run(sink.store, path, spool)
+        finally:
+            await self.run(spool.close)
+
+    def shutdown(self):
+        """Wait for pending operations and stop writer threads."""
+        self._pool.shutdown(wait=True)
+
+
 class NetworkClient:
     """Class in charge of sending and handling requests to EDGAR database.
 
@@ -29,6 +426,53 @@ class NetworkClient:
             See urllib3 docs for more info. Defaults to 0.
         rate_limit (int, optional): Number of requests per second to limit to.
             Defaults to 10.
+        concurrency (int, optional): Number of downloads that may be in flight at once
+            when downloading asynchronously. Defaults to 10.
+        chunk_size (int, optional): Number of bytes read from the network and written to disk
+            at a time when downloading filings. Defaults to 65536.
+        limiter (secedgar.rate_limit.RateLimiter, optional): Limiter all requests are paced by.
+            Pass a :class:`secedgar.rate_limit.FileRateLimiter` to share one limit between
+            every client on a host. Defaults to a limiter private to this client with a rate
+            of ``rate_limit``.
+        cache (secedgar.cache.HTTPCache, optional): Persistent cache for responses of
+            :meth:`get_response`. Defaults to None (no caching).
+        transport (secedgar.transport.Transport, optional): How URLs are fetched. Pass a
+            :class:`secedgar.transport.MirrorTransport` (possibly inside a
+            :class:`secedgar.transport.FallbackTransport`) to read from a local mirror of
+            EDGAR. Defaults to :class:`secedgar.transport.HTTPTransport`.
+        metrics (secedgar.metrics.ClientMetrics, optional): Where requests, bytes, retries,
+            latencies and rate limiter waits are recorded. Pass the same instance to several
+            clients to combine their metrics. Defaults to new metrics for this client.
+        storage (secedgar.storage.StorageSink, optional): Where downloaded filings are
+            stored, e.g. a :class:`secedgar.storage.ZipArchiveSink` packing them into one
+            archive per day. Defaults to :class:`secedgar.storage.FileSystemSink`, which
+            stores each filing as its own file.
+        memo_ttl (float, optional): Number of seconds responses of :meth:`get_response` are
+            reused for identical requests once they are complete. Callers sharing a response
+            get the same ``requests.Response`` object. Defaults to 0, which only shares
+            requests which are in flight.
+        bandwidth (float, optional): Maximum number of response bytes per second, summed
+            over all requests and downloads of the client. Defaults to None (no limit).
+        bandwidth_limiter (secedgar.rate_limit.RateLimiter, optional): Limiter whose tokens
+            are bytes, enforcing ``bandwidth``. Pass a
+            :class:`secedgar.rate_limit.FileRateLimiter` to share one bandwidth limit between
+            every client on a host. Defaults to a limiter private to this client if
+            ``bandwidth`` is given.
+
+    The client keeps a single pooled ``requests.Session`` which is reused by every call to
+    :meth:`get_response`, so connections to EDGAR are only set up once. The session is
+    created lazily and can be released with :meth:`close`, or by using the client as a
+    context manager.
+
+    When EDGAR answers with 429 or 503, the client's :attr:`rate_controller` halves the
+    request rate, pauses all requests for the time given by ``Retry-After`` and retries
+    the request (up to ``retry_count`` times). The rate creeps back up to ``rate_limit``
+    while responses are healthy.
+
+    Identical calls to :meth:`get_response` (same URL, parameters and keyword arguments) which
+    are made while one of them is in flight share its single request and response, and so do
+    identical calls made within ``memo_ttl`` seconds of a response if ``memo_ttl`` is given.
+    Streamed requests (``stream=True``) are never shared.
 
     .. note:
        It is highly suggested to keep rate_limit <= 10, as the SEC will block your IP
@@ -57,20 +501,58 @@ class NetworkClient:
 
            from secedgar.client import NetworkClient
            client = NetworkClient(user_agent="Name (email)", backoff_factor=1)
+
+        To make sure pooled connections are released once you are done, use the client
+        as a context manager.
+
+        .. code-block:: python
+
+           from secedgar.client import NetworkClient
+           with NetworkClient(user_agent="Name (email)") as client:
+               response = client.get_response("cgi-bin/browse-edgar", params)
     """
 
-    _BASE = "http://www.sec.gov/"
+    _BASE = "https://www.sec.gov/"
+    _RETRY_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
 
     def __init__(self,
                  user_agent,
                  retry_count=3,
                  batch_size=10,
                  backoff_factor=0,
-                 rate_limit=10):
+                 rate_limit=10,
+                 concurrency=10,
+                 chunk_size=2 ** 16,
+                 limiter=None,
+                 cache=None,
+                 transport=None,
+                 metrics=None,
+                 storage=None,
+                 memo_ttl=0,
+                 bandwidth=None,
+                 bandwidth_limiter=None):
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._limiter = None
+        self._rate_controller = None
         self.retry_count = retry_count
         self.batch_size = batch_size
         self.backoff_factor = backoff_factor
         self.rate_limit = rate_limit
+        if limiter is not None:
+            self._limiter = limiter
+        self._rate_controller = AdaptiveRateController(self._limiter,
+                                                       max_rate=self._limiter.rate)
+        self._cache = cache
+        self._transport = transport or HTTPTransport()
+        self._metrics = metrics if metrics is not None else ClientMetrics()
+        self._storage = storage if storage is not None else FileSystemSink()
+        self._single_flight = _SingleFlight(memo_ttl)
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self._bandwidth_limiter = bandwidth_limiter
+        if bandwidth is not None:
+            self.bandwidth = bandwidth
         self.user_agent = user_agent
 
     @property
@@ -87,6 +569,7 @@ class NetworkClient:
             raise ValueError(
                 "Retry count must be greater than 0. Given {0}.".format(value))
         self._retry_count = value
+        self.close()  # session is rebuilt with new retry settings on next request
 
     @property
     def batch_size(self):
@@ -114,6 +597,7 @@ class NetworkClient:
                 "Backoff factor must be int or float. Given type {0}".format(
                     type(value)))
         self._backoff_factor = value
+        self.close()  # session is rebuilt with new retry settings on next request
 
     @property
     def rate_limit(self):
@@ -125,8 +609,132 @@ class NetworkClient:
         if not (0 < value <= 10):
             raise ValueError(
                 "Rate must be greater than 0 and less than or equal to 10.")
+        self._rate_limit = value
+        if self._limiter is None:
+            self._limiter = RateLimiter(rate=value)
+        else:
+            self._limiter.rate = value
+        if self._rate_controller is not None:
+            self._rate_controller.max_rate = value
+
+    @property
+    def limiter(self):
+        """``secedgar.rate_limit.RateLimiter``: Limiter used to keep requests under ``rate_limit``.
+
+        Both :meth:`get_response` and :meth:`wait_for_download_async` acquire from it.
+        Setting ``rate_limit`` changes the rate of this limiter.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._limiter
+
+    @property
+    def bandwidth(self):
+        """Union[float, NoneType]: Maximum number of response bytes per second, or None.
+
+        Can be changed at any time, including while downloads are running, e.g. to slow
+        down a backfill during business hours. Set to None to remove the limit.
+
+        .. versionadded:: 0.7.0
+        """
+        if self._bandwidth_limiter is None:
+            return None
+        return self._bandwidth_limiter.rate
+
+    @bandwidth.setter
+    def bandwidth(self, value):
+        if value is None:
+            self._bandwidth_limiter = None
+        elif self._bandwidth_limiter is None:
+            # One chunk may be saved up, so bytes flow evenly instead of in bursts
+            self._bandwidth_limiter = RateLimiter(rate=value, burst=self.chunk_size)
         else:
-            self._rate_limit = value
+            self._bandwidth_limiter.rate = value
+
+    @property
+    def bandwidth_limiter(self):
+        """Union[secedgar.rate_limit.RateLimiter, NoneType]: Limiter enforcing :attr:`bandwidth`.
+
+        Response bodies take one token per byte. Requests served by a local transport are
+        not limited.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._bandwidth_limiter
+
+    @property
+    def rate_controller(self):
+        """``secedgar.rate_limit.AdaptiveRateController``: Controller adjusting :attr:`limiter`.
+
+        Slows requests down when EDGAR throttles the client and speeds them back up
+        to ``rate_limit`` once responses are healthy.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._rate_controller
+
+    @property
+    def cache(self):
+        """Union[secedgar.cache.HTTPCache, NoneType]: Cache used by :meth:`get_response`.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._cache
+
+    @property
+    def transport(self):
+        """``secedgar.transport.Transport``: Transport used to fetch URLs.
+
+        URLs the transport serves locally skip the :attr:`limiter` and the :attr:`cache`.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._transport
+
+    @property
+    def metrics(self):
+        """``secedgar.metrics.ClientMetrics``: Metrics of requests made by this client.
+
+        Readable from Python or exported in the Prometheus text format with
+        ``metrics.write_prometheus`` or ``metrics.serve_prometheus``.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._metrics
+
+    @property
+    def storage(self):
+        """``secedgar.storage.StorageSink``: Where downloaded filings are stored.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._storage
+
+    @property
+    def concurrency(self):
+        """int: Number of downloads that may be in flight at once."""
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, value):
+        if not isinstance(value, int):
+            raise TypeError("Concurrency must be int. Given type {0}.".format(type(value)))
+        elif value < 1:
+            raise ValueError("Concurrency must be positive integer.")
+        self._concurrency = value
+
+    @property
+    def chunk_size(self):
+        """int: Number of bytes streamed at a time when downloading filings."""
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        if not isinstance(value, int):
+            raise TypeError("Chunk size must be int. Given type {0}.".format(type(value)))
+        elif value < 1:
+            raise ValueError("Chunk size must be positive integer.")
+        self._chunk_size = value
 
     @property
     def user_agent(self):
@@ -139,6 +747,54 @@ class NetworkClient:
             raise TypeError("user_agent must be str. Given type {0}.".format(type(value)))
         self._user_agent = value
 
+    @property
+    def session(self):
+        """``requests.Session``: Pooled session used for all synchronous requests.
+
+        The session is created on first use and shared between threads.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        """Create session with retries and response validation mounted.
+
+        Returns:
+            session (requests.Session): New session for EDGAR requests.
+        """
+        session = requests.Session()
+        # Only connection errors are retried here. Responses are returned so that retries of
+        # them go through the rate limiter in _send
+        retry = Retry(self.retry_count,
+                      backoff_factor=self.backoff_factor,
+                      raise_on_status=True,
+                      respect_retry_after_header=False)
+        # Keep a pooled connection for every thread of get_many
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=max(self.concurrency, 10))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].append(self._validate_response)
+        return session
+
+    def close(self):
+        """Close pooled session and release its connections.
+
+        The client can still be used afterwards. A new session is created on the next request.
+        """
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     @staticmethod
     def _prepare_query(path):
         """Prepare the query url.
@@ -170,6 +826,8 @@ class NetworkClient:
             SEC has banned your IP for 10 minutes.
             Please wait 10 minutes before making another request.
             https://www.sec.gov/privacy.htm#security"""
+        elif kwargs.get("stream"):
+            pass  # body is read by the caller as it arrives
         elif any(m in response.text for m in error_messages):
             raise EDGARQueryError(
                 "No results were found or the value submitted was not valid.")
@@ -191,18 +849,234 @@ class NetworkClient:
 
         Raises:
             EDGARQueryError: If problems arise when making query.
+
+        .. note::
+           If the client has a :attr:`cache`, fresh cached responses are returned without
+           making a request and stale ones are revalidated with a conditional request.
+        """
+        prepared_url = self._prepare_query(path)
+        key = self._request_key(prepared_url, params, kwargs)
+        if key is None:
+            return self._get_response(prepared_url, params, **kwargs)
+        response, shared = self._single_flight.do(
+            key, lambda: self._get_response(prepared_url, params, **kwargs))
+        if shared:
+            self.metrics.record_coalesced(prepared_url)
+        return response
+
+    def iter_content(self, path, params=None, **kwargs):
+        """Stream body of response for ``path`` in chunks as it is received.
+
+        Unlike :meth:`get_response`, the body is never held in memory as a whole, so large
+        files such as a quarter's ``master.idx`` can be processed while they download.
+        Requests wait on :attr:`limiter` and are retried while throttled like any other
+        request, and each chunk waits on :attr:`bandwidth_limiter`. If the client has a
+        :attr:`cache`, the response goes through the cache and its body is passed on in
+        one chunk.
+
+        Args:
+            path (str): A properly-formatted path
+            params (dict): Dictionary of parameters to pass
+                to request. Defaults to None.
+            kwargs: Keyword arguments to pass to ``requests.Session.get``.
+
+        Yields:
+            bytes: Chunks of the body of at most :attr:`chunk_size` bytes.
+
+        Raises:
+            requests.HTTPError: If the response has an error status.
+
+        .. versionadded:: 0.7.0
         """
         prepared_url = self._prepare_query(path)
+        local = self.transport.is_local(prepared_url, params)
+        if self.cache is not None and not local:
+            response = self.get_response(path, params, **kwargs)
+            response.raise_for_status()
+            yield response.content
+            return
+        headers = {"User-Agent": self.user_agent}
+        response = self._send(prepared_url, params=params, headers=headers, stream=True,
+                              **kwargs)
+        with response:
+            response.raise_for_status()
+            for chunk in response.iter_content(self.chunk_size):
+                self.metrics.record_bytes(prepared_url, len(chunk))
+                if not local and self.bandwidth_limiter is not None:
+                    self.bandwidth_limiter.acquire(len(chunk))
+                yield chunk
+
+    @staticmethod
+    def _request_key(url, params, kwargs):
+        """Get key identical requests share, or None if request cannot be shared."""
+        if kwargs.get("stream"):
+            return None  # body of a streamed response can only be read once
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:  # e.g. lists as parameters
+            return None
+        return key
+
+    def _get_response(self, prepared_url, params=None, **kwargs):
+        """Get response for ``prepared_url``, from the cache if the client has one."""
         headers = {"User-Agent": self.user_agent}
-        with requests.Session() as session:
-            retry = Retry(self.retry_count,
-                          backoff_factor=self.backoff_factor,
-                          raise_on_status=True)
-            session.mount(self._BASE, adapter=HTTPAdapter(max_retries=retry))
-            session.hooks["response"].append(self._validate_response)
-            response = session.get(prepared_url, params=params,
-                                   headers=headers, **kwargs)
-            return response
+        if self.cache is not None and not self.transport.is_local(prepared_url, params):
+            return self._get_cached_response(prepared_url, params, headers, **kwargs)
+        return self._send(prepared_url, params=params, headers=headers, **kwargs)
+
+    def get_many(self, paths, params=None, max_workers=None, **kwargs):
+        """Request many paths concurrently on a thread pool, yielding results as they complete.
+
+        Every request goes through :meth:`get_response`, so it uses the pooled session, waits
+        on the client's :attr:`limiter` (which is thread-safe, so ``rate_limit`` holds across
+        all threads), is slowed down by :attr:`rate_controller`, retried and cached like any
+        other request. Paths are taken from ``paths`` as threads become free, so ``paths`` may
+        be a generator. A request which fails does not stop the others; its error is reported
+        in the :class:`FetchResult` instead.
+
+        Args:
+            paths (iterable): Paths to request. Each item is either a path, or a tuple of a
+                path and the parameters to request it with.
+            params (dict, optional): Parameters for paths given without their own.
+                Defaults to None.
+            max_workers (int, optional): Number of threads sending requests.
+                Defaults to :attr:`concurrency`.
+            kwargs: Keyword arguments to pass to :meth:`get_response`.
+
+        Yields:
+            secedgar.client.FetchResult: Result of each request, in the order requests
+                complete.
+
+        Examples:
+            .. code-block:: python
+
+                from secedgar.client import NetworkClient
+
+                client = NetworkClient(user_agent="Name (email)")
+                paths = [("cgi-bin/browse-edgar", {"action": "getcompany", "CIK": cik})
+                         for cik in ("320193", "789019")]
+                for result in client.get_many(paths):
+                    if result.ok:
+                        print(result.params["CIK"], result.response.status_code)
+                    else:
+                        print(result.params["CIK"], "failed:", result.error)
+
+        .. versionadded:: 0.7.0
+        """
+        max_workers = max_workers or self.concurrency
+        items = iter(paths)
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers,
+                                      thread_name_prefix="secedgar-get")
+        try:
+            while True:
+                # Submit at most two requests per thread ahead of time
+                while len(pending) < 2 * max_workers:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    path, item_params = item if isinstance(item, tuple) else (item, params)
+                    future = executor.submit(self.get_response, path, item_params, **kwargs)
+                    pending[future] = (path, item_params)
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, item_params = pending.pop(future)
+                    error = future.exception()
+                    yield FetchResult(path, item_params,
+                                      response=None if error is not None else future.result(),
+                                      error=error)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _send(self, url, **kwargs):
+        """Send rate limited get request, retrying while throttled or failing transiently.
+
+        Throttled responses slow down the rate controller. Other transient errors (e.g. 500)
+        are retried after an exponential backoff. Every attempt waits for the rate limiter.
+
+        Args:
+            url (str): URL to request.
+            kwargs: Keyword arguments to pass to ``requests.Session.get``.
+
+        Returns:
+            response (requests.Response): First response which is neither throttled nor a
+                transient error, or the last response once ``retry_count`` retries are used up.
+        """
+        local = self.transport.is_local(url, kwargs.get("params"))
+        stream = kwargs.get("stream", False)
+        for attempt in range(1, self.retry_count + 2):
+            if attempt > 1:
+                self.metrics.record_retry(url)
+            if not local:
+                self.metrics.record_limiter_wait(self.limiter.acquire())
+            start = time.monotonic()
+            try:
+                response = self.transport.get(self, url, **kwargs)
+            except requests.RequestException:
+                self.metrics.record_request(url, None, time.monotonic() - start)
+                raise
+            self._record_response(url, response, time.monotonic() - start, stream=stream)
+            if not local and not stream and self.bandwidth_limiter is not None:
+                # Body was received in full, so hold back the next request instead
+                self.bandwidth_limiter.acquire(len(response.content or b""))
+            if self.rate_controller.is_throttled(response.status_code):
+                self.rate_controller.on_throttle(response.headers.get("Retry-After"),
+                                                 sent=start)
+            elif response.status_code in self._RETRY_STATUSES:
+                if attempt <= self.retry_count:
+                    time.sleep(self._backoff(attempt))
+            else:
+                self.rate_controller.on_success()
+                break
+            if stream and attempt <= self.retry_count:
+                response.close()  # release connection of response which is not read
+        return response
+
+    def _record_response(self, url, response, seconds, stream=False):
+        """Record ``response`` and retries made by the session's adapter in :attr:`metrics`.
+
+        Bodies of streamed responses are not read, their size is recorded as they arrive.
+        """
+        content = None if stream else response.content
+        self.metrics.record_request(url, response.status_code, seconds,
+                                    len(content) if isinstance(content, bytes) else 0)
+        retries = getattr(response.raw, "retries", None)
+        for _ in getattr(retries, "history", None) or ():
+            self.metrics.record_retry(url)
+
+    def _get_cached_response(self, url, params, headers, **kwargs):
+        """Get response from cache, revalidating or fetching it if needed.
+
+        Args:
+            url (str): Full URL without query string.
+            params (dict): Dictionary of parameters to pass to request.
+            headers (dict): Headers to send with request.
+            kwargs: Keyword arguments to pass to ``requests.Session.get``.
+
+        Returns:
+            response (requests.Response): Cached or fetched response.
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        entry = self.cache.get(full_url)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record_hit()
+                return entry.to_response()
+            headers.update(entry.validators)
+        response = self._send(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record_hit()
+            self.cache.refresh(entry)
+            return entry.to_response()
+        self.cache.record_miss()
+        if response.status_code == 200:
+            self.cache.put(full_url, response)
+        return response
 
     def get_soup(self, path, params, **kwargs):
         """Return BeautifulSoup object from response text. Uses lxml parser.
@@ -234,44 +1108,675 @@ class NetworkClient:
             contents = await response.read()
         return contents
 
-    async def wait_for_download_async(self, inputs):
+    def _is_retryable(self, error):
+        """Whether a failed asynchronous download may succeed if tried again."""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in self._RETRY_STATUSES
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    def _backoff(self, attempt):
+        """Get seconds to wait before retry number ``attempt`` (exponential, full jitter)."""
+        return random.uniform(0, self.backoff_factor * 2 ** (attempt - 1))
+
+    async def _count_bytes(self, url, chunks, throttle=True):
+        """Pass on ``chunks`` of response body for ``url``, recording their size.
+
+        Unless ``throttle`` is False, each chunk is held back until :attr:`bandwidth_limiter`
+        allows its bytes. The limiter is looked up for every chunk, so changes to
+        :attr:`bandwidth` apply to downloads in progress.
+        """
+        async for chunk in chunks:
+            self.metrics.record_bytes(url, len(chunk))
+            limiter = self.bandwidth_limiter
+            if throttle and limiter is not None:
+                await limiter.acquire_async(len(chunk))
+            yield chunk
+
+    @staticmethod
+    def _request_async(link, session, headers=None):
+        """Start asynchronous get request.
+
+        Args:
+            link (str): URL to fetch.
+            session (aiohttp.ClientSession): Asynchronous client session to use.
+            headers (dict, optional): Extra headers to send. Defaults to None.
+
+        Returns:
+            Asynchronous context manager giving the ``aiohttp.ClientResponse``.
+        """
+        return session.get(link, headers=headers)
+
+    async def wait_for_download_async(self, inputs, writer_threads=4,
+                                      compression=None, compression_level=None,
+                                      request_timeout=None, timeout=None, storage=None,
+                                      consumer=None):
         """Asynchronously download links into files using rate limit.
 
+        Downloads are handled by a pool of ``concurrency`` workers. Each worker takes the
+        next link as soon as the client's :attr:`limiter` allows another request, so slow
+        responses do not hold back other downloads while the rate limit is kept.
+
+        ``inputs`` may be any iterable, including generators and asynchronous iterables. Items
+        are pulled through a queue holding at most two items per worker, so downloads start
+        as soon as the first item is produced and memory use does not grow with the number
+        of inputs.
+
+        Response bodies are streamed in chunks of ``chunk_size`` bytes to a ``.part`` file
+        next to the final path, which is renamed once the download completes. Memory use is
+        therefore bounded by ``chunk_size * concurrency`` rather than the size of filings.
+        All disk operations run on a pool of ``writer_threads`` threads so they never block
+        the event loop.
+
+        If a download is interrupted, its ``.part`` file is kept together with the response's
+        ``ETag`` or ``Last-Modified`` validator. The next attempt sends a ``Range`` request to
+        continue where it stopped, and starts over if the file has changed in the meantime.
+
+        Every download is tried up to ``retry_count + 1`` times. Throttled (429 or 503)
+        downloads are retried after :attr:`rate_controller` has slowed down and paused every
+        worker. Other transient errors (connection errors, timeouts and 408, 425 or 5xx
+        responses) are retried after an exponential backoff of up to
+        ``backoff_factor * 2 ** (attempt - 1)`` seconds with random jitter. A download which
+        still fails, or fails with any other error, is recorded in the report's ``failures``
+        instead of stopping the other downloads, and a warning is issued.
+
         Args:
-            inputs (list of tuples of str): List of tuples with length 2. First element
-                in tuple should be URL to request and second element should be path
-                where content after requesting URL is stored.
-        """
-        async def fetch_and_save(link, path, session):
-            """Fetch link and save to path using session."""
-            contents = await self.fetch(link, session)
-            make_path(os.path.dirname(path))
-            with open(path, "wb") as f:
-                f.write(contents)
-
-        def batch(iterable, n):
-            length = len(iterable)
-            for ndx in range(0, length, n):
-                yield iterable[ndx:min(ndx + n, length)]
-
-        conn = aiohttp.TCPConnector(limit=self.rate_limit)
+            inputs (iterable of tuples of str): Iterable or asynchronous iterable of tuples
+                with length 2. First element in tuple should be URL to request and second
+                element should be path where content after requesting URL is stored.
+                The progress bar shows a total only if ``inputs`` has a length.
+            writer_threads (int, optional): Number of threads writing files to disk.
+                Defaults to 4.
+            compression (Union[str, NoneType], optional): Compress files while writing them
+                with "gzip" or "zstd" (requires ``zstandard``). The matching suffix is added
+                to each path. Defaults to None (no compression).
+            compression_level (Union[int, NoneType], optional): Compression level to use.
+                Defaults to the default level of the compression method.
+            request_timeout (Union[float, NoneType], optional): Maximum number of seconds
+                a single attempt may take. Defaults to None (aiohttp's default of 5 minutes).
+            timeout (Union[float, NoneType], optional): Maximum number of seconds for the
+                whole run. Downloads not finished by then, including inputs taken from
+                ``inputs`` but not started, are recorded as failures. ``inputs`` is closed
+                (if it is a generator) rather than iterated over to the end, and the number
+                of inputs never taken is recorded in ``DownloadReport.abandoned``.
+                Defaults to None (no limit).
+            storage (secedgar.storage.StorageSink, optional): Where to store filings. Paths in
+                ``inputs`` are passed to it. Sinks which are not a
+                :class:`secedgar.storage.FileSystemSink` receive each filing once it is
+                complete and cannot be combined with ``compression``.
+                Defaults to :attr:`storage`.
+            consumer (callable, optional): Called with the second element of each input
+                and the complete body (bytes) of its response instead of storing anything
+                on disk. Coroutine functions are awaited, other callables run on a writer
+                thread. A worker only takes its next input once the consumer has returned,
+                so at most ``concurrency`` bodies are held in memory. Errors raised by the
+                consumer are recorded as failures. Cannot be combined with ``compression``.
+                Defaults to None.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Number of requests made, achieved
+                requests per second and downloads which failed.
+
+        .. versionchanged:: 0.7.0
+           ``inputs`` can be any iterable or asynchronous iterable.
+        """
+        async def receive(link, session, throttle):
+            """Read whole body of link into memory."""
+            async with self.transport.open_async(self, link, session) as response:
+                chunks = response.content.iter_chunked(self.chunk_size)
+                body = [chunk async for chunk in self._count_bytes(link, chunks, throttle)]
+                return response.status, b"".join(body)
+
+        async def consume(key, body):
+            """Pass body to consumer, off the event loop unless it is a coroutine function."""
+            if asyncio.iscoroutinefunction(consumer):
+                await consumer(key, body)
+            else:
+                await writer.run(consumer, key, body)
+
+        async def store(link, path, session, throttle):
+            """Download link completely and hand it to sink."""
+            async with self.transport.open_async(self, link, session) as response:
+                chunks = response.content.iter_chunked(self.chunk_size)
+                await writer.store_stream(self._count_bytes(link, chunks, throttle), sink, path)
+                return response.status
+
+        async def fetch_and_save(link, path, session, throttle):
+            """Stream link into path using session, resuming partial downloads."""
+            target = sink.location(path)
+            if target is None:
+                return await store(link, path, session, throttle)
+            headers = await writer.run(writer.resume_headers, link, target)
+            try:
+                async with self.transport.open_async(self, link, session,
+                                                     headers=headers) as response:
+                    await writer.make_dirs(os.path.dirname(target))
+                    await writer.run(writer.save_validators, link, target, response.headers)
+                    # 206 means the validator still matches and only the rest is sent
+                    chunks = response.content.iter_chunked(self.chunk_size)
+                    await writer.write_stream(self._count_bytes(link, chunks, throttle),
+                                              target,
+                                              append=response.status == 206)
+                    return response.status
+            except aiohttp.ClientResponseError as e:
+                if e.status != 416 or not headers:
+                    raise
+                # Range does not fit the remote file anymore, so start over
+                await writer.run(writer.discard_partial, target)
+                return await fetch_and_save(link, path, session, throttle)
+
+        async def download(link, path, session):
+            """Download link once allowed by limiter, retrying transient errors.
+
+            Returns:
+                Union[DownloadFailure, NoneType]: Failure if download did not succeed.
+            """
+            local = await writer.run(self.transport.is_local, link)
+            for attempt in range(1, self.retry_count + 2):
+                in_flight[link, path] = attempt
+                if attempt > 1:
+                    self.metrics.record_retry(link)
+                if not local:
+                    self.metrics.record_limiter_wait(await self.limiter.acquire_async())
+                start = time.monotonic()
+                try:
+                    if consumer is None:
+                        status = await fetch_and_save(link, path, session, not local)
+                    else:
+                        status, body = await receive(link, session, not local)
+                except Exception as e:
+                    status = getattr(e, "status", None)
+                    self.metrics.record_request(link, status, time.monotonic() - start)
+                    if not self._is_retryable(e) or attempt > self.retry_count:
+                        return DownloadFailure(link, path, status=status,
+                                               attempts=attempt, error=e)
+                    if self.rate_controller.is_throttled(status):
+                        headers = getattr(e, "headers", None) or {}
+                        self.rate_controller.on_throttle(headers.get("Retry-After"), sent=start)
+                    else:
+                        await asyncio.sleep(self._backoff(attempt))
+                else:
+                    self.metrics.record_request(link, status, time.monotonic() - start)
+                    self.rate_controller.on_success()
+                    if consumer is not None:
+                        try:
+                            await consume(path, body)
+                        except Exception as e:
+                            return DownloadFailure(link, path, status=status,
+                                                   attempts=attempt, error=e)
+                    return None
+
+        async def produce(queue, num_workers):
+            """Put inputs into queue as workers make room, then tell workers to stop."""
+            async def put(item):
+                unqueued.append(item)  # kept in case run times out while queue is full
+                await queue.put(item)
+                unqueued.pop()
+
+            if hasattr(inputs, "__aiter__"):
+                async for item in remaining:
+                    await put(item)
+            else:
+                for item in remaining:
+                    await put(item)
+            inputs_done.set()
+            for _ in range(num_workers):
+                await queue.put(None)
+
+        async def worker(queue, session, progress):
+            """Download links from queue until told to stop."""
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                link, path = item
+                in_flight[link, path] = 0  # not attempted yet
+                failure = await download(link, path, session)
+                del in_flight[link, path]
+                report.requests += 1
+                if failure is not None:
+                    report.failures.append(failure)
+                progress.update()
+
+        if compression is not None and consumer is not None:
+            raise ValueError("Compression cannot be used with a consumer.")
+        sink = storage if storage is not None else self.storage
+        if compression is not None and not isinstance(sink, FileSystemSink):
+            raise ValueError("Compression can only be used with a FileSystemSink. "
+                             "Given {0}.".format(type(sink).__name__))
+        writer = _DiskWriter(max_workers=writer_threads,
+                             compression=compression,
+                             compression_level=compression_level)
+        # Inputs are pulled lazily, with at most two items per worker waiting in the queue
+        total = len(inputs) if hasattr(inputs, "__len__") else None
+        num_workers = self.concurrency if total is None else min(self.concurrency, total)
+        remaining = inputs.__aiter__() if hasattr(inputs, "__aiter__") else iter(inputs)
+        queue = asyncio.Queue(maxsize=2 * max(num_workers, 1))
+        unqueued = []
+        inputs_done = asyncio.Event()
+
+        conn = aiohttp.TCPConnector(limit=self.concurrency)
         headers = {
             "Connection": "keep-alive",
             "User-Agent": self.user_agent,
         }
+        session_kwargs = {}
+        if request_timeout is not None:
+            session_kwargs["timeout"] = aiohttp.ClientTimeout(total=request_timeout)
         client = aiohttp.ClientSession(connector=conn, headers=headers,
-                                       raise_for_status=True)
+                                       raise_for_status=True, **session_kwargs)
 
+        report = DownloadReport()
+        in_flight = {}
         async with client:
-            for group in tqdm.tqdm(batch(inputs, self.rate_limit),
-                                   total=len(inputs) // self.rate_limit,
-                                   unit_scale=self.rate_limit):
-                start = time.monotonic()
-                tasks = [
-                    fetch_and_save(link, path, client) for link, path in group
-                ]
-                await asyncio.gather(
-                    *tasks)  # If results are needed they can be assigned here
-                execution_time = time.monotonic() - start
-                # If execution time > 1, requests are essentially wasted, but a small price to pay
-                await asyncio.sleep(max(0, 1 - execution_time))
+            with tqdm.tqdm(total=total) as progress:
+                tasks = [asyncio.ensure_future(produce(queue, num_workers))]
+                tasks.extend(asyncio.ensure_future(worker(queue, client, progress))
+                             for _ in range(num_workers))
+                try:
+                    done, _ = await asyncio.wait(tasks, timeout=timeout,
+                                                 return_when=asyncio.FIRST_EXCEPTION)
+                    for task in done:
+                        task.result()  # raise errors of inputs or unexpected errors of workers
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    try:
+                        await writer.run(sink.flush)
+                    finally:
+                        writer.shutdown()
+        # Anything left over was cut off by the run timeout
+        timed_out = list(in_flight.items())
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                timed_out.append((item, 0))
+        timed_out.extend((item, 0) for item in unqueued)
+        if not inputs_done.is_set():
+            # Stop inputs (e.g. a streamed index) instead of producing the rest of them
+            if hasattr(remaining, "aclose"):
+                await remaining.aclose()
+            elif hasattr(remaining, "close"):
+                remaining.close()
+            if total is not None:
+                report.abandoned = total - report.requests - len(timed_out)
+            else:
+                report.abandoned = None  # unknown, but at least one
+        for (link, path), attempts in timed_out:
+            report.failures.append(DownloadFailure(
+                link, path, attempts=attempts,
+                error=asyncio.TimeoutError("Run timed out after {0} seconds.".format(timeout))))
+        report.end = time.monotonic()
+        if report.failures:
+            warnings.warn("{0} of {1} downloads failed. See DownloadReport.failures.".format(
+                len(report.failures), report.requests + len(timed_out)))
+        return report
+
+    async def iter_downloads_async(self, inputs, max_pending=None, **kwargs):
+        """Download links and iterate over their bodies without storing them on disk.
+
+        Built on :meth:`wait_for_download_async` with a ``consumer``, so downloads are rate
+        limited, retried and run concurrently the same way. Bodies are yielded in the order
+        downloads finish. Downloads pause while ``max_pending`` bodies are waiting to be
+        taken, so a slow loop body holds back downloads instead of letting memory grow.
+
+        Downloads which failed are issued as a warning once all inputs are done. Use
+        :meth:`wait_for_download_async` with a ``consumer`` to get the
+        :class:`DownloadReport` instead.
+
+        Args:
+            inputs (iterable of tuples): Iterable or asynchronous iterable of tuples with
+                length 2: URL to request and a key identifying it, e.g. a filing entry.
+            max_pending (int, optional): Number of bodies which may wait to be taken.
+                Defaults to :attr:`concurrency`.
+            kwargs: Keyword arguments to pass to :meth:`wait_for_download_async`, e.g.
+                ``request_timeout`` or ``timeout``.
+
+        Yields:
+            tuple: Key of input and body of its response as bytes.
+
+        Examples:
+            .. code-block:: python
+
+                async def main(client, inputs):
+                    async for key, body in client.iter_downloads_async(inputs):
+                        parse(key, body)
+
+        .. versionadded:: 0.7.0
+        """
+        queue = asyncio.Queue(maxsize=max_pending or self.concurrency)
+
+        async def put(key, body):
+            await queue.put((key, body))
+
+        task = asyncio.ensure_future(self.wait_for_download_async(inputs, consumer=put,
+                                                                  **kwargs))
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait([getter, task], return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    break  # all downloads are done and everything was taken
+                yield getter.result()
+            while not queue.empty():
+                yield queue.get_nowait()
+            task.result()  # raise unexpected errors of the run
+        finally:
+            for future in (getter, task):
+                if future is not None and not future.done():
+                    future.cancel()
+                    await asyncio.gather(future, return_exceptions=True)
+
+
+class AsyncNetworkClient(NetworkClient):
+    """Asynchronous client to send requests to EDGAR from within an event loop.
+
+    Takes the same arguments as :class:`NetworkClient`, but :meth:`get_response` and
+    :meth:`get_soup` are coroutines sending requests through a pooled
+    ``aiohttp.ClientSession``. Requests are paced by the same :attr:`limiter`, slowed down
+    by the same :attr:`rate_controller`, retried on connection errors up to ``retry_count``
+    times, validated like synchronous responses and cached in the same :attr:`cache`.
+    Responses are returned as ``requests.Response`` objects with their body already read.
+
+    Use :meth:`from_client` to create an asynchronous client sharing the rate limit of an
+    existing :class:`NetworkClient`.
+
+    Examples:
+        .. code-block:: python
+
+            import asyncio
+            from secedgar.client import AsyncNetworkClient
+
+            async def main():
+                async with AsyncNetworkClient(user_agent="Name (email)") as client:
+                    responses = await asyncio.gather(*[
+                        client.get_response("cgi-bin/browse-edgar",
+                                            {"action": "getcompany", "CIK": cik})
+                        for cik in ("320193", "789019")])
+
+            asyncio.run(main())
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_session = None
+
+    @classmethod
+    def from_client(cls, client):
+        """Create asynchronous client with the same settings as ``client``.
+
+        The new client shares the limiter, rate controller, cache, metrics, storage and
+        in-flight requests of ``client``, so requests made by both clients count towards a
+        single rate limit and identical requests are only made once.
+
+        Args:
+            client (secedgar.client.NetworkClient): Client to copy settings from.
+
+        Returns:
+            secedgar.client.AsyncNetworkClient: New asynchronous client.
+        """
+        async_client = cls(user_agent=client.user_agent,
+                           retry_count=client.retry_count,
+                           batch_size=client.batch_size,
+                           backoff_factor=client.backoff_factor,
+                           rate_limit=client.rate_limit,
+                           concurrency=client.concurrency,
+                           chunk_size=client.chunk_size,
+                           limiter=client.limiter,
+                           cache=client.cache,
+                           transport=client.transport,
+                           metrics=client.metrics,
+                           storage=client.storage,
+                           bandwidth_limiter=client.bandwidth_limiter)
+        async_client._rate_controller = client.rate_controller
+        async_client._single_flight = client._single_flight
+        return async_client
+
+    def _get_async_session(self):
+        """Get pooled ``aiohttp.ClientSession``, creating it on first use.
+
+        Must be called from within the event loop the session is used in.
+        """
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                headers={"User-Agent": self.user_agent})
+        return self._async_session
+
+    async def close_async(self):
+        """Close pooled ``aiohttp.ClientSession`` and release its connections."""
+        session, self._async_session = self._async_session, None
+        if session is not None:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_async()
+
+    async def _get_async(self, url, **kwargs):
+        """Send single get request.
+
+        Args:
+            url (str): URL to request.
+            kwargs: Keyword arguments to pass to ``aiohttp.ClientSession.get``.
+
+        Returns:
+            response (requests.Response): Response with body read.
+        """
+        async with self._get_async_session().get(url, **kwargs) as r:
+            body = await r.read()
+            response = requests.Response()
+            response.status_code = r.status
+            response.reason = r.reason
+            response.headers = CaseInsensitiveDict(r.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response.url = str(r.url)
+            response._content = body
+            response._content_consumed = True
+        return response
+
+    async def _send_async(self, url, **kwargs):
+        """Send rate limited get request, retrying connection errors and throttled requests.
+
+        Transient errors (408, 425 or 5xx responses) are retried after an exponential
+        backoff, like the retries of the synchronous session.
+
+        Args:
+            url (str): URL to request.
+            kwargs: Keyword arguments to pass to ``aiohttp.ClientSession.get``.
+
+        Returns:
+            response (requests.Response): First response which is neither throttled nor a
+                transient error, or the last response once ``retry_count`` retries are
+                used up.
+
+        Raises:
+            aiohttp.ClientError: If the connection still fails after ``retry_count`` retries.
+        """
+        local = self.transport.is_local(url, kwargs.get("params"))
+        for attempt in range(1, self.retry_count + 2):
+            if attempt > 1:
+                self.metrics.record_retry(url)
+            if not local:
+                self.metrics.record_limiter_wait(await self.limiter.acquire_async())
+            start = time.monotonic()
+            try:
+                response = await self.transport.get_async(self, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.metrics.record_request(url, None, time.monotonic() - start)
+                if attempt > self.retry_count:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            self._record_response(url, response, time.monotonic() - start)
+            if not local and self.bandwidth_limiter is not None:
+                await self.bandwidth_limiter.acquire_async(len(response.content or b""))
+            if self.rate_controller.is_throttled(response.status_code):
+                self.rate_controller.on_throttle(response.headers.get("Retry-After"),
+                                                 sent=start)
+            elif (response.status_code in self._RETRY_STATUSES
+                  and attempt <= self.retry_count):
+                await asyncio.sleep(self._backoff(attempt))
+            else:
+                self.rate_controller.on_success()
+                break
+        return self._validate_response(response)
+
+    async def get_response(self, path, params=None, **kwargs):
+        """Execute HTTP request asynchronously and return response if valid.
+
+        Args:
+            path (str): A properly-formatted path
+            params (dict): Dictionary of parameters to pass
+                to request. Defaults to None.
+            kwargs: Keyword arguments to pass to ``aiohttp.ClientSession.get``.
+
+        Returns:
+            response (requests.Response): A ``requests.Response`` object.
+
+        Raises:
+            EDGARQueryError: If problems arise when making query.
+        """
+        prepared_url = self._prepare_query(path)
+        key = self._request_key(prepared_url, params, kwargs)
+        if key is None:
+            return await self._get_response_async(prepared_url, params, **kwargs)
+        response, shared = await self._single_flight.do_async(
+            key, lambda: self._get_response_async(prepared_url, params, **kwargs))
+        if shared:
+            self.metrics.record_coalesced(prepared_url)
+        return response
+
+    async def iter_content(self, path, params=None):
+        """Stream body of response for ``path`` in chunks as it is received asynchronously.
+
+        See :meth:`secedgar.client.NetworkClient.iter_content`.
+
+        Args:
+            path (str): A properly-formatted path
+            params (dict): Dictionary of parameters to pass
+                to request. Defaults to None.
+
+        Yields:
+            bytes: Chunks of the body of at most :attr:`chunk_size` bytes.
+
+        Raises:
+            aiohttp.ClientResponseError: If the response has an error status.
+
+        .. versionadded:: 0.7.0
+        """
+        url = requests.Request("GET", self._prepare_query(path), params=params).prepare().url
+        local = self.transport.is_local(url)
+        if self.cache is not None and not local:
+            response = await self.get_response(path, params)
+            if response.status_code >= 400:
+                raise aiohttp.ClientResponseError(None, (), status=response.status_code,
+                                                  message=response.reason)
+            yield response.content
+            return
+        context, response = await self._open_stream(url, local)
+        try:
+            if response.status >= 400:
+                raise aiohttp.ClientResponseError(None, (), status=response.status,
+                                                  message="Error streaming {0}".format(url))
+            chunks = response.content.iter_chunked(self.chunk_size)
+            async for chunk in self._count_bytes(url, chunks, throttle=not local):
+                yield chunk
+        finally:
+            await context.__aexit__(None, None, None)
+
+    async def _open_stream(self, url, local):
+        """Start streamed request for ``url``, retrying connection errors and throttling.
+
+        Returns:
+            tuple: Entered asynchronous context manager of the response, which must be
+                exited once the body is read, and the ``aiohttp.ClientResponse``.
+        """
+        for attempt in range(1, self.retry_count + 2):
+            if attempt > 1:
+                self.metrics.record_retry(url)
+            if not local:
+                self.metrics.record_limiter_wait(await self.limiter.acquire_async())
+            start = time.monotonic()
+            context = self.transport.open_async(self, url, self._get_async_session())
+            try:
+                response = await context.__aenter__()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.metrics.record_request(url, None, time.monotonic() - start)
+                if attempt > self.retry_count:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            self.metrics.record_request(url, response.status, time.monotonic() - start)
+            if self.rate_controller.is_throttled(response.status):
+                self.rate_controller.on_throttle(response.headers.get("Retry-After"),
+                                                 sent=start)
+            elif response.status not in self._RETRY_STATUSES:
+                self.rate_controller.on_success()
+                break
+            if attempt > self.retry_count:
+                break
+            await context.__aexit__(None, None, None)
+            if not self.rate_controller.is_throttled(response.status):
+                await asyncio.sleep(self._backoff(attempt))
+        return context, response
+
+    async def _get_response_async(self, prepared_url, params=None, **kwargs):
+        """Get response for ``prepared_url``, from the cache if the client has one."""
+        headers = {"User-Agent": self.user_agent}
+        if self.cache is not None and not self.transport.is_local(prepared_url, params):
+            return await self._get_cached_response_async(prepared_url, params, headers,
+                                                         **kwargs)
+        return await self._send_async(prepared_url, params=params, headers=headers, **kwargs)
+
+    async def _get_cached_response_async(self, url, params, headers, **kwargs):
+        """Get response from cache, revalidating or fetching it if needed.
+
+        Cache files are read and written on the default executor so the event loop is
+        never blocked by disk access.
+
+        Args:
+            url (str): Full URL without query string.
+            params (dict): Dictionary of parameters to pass to request.
+            headers (dict): Headers to send with request.
+            kwargs: Keyword arguments to pass to ``aiohttp.ClientSession.get``.
+
+        Returns:
+            response (requests.Response): Cached or fetched response.
+        """
+        loop = asyncio.get_running_loop()
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        entry = await loop.run_in_executor(None, self.cache.get, full_url)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record_hit()
+                return entry.to_response()
+            headers.update(entry.validators)
+        response = await self._send_async(full_url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record_hit()
+            await loop.run_in_executor(None, self.cache.refresh, entry)
+            return entry.to_response()
+        self.cache.record_miss()
+        if response.status_code == 200:
+            await loop.run_in_executor(None, self.cache.put, full_url, response)
+        return response
+
+    async def get_soup(self, path, params, **kwargs):
+        """Return BeautifulSoup object from response text. Uses lxml parser.
+
+        Args:
+            path (str): A properly-formatted path
+            params (dict): Dictionary of parameters to pass
+                to request.
+
+        Returns:
+            BeautifulSoup object from response text.
+        """
+        response = await self.get_response(path, params, **kwargs)
+        return BeautifulSoup(response.text, features='lxml')
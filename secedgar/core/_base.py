@@ -1,10 +1,131 @@
+import contextlib
 import string
 from abc import ABC, abstractmethod
 
+from secedgar.client import AsyncNetworkClient
 from secedgar.exceptions import NoFilingsError
+from secedgar.utils import run_sync
 
 
-class AbstractFiling(ABC):
+class _ConsumerMixin:
+    """Download filings straight into a consumer instead of storing them on disk.
+
+    Classes using it have a ``client`` and implement ``_entries_async``.
+    """
+
+    async def _entries_async(self, client):
+        """Get URL and entry of every filing to download.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+
+        Returns:
+            iterable of tuple: URL of filing and entry describing it. May be an
+                asynchronous iterable, which is only iterated over while ``client`` is open.
+        """
+        raise NotImplementedError(
+            "{0} does not support processing filings in memory.".format(type(self).__name__))
+
+    def process(self, consumer, **kwargs):
+        """Download filings and pass them to ``consumer`` without storing them on disk.
+
+        Args:
+            consumer (callable): Called with the entry describing each filing and its
+                contents as bytes. Coroutine functions are awaited, other callables run on
+                a writer thread. The next filing is only downloaded once a slot of the
+                client's ``concurrency`` is free, so slow consumers hold back downloads.
+            kwargs: Keyword arguments to pass to
+                :meth:`secedgar.client.NetworkClient.wait_for_download_async`.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads. Errors raised
+                by ``consumer`` are recorded as failures.
+
+        Examples:
+            .. code-block:: python
+
+                from datetime import date
+                from secedgar import DailyFilings
+
+                def parse(entry, content):
+                    print(entry.company_name, len(content))
+
+                DailyFilings(date(2020, 12, 10), user_agent="Name (email)").process(parse)
+
+        .. versionadded:: 0.7.0
+        """
+        return run_sync(self.process_async(consumer, **kwargs))
+
+    async def process_async(self, consumer, client=None, **kwargs):
+        """Coroutine version of :meth:`process`.
+
+        Args:
+            consumer (callable): See :meth:`process`.
+            client (secedgar.client.AsyncNetworkClient, optional): Client to get the list
+                of filings with. Defaults to a client sharing the rate limit of
+                :attr:`client`.
+            kwargs: Keyword arguments to pass to
+                :meth:`secedgar.client.NetworkClient.wait_for_download_async`.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads.
+
+        .. versionadded:: 0.7.0
+        """
+        async with self._async_client(client) as async_client:
+            inputs = await self._entries_async(async_client)
+            return await self.client.wait_for_download_async(inputs, consumer=consumer,
+                                                             **kwargs)
+
+    async def iter_filings_async(self, client=None, max_pending=None, **kwargs):
+        """Download filings and iterate over them without storing them on disk.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to get the list
+                of filings with. Defaults to a client sharing the rate limit of
+                :attr:`client`.
+            max_pending (int, optional): Number of downloaded filings which may wait to be
+                taken before downloads pause. Defaults to the client's ``concurrency``.
+            kwargs: Keyword arguments to pass to
+                :meth:`secedgar.client.NetworkClient.iter_downloads_async`.
+
+        Yields:
+            tuple: Entry describing filing and its contents as bytes, in the order
+                downloads finish.
+
+        Examples:
+            .. code-block:: python
+
+                async def main(filings):
+                    async for entry, content in filings.iter_filings_async():
+                        await parse(entry, content)
+
+        .. versionadded:: 0.7.0
+        """
+        async with self._async_client(client) as async_client:
+            inputs = await self._entries_async(async_client)
+            async for item in self.client.iter_downloads_async(inputs,
+                                                               max_pending=max_pending,
+                                                               **kwargs):
+                yield item
+
+    @contextlib.asynccontextmanager
+    async def _async_client(self, client=None):
+        """Get asynchronous client to use for ``get_urls_async``.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use. If None,
+                a client sharing the rate limit of :attr:`client` is created and closed
+                once done. Defaults to None.
+        """
+        if client is not None:
+            yield client
+        else:
+            async with AsyncNetworkClient.from_client(self.client) as client:
+                yield client
+
+
+class AbstractFiling(_ConsumerMixin, ABC):
     """Abstract base class for all SEC EDGAR filings.
 
     .. versionadded:: 0.1.5
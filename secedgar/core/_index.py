@@ -1,17 +1,25 @@
-import asyncio
+import contextlib
 import os
-import re
 import shutil
 import tempfile
+import warnings
 from abc import abstractmethod
-from collections import namedtuple
 from queue import Empty, Queue
 from threading import Thread
 
 from secedgar.client import NetworkClient
 from secedgar.core._base import AbstractFiling
-from secedgar.exceptions import EDGARQueryError
-from secedgar.utils import make_path
+from secedgar.exceptions import EDGARQueryError, NoFilingsError
+from secedgar.filters import Filter
+from secedgar.idx import ColumnarIndex, _by_cik, _EntryParser
+from secedgar.storage import (FileSystemSink, compressed_path, open_compressed,
+                              validate_compression)
+from secedgar.utils import make_path, run_sync
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
 
 
 class IndexFilings(AbstractFiling):
@@ -27,13 +35,24 @@ class IndexFilings(AbstractFiling):
             fetching data. If None is given, a user_agent must be given to pass to
             :class:`secedgar.client.NetworkClient`.
             Defaults to ``secedgar.client.NetworkClient`` if none is given.
-        entry_filter (function, optional): A boolean function to determine
-            if the FilingEntry should be kept. E.g. `lambda l: l.form_type == "4"`.
-            Defaults to `None`.
+        entry_filter (Union[secedgar.filters.Filter, function], optional): A filter or
+            boolean function to determine if the FilingEntry should be kept.
+            E.g. ``FormType("4")`` or `lambda l: l.form_type == "4"`. Defaults to `None`.
+        index_store (secedgar.index_store.IndexStore, optional): Local database of index
+            entries to get entries from instead of fetching the idx file, when it covers all
+            days of the idx file. Defaults to None.
+        cache_idx (bool, optional): Keep the contents of the idx file in memory once it is
+            fetched, so that it is parsed again instead of fetched again when entries are
+            needed again. By default, the idx file is parsed while it downloads and its
+            contents are not kept. Defaults to False.
         kwargs: Any keyword arguments to pass to ``NetworkClient`` if no client is specified.
     """
 
-    def __init__(self, user_agent=None, client=None, entry_filter=None, **kwargs):
+    _FEED_DIRECTORY = ".feed"
+    """Directory within the target directory to download tar files of ``download_all`` to."""
+
+    def __init__(self, user_agent=None, client=None, entry_filter=None, index_store=None,
+                 cache_idx=False, **kwargs):
         super().__init__()
         self._client = client or NetworkClient(user_agent=user_agent, **kwargs)
         self._listings_directory = None
@@ -42,6 +61,8 @@ class IndexFilings(AbstractFiling):
         self._paths = []
         self._urls = {}
         self.entry_filter = entry_filter
+        self.index_store = index_store
+        self.cache_idx = cache_idx
 
     @property
     def entry_filter(self):
@@ -68,6 +89,16 @@ class IndexFilings(AbstractFiling):
         """Params should be empty."""
         return {}
 
+    @property
+    @abstractmethod
+    def _date_range(self):
+        """Tuple of datetime.date: First and last day covered by idx file."""
+        pass  # pragma: no cover
+
+    def _in_index_store(self):
+        """Whether entries of idx file can be taken from :attr:`index_store`."""
+        return self.index_store is not None and self.index_store.covers(*self._date_range)
+
     @property
     @abstractmethod
     def year(self):
@@ -117,67 +148,305 @@ class IndexFilings(AbstractFiling):
     def _get_master_idx_file(self, update_cache=False, **kwargs):
         """Get master file with all filings from given date.
 
+        The file is kept in memory, see :meth:`_iter_master_idx_file` to stream it instead.
+
         Args:
             update_cache (bool, optional): Whether master index should be updated
                 method call. Defaults to False.
             kwargs: Keyword arguments to pass to
-                ``secedgar.client.NetworkClient.get_response``.
+                ``secedgar.client.NetworkClient.iter_content``.
 
         Returns:
-            text (str): Idx file text.
+            content (bytes): Idx file contents. They are left undecoded, since
+                :func:`secedgar.idx.parse_idx` decodes the file one line at a time.
 
         Raises:
             EDGARQueryError: If no file of the form master.<DATE>.idx
                 is found.
         """
         if self._master_idx_file is None or update_cache:
-            if self.idx_filename in self._get_listings_directory().text:
-                master_idx_url = "{path}{filename}".format(
-                    path=self.path, filename=self.idx_filename)
-                self._master_idx_file = self.client.get_response(
-                    master_idx_url, self.params, **kwargs).text
-            else:
-                raise EDGARQueryError("""File {filename} not found.
+            self._master_idx_file = b"".join(
+                self._iter_master_idx_file(update_cache=True, **kwargs))
+        return self._master_idx_file
+
+    def _iter_master_idx_file(self, update_cache=False, **kwargs):
+        """Stream master file with all filings from given date.
+
+        Unless :attr:`cache_idx` is set, the file is not kept once it has been streamed.
+
+        Args:
+            update_cache (bool, optional): Whether to fetch the file even if it was kept.
+                Defaults to False.
+            kwargs: Keyword arguments to pass to
+                ``secedgar.client.NetworkClient.iter_content``.
+
+        Returns:
+            iterator of bytes: Chunks of idx file as they are received.
+
+        Raises:
+            EDGARQueryError: If no file of the form master.<DATE>.idx
+                is found. This is raised right away rather than once the chunks are
+                iterated over.
+        """
+        if self._master_idx_file is not None and not update_cache:
+            return iter([self._master_idx_file])
+        if self.idx_filename not in self._get_listings_directory().text:
+            self._raise_no_idx_file()
+        return self._keep_if_cached(
+            self.client.iter_content(self._master_idx_path, self.params, **kwargs))
+
+    def _keep_if_cached(self, chunks):
+        """Pass on ``chunks`` of idx file, keeping the file once complete if :attr:`cache_idx`."""
+        kept = [] if self.cache_idx else None
+        for chunk in chunks:
+            if kept is not None:
+                kept.append(chunk)
+            yield chunk
+        if kept is not None:
+            self._master_idx_file = b"".join(kept)
+
+    @property
+    def _master_idx_path(self):
+        """str: Path of master idx file added to the client base."""
+        return "{path}{filename}".format(path=self.path, filename=self.idx_filename)
+
+    def _raise_no_idx_file(self):
+        raise EDGARQueryError("""File {filename} not found.
                                      There may be no filings for the given day/quarter."""
-                                      .format(filename=self.idx_filename))
+                              .format(filename=self.idx_filename))
+
+    async def _get_listings_directory_async(self, client, update_cache=False, **kwargs):
+        """Get page with list of all idx files for given date or quarter asynchronously.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+            update_cache (bool, optional): Whether quarterly directory should update cache.
+                Defaults to False.
+            kwargs: Any keyword arguments to pass to the client's `get_response` method.
+
+        Returns:
+            response (requests.Response): Response object from page with all idx files for
+                given quarter and year.
+        """
+        if self._listings_directory is None or update_cache:
+            self._listings_directory = await client.get_response(
+                self.path, self.params, **kwargs)
+        return self._listings_directory
+
+    async def _get_master_idx_file_async(self, client, update_cache=False, **kwargs):
+        """Get master file with all filings from given date asynchronously.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+            update_cache (bool, optional): Whether master index should be updated
+                method call. Defaults to False.
+            kwargs: Keyword arguments to pass to
+                ``secedgar.client.AsyncNetworkClient.iter_content``.
+
+        Returns:
+            content (bytes): Idx file contents. They are left undecoded, since
+                :func:`secedgar.idx.parse_idx` decodes the file one line at a time.
+
+        Raises:
+            EDGARQueryError: If no file of the form master.<DATE>.idx
+                is found.
+        """
+        if self._master_idx_file is None or update_cache:
+            chunks = await self._iter_master_idx_file_async(client, update_cache=True,
+                                                            **kwargs)
+            self._master_idx_file = b"".join([chunk async for chunk in chunks])
         return self._master_idx_file
 
+    async def _iter_master_idx_file_async(self, client, update_cache=False, **kwargs):
+        """Stream master file with all filings from given date asynchronously.
+
+        See :meth:`_iter_master_idx_file`.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+            update_cache (bool, optional): Whether to fetch the file even if it was kept.
+                Defaults to False.
+            kwargs: Keyword arguments to pass to
+                ``secedgar.client.AsyncNetworkClient.iter_content``.
+
+        Returns:
+            asynchronous iterator of bytes: Chunks of idx file as they are received.
+
+        Raises:
+            EDGARQueryError: If no file of the form master.<DATE>.idx
+                is found.
+        """
+        if self._master_idx_file is not None and not update_cache:
+            return _aiter([self._master_idx_file])
+        listings_directory = await self._get_listings_directory_async(client)
+        if self.idx_filename not in listings_directory.text:
+            self._raise_no_idx_file()
+        return self._keep_if_cached_async(
+            client.iter_content(self._master_idx_path, self.params, **kwargs))
+
+    async def _keep_if_cached_async(self, chunks):
+        """Asynchronous version of :meth:`_keep_if_cached`."""
+        kept = [] if self.cache_idx else None
+        async for chunk in chunks:
+            if kept is not None:
+                kept.append(chunk)
+            yield chunk
+        if kept is not None:
+            self._master_idx_file = b"".join(kept)
+
     def get_filings_dict(self, **kwargs):
         """Get all filings inside an idx file.
 
+        The idx file is parsed while it downloads.
+
         Args:
-            kwargs: Any kwargs to pass to _get_master_idx_file. See
-                ``secedgar.core.daily.DailyFilings._get_master_idx_file``.
+            kwargs: Any kwargs to pass to _iter_master_idx_file. See
+                ``secedgar.core._index.IndexFilings._iter_master_idx_file``.
         """
-        idx_file = self._get_master_idx_file(**kwargs)
-        # Will have CIK as keys and list of FilingEntry namedtuples as values
-        self._filings_dict = {}
-        FilingEntry = namedtuple("FilingEntry", [
-            "cik", "company_name", "form_type", "date_filed", "file_name",
-            "path", "num_previously_valid"
-        ])
-        # idx file will have lines of the form CIK|Company Name|Form Type|Date Filed|File Name
-        current_count = 0
-        entries = re.findall(r'^[0-9]+[|].+[|].+[|][0-9\-]+[|].+$',
-                             idx_file, re.MULTILINE)
-        for entry in entries:
-            fields = entry.split("|")
-            fields[-1] = fields[-1].strip()  # get rid of carriage return or newline
-            path = "Archives/{file_name}".format(file_name=fields[-1])
-            entry = FilingEntry(*fields,
-                                path=path,
-                                num_previously_valid=current_count)
-            if self.entry_filter is not None and not self.entry_filter(
-                    entry):
-                continue
-            current_count += 1
-            # Add new filing entry to CIK's list
-            if entry.cik in self._filings_dict:
-                self._filings_dict[entry.cik].append(entry)
-            else:
-                self._filings_dict[entry.cik] = [entry]
+        if self._in_index_store():
+            return self._filings_dict_from_store()
+        self._filings_dict = _by_cik(self.iter_entries(**kwargs))
         return self._filings_dict
 
+    async def get_filings_dict_async(self, client=None, **kwargs):
+        """Get all filings inside an idx file asynchronously.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``get_response`` method.
+
+        .. versionadded:: 0.7.0
+        """
+        if self._in_index_store():
+            return self._filings_dict_from_store()
+        self._filings_dict = _by_cik(
+            [entry async for entry in self.iter_entries_async(client, **kwargs)])
+        return self._filings_dict
+
+    def iter_entries(self, **kwargs):
+        """Iterate over entries of the idx file which pass :attr:`entry_filter`.
+
+        The idx file is streamed and each entry is yielded as soon as its line is received,
+        so the first entries are available long before a quarter's idx file has downloaded
+        and the file is never held in memory as a whole (unless :attr:`cache_idx` is set).
+
+        Args:
+            kwargs: Any kwargs to pass to _iter_master_idx_file. See
+                ``secedgar.core._index.IndexFilings._iter_master_idx_file``.
+
+        Yields:
+            secedgar.idx.FilingEntry: Entries in the order they are listed.
+
+        Raises:
+            EDGARQueryError: If there is no idx file.
+
+        Examples:
+            .. code-block:: python
+
+                from secedgar import QuarterlyFilings
+                from secedgar.filters import FormType
+
+                filings = QuarterlyFilings(2021, 2, user_agent="Name (email)",
+                                           entry_filter=FormType("10-K"))
+                for entry in filings.iter_entries():
+                    print(entry.company_name, entry.path)
+
+        .. versionadded:: 0.7.0
+        """
+        if self._in_index_store():
+            for entries in self._filings_dict_from_store().values():
+                yield from entries
+            return
+        chunks = self._iter_master_idx_file(**kwargs)
+        yield from _EntryParser(self.entry_filter).parse(chunks)
+
+    async def iter_entries_async(self, client=None, **kwargs):
+        """Iterate over entries of the idx file asynchronously as it downloads.
+
+        See :meth:`iter_entries`.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``iter_content`` method.
+
+        Yields:
+            secedgar.idx.FilingEntry: Entries in the order they are listed.
+
+        .. versionadded:: 0.7.0
+        """
+        if self._in_index_store():
+            for entries in self._filings_dict_from_store().values():
+                for entry in entries:
+                    yield entry
+            return
+        parser = _EntryParser(self.entry_filter)
+        async with self._async_client(client) as client:
+            chunks = await self._iter_master_idx_file_async(client, **kwargs)
+            async for chunk in chunks:
+                for entry in parser.feed(chunk):
+                    yield entry
+        for entry in parser.close():
+            yield entry
+
+    def _filings_dict_from_store(self):
+        """Get entries passing :attr:`entry_filter` from :attr:`index_store`."""
+        self._filings_dict = self.index_store.filings_dict(*self._date_range,
+                                                           entry_filter=self.entry_filter)
+        return self._filings_dict
+
+    def get_index(self, **kwargs):
+        """Get all entries of the idx file as columns.
+
+        :attr:`entry_filter` is applied to whole columns if it is a
+        :class:`secedgar.filters.Filter`. Functions, on their own or combined with
+        filters, are not applied. Use
+        :meth:`secedgar.idx.ColumnarIndex.filter` to filter the index further.
+        Requires ``numpy``.
+
+        Args:
+            kwargs: Any kwargs to pass to _iter_master_idx_file. See
+                ``secedgar.core._index.IndexFilings._iter_master_idx_file``.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Entries of idx file.
+
+        .. versionadded:: 0.7.0
+        """
+        if self._in_index_store():
+            return self._filter_index(self.index_store.get_index(*self._date_range))
+        return self._filter_index(ColumnarIndex.from_idx(self._iter_master_idx_file(**kwargs)))
+
+    async def get_index_async(self, client=None, **kwargs):
+        """Get all entries of the idx file as columns asynchronously.
+
+        See :meth:`get_index`.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``iter_content`` method.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Entries of idx file.
+
+        .. versionadded:: 0.7.0
+        """
+        if self._in_index_store():
+            return self.get_index()
+        async with self._async_client(client) as client:
+            chunks = await self._iter_master_idx_file_async(client, **kwargs)
+            chunks = [chunk async for chunk in chunks]
+        return self._filter_index(ColumnarIndex.from_idx(chunks))
+
+    def _filter_index(self, index):
+        """Apply parts of :attr:`entry_filter` which are not functions to columnar index."""
+        if not isinstance(self.entry_filter, Filter):
+            return index
+        pushed, _ = self.entry_filter.split()
+        return index if pushed is None else index.filter(where=pushed)
+
     def get_urls(self):
         """Get all URLs for day.
 
@@ -186,7 +455,32 @@ class IndexFilings(AbstractFiling):
         Returns:
             urls (list of str): List of all URLs to get.
         """
-        filings_dict = self.get_filings_dict()
+        return self._to_urls(self.get_filings_dict())
+
+    async def get_urls_async(self, client=None, **kwargs):
+        """Get all URLs for day asynchronously.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``get_response`` method.
+
+        Returns:
+            urls (list of str): List of all URLs to get.
+
+        .. versionadded:: 0.7.0
+        """
+        return self._to_urls(await self.get_filings_dict_async(client, **kwargs))
+
+    async def _entries_async(self, client):
+        """Get URL and ``FilingEntry`` of every filing in the idx file as it downloads."""
+        async def entries():
+            async for entry in self.iter_entries_async(client):
+                yield self.client._prepare_query(entry.path), entry
+        return entries()
+
+    def _to_urls(self, filings_dict):
+        """Build URLs of all filings in ``filings_dict``."""
         self._urls = {
             company:
             [self.client._prepare_query(entry.path) for entry in entries]
@@ -195,27 +489,49 @@ class IndexFilings(AbstractFiling):
         return self._urls
 
     @staticmethod
-    def _do_create_and_copy(q):
+    def _do_create_and_copy(q, compression=None, compression_level=None, storage=None):
         """Create path and copy file to end of path.
 
         Args:
             q (Queue.queue): Queue to get filename, new directory,
                 and old path information from.
+            compression (Union[str, NoneType], optional): Compression method to copy file
+                with. See :func:`secedgar.storage.open_compressed`. Defaults to None.
+            compression_level (Union[int, NoneType], optional): Compression level.
+                Defaults to None.
+            storage (secedgar.storage.StorageSink, optional): Sink to store file in.
+                Defaults to :class:`secedgar.storage.FileSystemSink`.
         """
+        if storage is None:
+            storage = FileSystemSink()
         while True:
             try:
                 filename, new_dir, old_path = q.get(timeout=1)
             except Empty:
                 return
-            make_path(new_dir)
-            path = os.path.join(new_dir, filename)
-            shutil.copyfile(old_path, path)
+            path = storage.location(os.path.join(new_dir, filename))
+            if path is None:
+                with open(old_path, "rb") as src:
+                    storage.store(os.path.join(new_dir, filename), src)
+                q.task_done()
+                continue
+            make_path(os.path.dirname(path), exist_ok=True)
+            if compression is None:
+                shutil.copyfile(old_path, path)
+            else:
+                with open(old_path, "rb") as src, open_compressed(
+                        compressed_path(path, compression), compression,
+                        compression_level) as dst:
+                    shutil.copyfileobj(src, dst)
             q.task_done()
 
     @staticmethod
     def _do_unpack_archive(q, extract_directory):
         """Unpack archive file in given extract directory.
 
+        Archives are removed once they are unpacked. Archives which cannot be unpacked are
+        kept, and a warning is issued.
+
         Args:
             q (Queue.queue): Queue to get filname from.
             extract_directory (): Where to extract archive file.
@@ -225,24 +541,42 @@ class IndexFilings(AbstractFiling):
                 filename = q.get(timeout=1)
             except Empty:
                 return
-            shutil.unpack_archive(filename, extract_directory)
-            os.remove(filename)
-            q.task_done()
+            try:
+                shutil.unpack_archive(filename, extract_directory)
+            except Exception as e:
+                warnings.warn("Could not unpack {0}: {1}".format(filename, e))
+            else:
+                os.remove(filename)
+            finally:
+                q.task_done()
 
-    def _unzip(self, extract_directory):
+    def _unzip(self, extract_directory, download_directory=None):
         """Unzips files from tar files into extract directory.
 
         Args:
             extract_directory (str): Temporary path to extract files to.
                 Note that this directory will be completely removed after
                 files are unzipped.
+            download_directory (str, optional): Path to download tar files to. Interrupted
+                downloads are kept there as ``.part`` files and resumed by the next run, and
+                tar files are removed once they are unpacked. Defaults to
+                ``extract_directory``.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of downloading tar files.
+                Tar files which failed to download are not unpacked.
         """
-        # Download tar files asynchronously into extract_directory
+        if download_directory is None:
+            download_directory = extract_directory
+        # Download tar files asynchronously into download_directory
         tar_urls = self._get_tar_urls()
-        inputs = [(url, os.path.join(extract_directory, url.split('/')[-1])) for url in tar_urls]
-        asyncio.run(self.client.wait_for_download_async(inputs))
+        inputs = [(url, os.path.join(download_directory, url.split('/')[-1]))
+                  for url in tar_urls]
+        report = run_sync(self.client.wait_for_download_async(inputs,
+                                                              storage=FileSystemSink()))
 
-        tar_files = [p for _, p in inputs]
+        failed = set(report.failed_inputs)
+        tar_files = [p for url, p in inputs if (url, p) not in failed]
 
         unpack_queue = Queue(maxsize=len(tar_files))
         unpack_threads = len(tar_files)
@@ -252,13 +586,13 @@ class IndexFilings(AbstractFiling):
                             args=(unpack_queue, extract_directory))
             worker.start()
         for f in tar_files:
-            full_path = os.path.join(extract_directory, f)
-            unpack_queue.put_nowait(full_path)
+            unpack_queue.put_nowait(f)
 
         unpack_queue.join()
+        return report
 
     def _move_to_dest(self, urls, extract_directory, directory, file_pattern,
-                      dir_pattern):
+                      dir_pattern, compression=None, compression_level=None):
         """Moves all files from extract_directory into proper final format in directory.
 
         Args:
@@ -271,14 +605,23 @@ class IndexFilings(AbstractFiling):
                 Valid options are `cik`. See ``save`` method for more.
             file_pattern (str): Format string for files. Default is `{accession_number}`.
                 Valid options are `accession_number`. See ``save`` method for more.
+            compression (Union[str, NoneType], optional): Compression method to store files
+                with. Defaults to None.
+            compression_level (Union[int, NoneType], optional): Compression level.
+                Defaults to None.
         """
+        storage = self.client.storage
+        if compression is not None and not isinstance(storage, FileSystemSink):
+            raise ValueError("Compression can only be used with a FileSystemSink. "
+                             "Given {0}.".format(type(storage).__name__))
         # Allocate threads to move files according to pattern
         link_list = [item for links in urls.values() for item in links]
 
         move_queue = Queue(maxsize=len(link_list))
         move_threads = 64
         for _ in range(move_threads):
-            worker = Thread(target=self._do_create_and_copy, args=(move_queue,))
+            worker = Thread(target=self._do_create_and_copy,
+                            args=(move_queue, compression, compression_level, storage))
             worker.start()
 
         (_, _, extracted_files) = next(os.walk(extract_directory))
@@ -301,13 +644,15 @@ class IndexFilings(AbstractFiling):
                     move_queue.put_nowait((formatted_file, full_dir, old_path))
                     break
         move_queue.join()
+        storage.flush()
 
     def _save_filings(self,
                       directory,
                       dir_pattern="{cik}",
                       file_pattern="{accession_number}",
                       download_all=False,
-                      **kwargs):
+                      compression=None,
+                      compression_level=None):
         """Save all filings.
 
         Will store all filings under the parent directory of ``directory``, further
@@ -320,27 +665,96 @@ class IndexFilings(AbstractFiling):
             file_pattern (str): Format string for files. Default is `{accession_number}`.
                 Valid options are `{accession_number}`.
             download_all (bool): Type of downloading system, if true downloads all tar files,
-                if false downloads each file in index. Default is `False`.
+                if false downloads each file in index. Tar files are downloaded to a
+                ``.feed`` subdirectory of ``directory``, where interrupted downloads are
+                resumed by the next run. Default is `False`.
+            compression (Union[str, NoneType]): Compress filings while writing them with
+                "gzip" or "zstd". The matching suffix (".gz" or ".zst") is added to each
+                file. Default is `None`.
+            compression_level (Union[int, NoneType]): Compression level. Default is `None`,
+                which uses the default level of the compression method.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads, including
+                those which failed.
+
+        Raises:
+            NoFilingsError: If no filings pass :attr:`entry_filter`.
+
+        .. versionchanged:: 0.7.0
+           Unless ``download_all`` is set, filings are downloaded while the idx file
+           is still being received. Can be called while an event loop is running (e.g. in
+           Jupyter), in which case downloads run in an event loop on another thread.
         """
-        urls = self.get_urls_safely(**kwargs)
-
-        if download_all:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                self._unzip(extract_directory=tmpdir)
-                # Apply folder structure by moving to final directory
-                self._move_to_dest(urls=urls,
-                                   extract_directory=tmpdir,
-                                   directory=directory,
-                                   file_pattern=file_pattern,
-                                   dir_pattern=dir_pattern)
-        else:
-            inputs = []
-            for company, links in urls.items():
-                formatted_dir = dir_pattern.format(cik=company)
-                for link in links:
-                    formatted_file = file_pattern.format(
-                        accession_number=self.get_accession_number(link))
-                    path = os.path.join(directory, formatted_dir,
-                                        formatted_file)
-                    inputs.append((link, path))
-            asyncio.run(self.client.wait_for_download_async(inputs))
+        validate_compression(compression)
+        if not download_all:
+            return run_sync(self._save_streamed(directory, dir_pattern, file_pattern,
+                                                compression=compression,
+                                                compression_level=compression_level))
+
+        urls = self.get_urls_safely()
+        # Tar files are kept next to the filings until unpacked, so reruns resume them
+        download_directory = os.path.join(directory, self._FEED_DIRECTORY)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = self._unzip(extract_directory=tmpdir,
+                                 download_directory=download_directory)
+            # Apply folder structure by moving to final directory
+            self._move_to_dest(urls=urls,
+                               extract_directory=tmpdir,
+                               directory=directory,
+                               file_pattern=file_pattern,
+                               dir_pattern=dir_pattern,
+                               compression=compression,
+                               compression_level=compression_level)
+        with contextlib.suppress(OSError):
+            os.rmdir(download_directory)  # only removed once nothing is left to resume
+        return report
+
+    async def _save_streamed(self, directory, dir_pattern, file_pattern, **kwargs):
+        """Download filings as their entries are parsed from the streamed idx file.
+
+        Args:
+            directory (str): Directory where filings should be stored.
+            dir_pattern (str): Format string for subdirectories.
+            file_pattern (str): Format string for files.
+            kwargs: Keyword arguments to pass to
+                :meth:`secedgar.client.NetworkClient.wait_for_download_async`.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads.
+        """
+        async with self._async_client() as client:
+            entries = (await self._entries_async(client)).__aiter__()
+            # Wait for first entry, so nothing is stored if there are no filings
+            try:
+                first = await entries.__anext__()
+            except StopAsyncIteration:
+                raise NoFilingsError("No filings available.") from None
+
+            async def all_entries():
+                yield first
+                async for entry in entries:
+                    yield entry
+
+            inputs = self._download_inputs(all_entries(), directory, dir_pattern,
+                                           file_pattern)
+            return await self.client.wait_for_download_async(inputs, **kwargs)
+
+    async def _download_inputs(self, entries, directory, dir_pattern, file_pattern):
+        """Yield URL and path of every filing in ``entries``, so no list of them is built.
+
+        Args:
+            entries (asynchronous iterable): URL and entry of filings to download. See
+                ``_entries_async``.
+            directory (str): Directory where filings should be stored.
+            dir_pattern (str): Format string for subdirectories.
+            file_pattern (str): Format string for files.
+
+        Yields:
+            tuple: URL of filing and path to save it to.
+        """
+        async for link, entry in entries:
+            formatted_dir = dir_pattern.format(cik=entry.cik)
+            formatted_file = file_pattern.format(
+                accession_number=self.get_accession_number(link))
+            yield link, os.path.join(directory, formatted_dir, formatted_file)
@@ -1,11 +1,16 @@
+import asyncio
 import datetime
+import time
 from functools import reduce
 from typing import Union
 
-from secedgar.client import NetworkClient
+from secedgar.client import AsyncNetworkClient, DownloadReport, NetworkClient
+from secedgar.core._base import _ConsumerMixin
 from secedgar.core.daily import DailyFilings
 from secedgar.core.quarterly import QuarterlyFilings
 from secedgar.exceptions import EDGARQueryError, NoFilingsError
+from secedgar.filters import DateRange, Filter
+from secedgar.idx import ColumnarIndex
 from secedgar.utils import add_quarter, get_month, get_quarter
 
 
@@ -28,7 +33,7 @@ def fill_days(start, end, include_start=False, include_end=False):
     return [start + datetime.timedelta(days=d) for d in range(start_range, end_range)]
 
 
-class ComboFilings:
+class ComboFilings(_ConsumerMixin):
     """Class for retrieving all filings between specified dates.
 
     Args:
@@ -47,15 +52,20 @@ class ComboFilings:
             fetching data. If None is given, a user_agent must be given to pass to
             :class:`secedgar.client.NetworkClient`.
             Defaults to ``secedgar.client.NetworkClient`` if none is given.
-        entry_filter (function, optional): A boolean function to determine
-            if the FilingEntry should be kept. Defaults to `lambda _: True`.
+        entry_filter (Union[secedgar.filters.Filter, function], optional): A filter or
+            boolean function to determine if the FilingEntry should be kept.
+            Defaults to `lambda _: True`.
             The ``FilingEntry`` object exposes 7 variables which can be
             used to filter which filings to keep. These are "cik", "company_name",
             "form_type", "date_filed", "file_name", "path", and "num_previously_valid".
+            Quarters and days outside the dates of a :class:`secedgar.filters.Filter`
+            are not fetched.
         balancing_point (int): Number of days from which to change lookup method from using
             ``DailyFilings`` to ``QuarterlyFilings``. If ``QuarterlyFilings`` is used, an
             additional filter will be added to limit which days are included.
             Defaults to 30.
+        index_store (secedgar.index_store.IndexStore, optional): Local database of index
+            entries to use for quarters and days it covers. Defaults to None.
         kwargs: Any keyword arguments to pass to ``NetworkClient`` if no client is specified.
 
     .. versionadded:: 0.4.0
@@ -80,6 +90,7 @@ class ComboFilings:
                  client=None,
                  entry_filter=lambda _: True,
                  balancing_point=30,
+                 index_store=None,
                  **kwargs):
         self.entry_filter = entry_filter
         self.start_date = start_date
@@ -87,6 +98,7 @@ class ComboFilings:
         self.user_agent = user_agent
         self._client = client or NetworkClient(user_agent=user_agent, **kwargs)
         self._balancing_point = balancing_point
+        self.index_store = index_store
 
     @property
     def entry_filter(self):
@@ -167,9 +179,7 @@ class ComboFilings:
                 elif days_till_next_quarter > self.balancing_point:
                     quarterly_date_list.append(
                         (current_year, current_quarter,
-                         lambda x: datetime.datetime.strptime(
-                             x.date_filed, '%Y-%m-%d'
-                         ).date() >= self.start_date))
+                         DateRange(start=self.start_date)))
                     current_date = next_start_quarter_date
                 else:
                     daily_date_list.extend(fill_days(start=current_date,
@@ -186,9 +196,7 @@ class ComboFilings:
                     else:
                         quarterly_date_list.append(
                             (current_year, current_quarter,
-                             lambda x: datetime.datetime.strptime(
-                                 x.date_filed, '%Y-%m-%d'
-                             ).date() <= self.end_date))
+                             DateRange(end=self.end_date)))
                         current_date = self.end_date
                 else:
                     daily_date_list.extend(fill_days(start=current_date,
@@ -208,8 +216,55 @@ class ComboFilings:
         """List of ``datetime.date``: List of dates for which to fetch daily data."""
         return self._get_quarterly_daily_date_lists()[1]  # 1 = daily
 
-    def get_urls(self):
-        """Get all urls between ``start_date`` and ``end_date``."""
+    def _in_bounds(self, first, last):
+        """Whether entries filed from ``first`` to ``last`` can pass :attr:`entry_filter`."""
+        if not isinstance(self.entry_filter, Filter):
+            return True
+        bounds = self.entry_filter.bounds()
+        return not ((bounds.start_date is not None and last.isoformat() < bounds.start_date)
+                    or (bounds.end_date is not None and first.isoformat() > bounds.end_date))
+
+    def _quarterly_filings(self):
+        """Get ``QuarterlyFilings`` for every quarter in :attr:`quarterly_date_list`.
+
+        Quarters outside the dates of a :class:`secedgar.filters.Filter` given as
+        :attr:`entry_filter` are skipped.
+        """
+        quarterly_filings = []
+        for (year, quarter, f) in self.quarterly_date_list:
+            first = datetime.date(year, get_month(quarter), 1)
+            next_year, next_quarter = add_quarter(year, quarter)
+            last = datetime.date(next_year, get_month(next_quarter), 1) - datetime.timedelta(1)
+            if not self._in_bounds(first, last):
+                continue
+            if isinstance(f, Filter):  # only part of the quarter is needed
+                entry_filter = f & self.entry_filter
+            else:
+                entry_filter = self.entry_filter
+            quarterly_filings.append(QuarterlyFilings(year=year,
+                                                      quarter=quarter,
+                                                      user_agent=self.user_agent,
+                                                      client=self.client,
+                                                      entry_filter=entry_filter,
+                                                      index_store=self.index_store))
+        return quarterly_filings
+
+    def _daily_filings(self):
+        """Get ``DailyFilings`` for every date in :attr:`daily_date_list`.
+
+        Days outside the dates of a :class:`secedgar.filters.Filter` given as
+        :attr:`entry_filter` are skipped.
+        """
+        return [DailyFilings(date=_date,
+                             user_agent=self.user_agent,
+                             client=self.client,
+                             entry_filter=self.entry_filter,
+                             index_store=self.index_store)
+                for _date in self.daily_date_list if self._in_bounds(_date, _date)]
+
+    @staticmethod
+    def _merge_urls(list_of_dicts):
+        """Merge dictionaries of URLs, concatenating lists of URLs for the same key."""
         # Use functools.reduce for speed
         # see https://stackoverflow.com/questions/10461531/merge-and-sum-of-two-dictionaries
         def _reducer(accumulator, dictionary):
@@ -217,34 +272,125 @@ class ComboFilings:
                 accumulator[key] = accumulator.get(key, []) + value
             return accumulator
 
-        list_of_dicts = []
-        for (year, quarter, f) in self.quarterly_date_list:
-            q = QuarterlyFilings(year=year,
-                                 quarter=quarter,
-                                 user_agent=self.user_agent,
-                                 client=self.client,
-                                 entry_filter=lambda x: f(x) and self.entry_filter(x))
-            list_of_dicts.append(q.get_urls())
-
-        for _date in self.daily_date_list:
-            d = DailyFilings(date=_date,
-                             user_agent=self.user_agent,
-                             client=self.client,
-                             entry_filter=self.entry_filter)
+        return reduce(_reducer, list_of_dicts, {})
+
+    def get_urls(self):
+        """Get all urls between ``start_date`` and ``end_date``."""
+        list_of_dicts = [q.get_urls() for q in self._quarterly_filings()]
+
+        for d in self._daily_filings():
             try:
                 list_of_dicts.append(d.get_urls())
             except EDGARQueryError:  # continue if no URLs available for given day
                 continue
 
-        complete_dictionary = reduce(_reducer, list_of_dicts, {})
-        return complete_dictionary
+        return self._merge_urls(list_of_dicts)
+
+    async def get_urls_async(self, client=None, **kwargs):
+        """Get all urls between ``start_date`` and ``end_date`` asynchronously.
+
+        Index files of all quarters and days are fetched concurrently.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``get_response`` method.
+
+        .. versionadded:: 0.7.0
+        """
+        if client is None:
+            async with AsyncNetworkClient.from_client(self.client) as client:
+                return await self.get_urls_async(client, **kwargs)
+
+        async def _get_daily_urls(d):
+            try:
+                return await d.get_urls_async(client, **kwargs)
+            except EDGARQueryError:  # continue if no URLs available for given day
+                return {}
+
+        list_of_dicts = await asyncio.gather(
+            *[q.get_urls_async(client, **kwargs) for q in self._quarterly_filings()],
+            *[_get_daily_urls(d) for d in self._daily_filings()])
+        return self._merge_urls(list_of_dicts)
+
+    async def _entries_async(self, client):
+        """Get URL and ``FilingEntry`` of every filing in all quarters and days.
+
+        Index files are streamed one after another, quarters first, so entries are produced
+        as they are parsed and only as fast as they are taken.
+        """
+        async def entries():
+            for filings in self._quarterly_filings():
+                async for item in await filings._entries_async(client):
+                    yield item
+            for filings in self._daily_filings():
+                try:
+                    async for item in await filings._entries_async(client):
+                        yield item
+                except EDGARQueryError:  # continue if no filings available for given day
+                    continue
+        return entries()
+
+    def get_index(self):
+        """Get entries of all quarters and days between ``start_date`` and ``end_date``.
+
+        Entries are returned as columns, see :class:`secedgar.idx.ColumnarIndex`.
+        :attr:`entry_filter` is applied to whole columns if it is a
+        :class:`secedgar.filters.Filter`. Functions, on their own or combined with
+        filters, are not applied. Requires ``numpy``.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Entries filed between ``start_date`` and
+                ``end_date``.
+
+        .. versionadded:: 0.7.0
+        """
+        indexes = [q.get_index() for q in self._quarterly_filings()]
+        for d in self._daily_filings():
+            try:
+                indexes.append(d.get_index())
+            except EDGARQueryError:  # continue if no filings available for given day
+                continue
+        return ColumnarIndex.concat(indexes).filter(start_date=self.start_date,
+                                                    end_date=self.end_date)
+
+    async def get_index_async(self, client=None, **kwargs):
+        """Get entries of all quarters and days asynchronously.
+
+        Index files of all quarters and days are fetched concurrently. See :meth:`get_index`.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            kwargs: Any kwargs to pass to the client's ``get_response`` method.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Entries filed between ``start_date`` and
+                ``end_date``.
+
+        .. versionadded:: 0.7.0
+        """
+        async def _get_daily_index(d):
+            try:
+                return await d.get_index_async(client, **kwargs)
+            except EDGARQueryError:  # continue if no filings available for given day
+                return None
+
+        async with self._async_client(client) as client:
+            indexes = await asyncio.gather(
+                *[q.get_index_async(client, **kwargs) for q in self._quarterly_filings()],
+                *[_get_daily_index(d) for d in self._daily_filings()])
+        return ColumnarIndex.concat([i for i in indexes if i is not None]).filter(
+            start_date=self.start_date, end_date=self.end_date)
 
     def save(self,
              directory,
              dir_pattern=None,
              file_pattern="{accession_number}",
              download_all=False,
-             daily_date_format="%Y%m%d"):
+             daily_date_format="%Y%m%d",
+             compression=None,
+             compression_level=None):
         """Save all filings between ``start_date`` and ``end_date``.
 
         Only filings that satisfy args given at initialization will
@@ -259,29 +405,37 @@ class ComboFilings:
                 Defaults to False.
             daily_date_format (str, optional): Format string to use for the `{date}` pattern.
                 Defaults to "%Y%m%d".
+            compression (Union[str, NoneType], optional): Compress filings while writing them
+                with "gzip" or "zstd". The matching suffix is added to each file.
+                Defaults to None.
+            compression_level (Union[int, NoneType], optional): Compression level.
+                Defaults to None.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads for all
+                quarters and days. Failed downloads can be retried with
+                ``report.failed_inputs``.
         """
+        report = DownloadReport()
         # Go through all quarters and dates and save filings using appropriate class
-        for (year, quarter, f) in self.quarterly_date_list:
-            q = QuarterlyFilings(year=year,
-                                 quarter=quarter,
-                                 user_agent=self.client.user_agent,
-                                 client=self.client,
-                                 entry_filter=lambda x: f(x) and self.entry_filter(x))
-            q.save(directory=directory,
-                   dir_pattern=dir_pattern,
-                   file_pattern=file_pattern,
-                   download_all=download_all)
-
-        for date_ in self.daily_date_list:
-            d = DailyFilings(date=date_,
-                             user_agent=self.client.user_agent,
-                             client=self.client,
-                             entry_filter=self.entry_filter)
+        for q in self._quarterly_filings():
+            report.merge(q.save(directory=directory,
+                                dir_pattern=dir_pattern,
+                                file_pattern=file_pattern,
+                                download_all=download_all,
+                                compression=compression,
+                                compression_level=compression_level))
+
+        for d in self._daily_filings():
             try:
-                d.save(directory=directory,
-                       dir_pattern=dir_pattern,
-                       file_pattern=file_pattern,
-                       download_all=download_all,
-                       date_format=daily_date_format)
+                report.merge(d.save(directory=directory,
+                                    dir_pattern=dir_pattern,
+                                    file_pattern=file_pattern,
+                                    download_all=download_all,
+                                    date_format=daily_date_format,
+                                    compression=compression,
+                                    compression_level=compression_level))
             except (EDGARQueryError, NoFilingsError):  # continue if no filings for given day
                 continue
+        report.end = time.monotonic()
+        return report
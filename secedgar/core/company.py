@@ -1,6 +1,7 @@
 import asyncio
 import os
 import warnings
+from collections import namedtuple
 from datetime import date
 
 from secedgar.cik_lookup import CIKLookup
@@ -8,7 +9,18 @@ from secedgar.client import NetworkClient
 from secedgar.core._base import AbstractFiling
 from secedgar.core.filing_types import FilingType
 from secedgar.exceptions import FilingTypeError
-from secedgar.utils import sanitize_date
+from secedgar.storage import validate_compression
+from secedgar.utils import run_sync, sanitize_date
+
+CompanyFilingEntry = namedtuple("CompanyFilingEntry", [
+    "lookup", "cik", "form_type", "accession_number", "url"
+])
+"""Filing passed to consumers of :meth:`CompanyFilings.process`.
+
+``form_type`` is the value of the ``filing_type`` given, or None if all types were requested.
+
+.. versionadded:: 0.7.0
+"""
 
 
 class CompanyFilings(AbstractFiling):
@@ -250,6 +262,59 @@ class CompanyFilings(AbstractFiling):
             for key, cik in self.cik_lookup.lookup_dict.items()
         }
 
+    async def get_urls_async(self, client=None, **kwargs):
+        """Get urls for all CIKs given to Filing object asynchronously.
+
+        Filings of all CIKs are fetched concurrently, within the rate limit of the client.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient, optional): Client to use.
+                Defaults to a client sharing the rate limit of :attr:`client`.
+            **kwargs: Anything to be passed to requests when making get request.
+                See keyword arguments accepted for
+                ``secedgar.client.AsyncNetworkClient.get_soup``.
+
+        Returns:
+            urls (dict): Dictionary of urls for txt files to download.
+
+        .. versionadded:: 0.7.0
+        """
+        lookup_dict = await self._lookup_dict_async()
+        async with self._async_client(client) as client:
+            urls = await asyncio.gather(*[
+                self._get_urls_for_cik_async(cik, client, **kwargs)
+                for cik in lookup_dict.values()
+            ])
+        return dict(zip(lookup_dict.keys(), urls))
+
+    async def _lookup_dict_async(self):
+        """Get :attr:`cik_lookup`'s lookup dict without blocking the event loop.
+
+        Tickers and company names are looked up with the synchronous :attr:`client`, so the
+        lookup runs on a thread of the loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.cik_lookup.lookup_dict)
+
+    async def _entries_async(self, client):
+        """Get URL and ``CompanyFilingEntry`` of every filing.
+
+        CIKs are paginated one after another and entries are produced page by page, so
+        pages are only requested as fast as entries are taken.
+        """
+        lookup_dict = await self._lookup_dict_async()
+        form_type = None if self.filing_type is None else self.filing_type.value
+
+        async def entries():
+            for lookup, cik in lookup_dict.items():
+                async for url in self._iter_urls_for_cik_async(cik, client):
+                    yield url, CompanyFilingEntry(lookup=lookup,
+                                                  cik=cik,
+                                                  form_type=form_type,
+                                                  accession_number=self.get_accession_number(url),
+                                                  url=url)
+        return entries()
+
     def _filter_filing_links(self, data):
         """Filter filing links from data to only include exact matches.
 
@@ -291,17 +356,79 @@ class CompanyFilings(AbstractFiling):
             self.params["start"] += self.client.batch_size
             if len(data.find_all("filinghref")) == 0:  # no more filings
                 break
+        return self._to_txt_urls(links, cik)
 
-        txt_urls = [link[:link.rfind("-")].strip() + ".txt" for link in links]
+    async def _get_urls_for_cik_async(self, cik, client, **kwargs):
+        """Get all urls for specific company according to CIK asynchronously.
 
-        if isinstance(self.count, int) and len(txt_urls) < self.count:
+        Uses a copy of :attr:`params`, so several CIKs can be paginated concurrently.
+
+        Args:
+            cik (str): CIK for company.
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+            **kwargs: Anything to be passed to requests when making get request.
+
+        Returns:
+            txt_urls (list of str): Up to the desired number of URLs for that specific company
+            if available.
+        """
+        return [url async for url in self._iter_urls_for_cik_async(cik, client, **kwargs)]
+
+    async def _iter_urls_for_cik_async(self, cik, client, **kwargs):
+        """Yield urls for specific company according to CIK, one page of results at a time.
+
+        Args:
+            cik (str): CIK for company.
+            client (secedgar.client.AsyncNetworkClient): Client to use.
+            **kwargs: Anything to be passed to requests when making get request.
+
+        Yields:
+            str: Up to the desired number of URLs of txt files for that specific company.
+        """
+        params = dict(self.params, CIK=cik, start=0)
+        found = 0
+        while self.count is None or found < self.count:
+            data = await client.get_soup(self.path, params, **kwargs)
+            links = self._filter_filing_links(data)
+            if self.count is not None:
+                links = links[:self.count - found]
+            for link in links:
+                yield self._to_txt_url(link)
+            found += len(links)
+            params["start"] += client.batch_size
+            if len(data.find_all("filinghref")) == 0:  # no more filings
+                break
+        self._check_count(found, cik)
+
+    @staticmethod
+    def _to_txt_url(link):
+        """Turn filing index link into link to txt file."""
+        return link[:link.rfind("-")].strip() + ".txt"
+
+    def _check_count(self, num, cik):
+        """Warn if fewer than ``count`` filings were found for ``cik``."""
+        if isinstance(self.count, int) and num < self.count:
             warnings.warn(
                 "Only {num} of {count} filings were found for {cik}.".format(
-                    num=len(txt_urls), count=self.count, cik=cik))
+                    num=num, count=self.count, cik=cik))
+
+    def _to_txt_urls(self, links, cik):
+        """Turn filing index links into links to txt files, keeping at most ``count``.
+
+        Args:
+            links (list of str): Links to filing index pages.
+            cik (str): CIK for company.
+
+        Returns:
+            txt_urls (list of str): URLs of txt files.
+        """
+        txt_urls = [self._to_txt_url(link) for link in links]
+        self._check_count(len(txt_urls), cik)
         # Takes `count` filings at most
         return txt_urls[:self.count]
 
-    def save(self, directory, dir_pattern=None, file_pattern=None):
+    def save(self, directory, dir_pattern=None, file_pattern=None,
+             compression=None, compression_level=None):
         """Save files in specified directory.
 
         Each txt url looks something like:
@@ -313,13 +440,19 @@ class CompanyFilings(AbstractFiling):
                 Valid options are {cik} and/or {type}.
             file_pattern (str): Format string for files. Default is "{accession_number}".
                 Valid options are {accession_number}.
+            compression (Union[str, NoneType]): Compress filings while writing them with
+                "gzip" or "zstd". The matching suffix is added to each file. Filings can be
+                read with :func:`secedgar.storage.open_filing`. Default is None.
+            compression_level (Union[int, NoneType]): Compression level. Default is None.
 
         Returns:
-            None
+            report (secedgar.client.DownloadReport): Report of the downloads. Failed
+                downloads can be retried with ``report.failed_inputs``.
 
         Raises:
             ValueError: If no text urls are available for given filing object.
         """
+        validate_compression(compression)
         urls = self.get_urls_safely()
 
         if dir_pattern is None:
@@ -327,7 +460,22 @@ class CompanyFilings(AbstractFiling):
         if file_pattern is None:
             file_pattern = "{accession_number}"
 
-        inputs = []
+        inputs = self._download_inputs(urls, directory, dir_pattern, file_pattern)
+        return run_sync(self.client.wait_for_download_async(
+            inputs, compression=compression, compression_level=compression_level))
+
+    def _download_inputs(self, urls, directory, dir_pattern, file_pattern):
+        """Yield URL and path of every filing in ``urls``, so no list of them is built.
+
+        Args:
+            urls (dict): Dictionary of URLs to download. See ``get_urls``.
+            directory (str): Directory where filings should be stored.
+            dir_pattern (str): Format string for subdirectories.
+            file_pattern (str): Format string for files.
+
+        Yields:
+            tuple: URL of filing and path to save it to.
+        """
         for cik, links in urls.items():
             # If no filing type, just leave all filings for CIK under directory named after CIK
             if self.filing_type is None:
@@ -338,7 +486,4 @@ class CompanyFilings(AbstractFiling):
             for link in links:
                 formatted_file = file_pattern.format(
                     accession_number=self.get_accession_number(link))
-                path = os.path.join(directory, formatted_dir, formatted_file)
-                inputs.append((link, path))
-
-        asyncio.run(self.client.wait_for_download_async(inputs))
+                yield link, os.path.join(directory, formatted_dir, formatted_file)
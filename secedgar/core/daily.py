@@ -19,8 +19,9 @@ class DailyFilings(IndexFilings):
             fetching data. If None is given, a user_agent must be given to pass to
             :class:`secedgar.client.NetworkClient`. Defaults to ``secedgar.client.NetworkClient``
             if none is given.
-        entry_filter (function, optional): A boolean function to determine
-            if the FilingEntry should be kept. Defaults to `lambda _: True`.
+        entry_filter (Union[secedgar.filters.Filter, function], optional): A filter or
+            boolean function to determine if the FilingEntry should be kept.
+            Defaults to `lambda _: True`.
             The ``FilingEntry`` object exposes 7 variables which can be
             used to filter which filings to keep. These are "cik", "company_name",
             "form_type", "date_filed", "file_name", and "path".
@@ -100,6 +101,12 @@ class DailyFilings(IndexFilings):
                             Was given type {type}.""".format(type=type(val)))
         self._date = val
 
+    @property
+    def _date_range(self):
+        """Tuple of datetime.date: Date of daily filing as first and last day."""
+        day = self._date.date() if isinstance(self._date, datetime.datetime) else self._date
+        return day, day
+
     @property
     def idx_filename(self):
         """Main index filename to look for."""
@@ -136,7 +143,9 @@ class DailyFilings(IndexFilings):
              dir_pattern=None,
              file_pattern="{accession_number}",
              date_format="%Y%m%d",
-             download_all=False):
+             download_all=False,
+             compression=None,
+             compression_level=None):
         """Save all daily filings.
 
         Store all filings for each unique company name under a separate subdirectory
@@ -153,6 +162,14 @@ class DailyFilings(IndexFilings):
                 Valid options are `accession_number`.
             download_all (bool): Type of downloading system, if true downloads all data for the day,
                 if false downloads each file in index. Default is `False`.
+            compression (Union[str, NoneType]): Compress filings while writing them with
+                "gzip" or "zstd". The matching suffix is added to each file. Filings can be
+                read with :func:`secedgar.storage.open_filing`. Default is `None`.
+            compression_level (Union[int, NoneType]): Compression level. Default is `None`.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads. Failed
+                downloads can be retried with ``report.failed_inputs``.
         """
         if dir_pattern is None:
             dir_pattern = os.path.join("{date}", "{cik}")
@@ -160,7 +177,9 @@ class DailyFilings(IndexFilings):
         # If "{cik}" is in dir_pattern, it will be passed on and if not it will be ignored
         formatted_dir = dir_pattern.format(
             date=self._date.strftime(date_format), cik="{cik}")
-        self._save_filings(directory,
-                           dir_pattern=formatted_dir,
-                           file_pattern=file_pattern,
-                           download_all=download_all)
+        return self._save_filings(directory,
+                                  dir_pattern=formatted_dir,
+                                  file_pattern=file_pattern,
+                                  download_all=download_all,
+                                  compression=compression,
+                                  compression_level=compression_level)
@@ -6,6 +6,7 @@ from secedgar.core.daily import DailyFilings
 from secedgar.core.filing_types import FilingType
 from secedgar.core.quarterly import QuarterlyFilings
 from secedgar.exceptions import FilingTypeError
+from secedgar.filters import FormType
 from secedgar.utils import add_quarter, get_month, get_quarter
 
 
@@ -32,8 +33,9 @@ def filings(
         many filings are available. Defaults to all filings available.
         client (secedgar.client.NetworkClient, optional): Client to use. Defaults to
                     ``secedgar.client.NetworkClient`` if None given.
-        entry_filter (function, optional): A boolean function to determine
-            if the FilingEntry should be kept. Defaults to ``lambda _: True``.
+        entry_filter (Union[secedgar.filters.Filter, function], optional): A filter or
+            boolean function to determine if the FilingEntry should be kept.
+            Defaults to ``lambda _: True``.
             See :class:`secedgar.core.DailyFilings` for more detail.
         kwargs: Any keyword arguments to pass to ``NetworkClient`` if no client is specified.
 
@@ -151,8 +153,7 @@ def filings(
 
     if filing_type is not None:
         # If filing type also given, add filing types to existing entry filter
-        def _entry_filter(x):  # noqa
-            return x.form_type == filing_type and entry_filter(x)
+        _entry_filter = FormType(filing_type) & entry_filter
 
     if count is not None:
         raise NotImplementedError(
@@ -1,8 +1,9 @@
 import os
-from datetime import date
+from datetime import date, timedelta
+from urllib.parse import urljoin
 
 from secedgar.core._index import IndexFilings
-from secedgar.utils import get_quarter
+from secedgar.utils import add_quarter, get_month, get_quarter
 
 
 class QuarterlyFilings(IndexFilings):
@@ -20,8 +21,9 @@ class QuarterlyFilings(IndexFilings):
             fetching data. If None is given, a user_agent must be given to pass to
             :class:`secedgar.client.NetworkClient`. Defaults to ``secedgar.client.NetworkClient``
             if none is given.
-        entry_filter (function, optional): A boolean function to determine
-            if the FilingEntry should be kept. Defaults to ``lambda _: True``.
+        entry_filter (Union[secedgar.filters.Filter, function], optional): A filter or
+            boolean function to determine if the FilingEntry should be kept.
+            Defaults to ``lambda _: True``.
             See :class:`secedgar.core.DailyFilings` for more detail.
         kwargs: Keyword arguments to pass to ``secedgar.core._index.IndexFilings``.
 
@@ -87,6 +89,13 @@ class QuarterlyFilings(IndexFilings):
                 qtr=get_quarter(date.today())))
         self._quarter = val
 
+    @property
+    def _date_range(self):
+        """Tuple of datetime.date: First and last day of quarter."""
+        next_year, next_quarter = add_quarter(self._year, self._quarter)
+        return (date(self._year, get_month(self._quarter), 1),
+                date(next_year, get_month(next_quarter), 1) - timedelta(days=1))
+
     @property
     def idx_filename(self):
         """Main index filename to look for."""
@@ -95,14 +104,19 @@ class QuarterlyFilings(IndexFilings):
     def _get_tar_urls(self):
         """The list of .tar.gz daily files in the current quarter."""
         soup = self.client.get_soup(self.tar_path, {})
-        files = [a.get('href') for a in soup.find_all('a') if "nc.tar.gz" in a.get('href')]
+        # Links in listing may be relative to the listing's URL
+        listing_url = self.client._prepare_query(self.tar_path)
+        files = [urljoin(listing_url, a.get('href'))
+                 for a in soup.find_all('a') if "nc.tar.gz" in a.get('href')]
         return files
 
     def save(self,
              directory,
              dir_pattern=None,
              file_pattern="{accession_number}",
-             download_all=False):
+             download_all=False,
+             compression=None,
+             compression_level=None):
         """Save all daily filings.
 
         Creates subdirectory within given directory of the form <YEAR>/QTR<QTR NUMBER>/.
@@ -119,6 +133,14 @@ class QuarterlyFilings(IndexFilings):
                 Valid options are `{accession_number}`.
             download_all (bool): Type of downloading system, if true downloads all data for each
                 day, if false downloads each file in index. Default is `False`.
+            compression (Union[str, NoneType]): Compress filings while writing them with
+                "gzip" or "zstd". The matching suffix is added to each file. Filings can be
+                read with :func:`secedgar.storage.open_filing`. Default is `None`.
+            compression_level (Union[int, NoneType]): Compression level. Default is `None`.
+
+        Returns:
+            report (secedgar.client.DownloadReport): Report of the downloads. Failed
+                downloads can be retried with ``report.failed_inputs``.
         """
         if dir_pattern is None:
             # https://stackoverflow.com/questions/11283961/partial-string-formatting
@@ -128,7 +150,9 @@ class QuarterlyFilings(IndexFilings):
         formatted_dir = dir_pattern.format(year=self.year,
                                            quarter=self.quarter,
                                            cik="{cik}")
-        self._save_filings(directory,
-                           dir_pattern=formatted_dir,
-                           file_pattern=file_pattern,
-                           download_all=download_all)
+        return self._save_filings(directory,
+                                  dir_pattern=formatted_dir,
+                                  file_pattern=file_pattern,
+                                  download_all=download_all,
+                                  compression=compression,
+                                  compression_level=compression_level)
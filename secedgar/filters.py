@@ -0,0 +1,537 @@
+"""Declarative filters for entries of EDGAR index files.
+
+Filters can be given anywhere an ``entry_filter`` function is accepted, and combined with
+``&``, ``|`` and ``~``:
+
+.. code-block:: python
+
+    from datetime import date
+    from secedgar.filters import CIK, CompanyName, DateRange, FormType
+
+    entry_filter = (FormType("10-K", amendments=True) & DateRange(start=date(2020, 11, 1))
+                    & (CIK(320193, 789019) | CompanyName("^APPLE")))
+
+Unlike an ``entry_filter`` function, secedgar can look inside a filter. Lines of an idx file
+are tested before an entry is created for them, filters are applied to whole columns of a
+:class:`secedgar.idx.ColumnarIndex` at once, and :meth:`Filter.bounds` tells which idx files
+can be skipped altogether.
+"""
+import datetime
+import re
+from collections import namedtuple
+from enum import Enum
+
+Bounds = namedtuple("Bounds", ["form_types", "ciks", "start_date", "end_date"])
+Bounds.__doc__ = """Conditions every entry passing a filter must meet.
+
+Each field is None if the filter puts no limit on it.
+
+Args:
+    form_types (frozenset): Upper case form types entries can have.
+    ciks (frozenset): CIKs entries can have.
+    start_date (str): First date entries can be filed on, as YYYY-MM-DD.
+    end_date (str): Last date entries can be filed on, as YYYY-MM-DD.
+"""
+
+_UNBOUNDED = Bounds(None, None, None, None)
+
+
+def _iso(value):
+    """Get date as YYYY-MM-DD from ``datetime.date`` or str in the form of an idx file."""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    value = str(value)
+    if len(value) == 8 and value.isdigit():  # dates of daily idx files
+        return "{0}-{1}-{2}".format(value[:4], value[4:6], value[6:])
+    return value
+
+
+def _fields(entry):
+    return (entry.cik, entry.company_name, entry.form_type, entry.date_filed, entry.file_name)
+
+
+def _on_field(position, test):
+    """Get predicate applying ``test`` to one field, remembering results for each value.
+
+    CIKs, form types and dates repeat on many lines of an idx file, so each distinct value
+    only needs to be tested once.
+    """
+    results = {}
+
+    def predicate(fields):
+        value = fields[position]
+        try:
+            return results[value]
+        except KeyError:
+            result = results[value] = bool(test(value))
+            return result
+    return predicate
+
+
+class Filter:
+    """Base class of declarative filters.
+
+    Filters are called with an entry, like ``entry_filter`` functions, and return whether
+    the entry should be kept.
+
+    .. versionadded:: 0.7.0
+    """
+
+    #: bool: Whether the filter only looks at fields of the idx file, so that it can be
+    #: tested before entries are created.
+    pushable = True
+
+    #: int: Relative cost of testing the filter. Cheaper filters are tested first.
+    cost = 1
+
+    _compiled = None
+
+    def __call__(self, entry):
+        """Test entry, like an ``entry_filter`` function."""
+        if not self.pushable:
+            return self._evaluate(entry)
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled(_fields(entry))
+
+    def __and__(self, other):
+        return All(self, other)
+
+    def __rand__(self, other):
+        return All(other, self)
+
+    def __or__(self, other):
+        return Any(self, other)
+
+    def __ror__(self, other):
+        return Any(other, self)
+
+    def __invert__(self):
+        return Not(self)
+
+    def _evaluate(self, entry):
+        """Test entry if filter is not pushable."""
+        raise NotImplementedError  # pragma: no cover
+
+    def compile(self):
+        """Compile filter into a predicate on the fields of an idx file line.
+
+        Returns:
+            callable: Function given a tuple of
+            ``(cik, company_name, form_type, date_filed, file_name)`` which returns
+            whether the line should be kept.
+
+        Raises:
+            TypeError: If filter is not :attr:`pushable`.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def mask(self, index):
+        """Test all entries of a columnar index at once.
+
+        Args:
+            index (secedgar.idx.ColumnarIndex): Index to test.
+
+        Returns:
+            numpy.ndarray: Boolean array which is True for entries passing the filter.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def bounds(self):
+        """Get conditions every entry passing the filter must meet.
+
+        Returns:
+            secedgar.filters.Bounds: Form types, CIKs and dates entries can have.
+        """
+        return _UNBOUNDED
+
+    def split(self):
+        """Split filter into a part which can be pushed down and a part which cannot.
+
+        Returns:
+            tuple: Pushable filter and remaining filter, each None if there is no such part.
+            An entry passes this filter if it passes both.
+        """
+        return (self, None) if self.pushable else (None, self)
+
+
+class _FieldFilter(Filter):
+    """Filter testing a single field of each entry."""
+
+    position = None
+    column = None
+
+    def test(self, value):
+        """Test single value of field."""
+        raise NotImplementedError  # pragma: no cover
+
+    def compile(self):
+        """Test field of each line, testing each distinct value once."""
+        return _on_field(self.position, self.test)
+
+    def mask(self, index):
+        """Test distinct values of column and then all entries at once."""
+        categories = getattr(index, self.column)
+        return index.mask(**{self.column: [v for v in categories if self.test(v)]})
+
+
+class FormType(_FieldFilter):
+    """Keep entries with given form types.
+
+    Form types are compared regardless of case.
+
+    Args:
+        form_types (Union[str, secedgar.FilingType]): Form types to keep.
+        amendments (bool, optional): Whether to also keep amendments of the form types,
+            e.g. "10-K/A" for "10-K". Defaults to False.
+
+    .. versionadded:: 0.7.0
+    """
+
+    position = 2
+    column = "form_types"
+
+    def __init__(self, *form_types, amendments=False):
+        forms = {str(f.value if isinstance(f, Enum) else f).upper() for f in form_types}
+        if amendments:
+            forms |= {f + "/A" for f in forms if not f.endswith("/A")}
+        self.form_types = frozenset(forms)
+        self.amendments = amendments
+
+    def __repr__(self):
+        return "FormType({0})".format(", ".join(repr(f) for f in sorted(self.form_types)))
+
+    def test(self, value):
+        """Test whether form type is one of the form types kept."""
+        return value.upper() in self.form_types
+
+    def bounds(self):
+        """Entries can only have the form types kept."""
+        return _UNBOUNDED._replace(form_types=self.form_types)
+
+
+class CIK(_FieldFilter):
+    """Keep entries filed by given CIKs.
+
+    Args:
+        ciks (Union[int, str]): CIKs to keep. Leading zeros are ignored.
+
+    .. versionadded:: 0.7.0
+    """
+
+    position = 0
+
+    def __init__(self, *ciks):
+        self.ciks = frozenset(str(int(cik)) for cik in ciks)
+
+    def __repr__(self):
+        return "CIK({0})".format(", ".join(sorted(self.ciks)))
+
+    def compile(self):
+        """Look CIK up in set of CIKs kept."""
+        ciks = self.ciks
+        return lambda fields: fields[0] in ciks
+
+    def test(self, value):
+        """Test whether CIK is one of the CIKs kept."""
+        return str(int(value)) in self.ciks
+
+    def mask(self, index):
+        """Test CIKs of all entries at once."""
+        return index.mask(ciks=self.ciks)
+
+    def bounds(self):
+        """Entries can only have the CIKs kept."""
+        return _UNBOUNDED._replace(ciks=self.ciks)
+
+
+class DateRange(_FieldFilter):
+    """Keep entries filed between two dates, including both.
+
+    Args:
+        start (Union[str, datetime.date], optional): First date to keep. Defaults to None
+            (no limit).
+        end (Union[str, datetime.date], optional): Last date to keep. Defaults to None
+            (no limit).
+
+    .. versionadded:: 0.7.0
+    """
+
+    position = 3
+    cost = 2
+
+    def __init__(self, start=None, end=None):
+        self.start = None if start is None else _iso(start)
+        self.end = None if end is None else _iso(end)
+
+    def __repr__(self):
+        return "DateRange(start={0!r}, end={1!r})".format(self.start, self.end)
+
+    def test(self, value):
+        """Test whether date is in range."""
+        value = _iso(value)
+        return ((self.start is None or value >= self.start)
+                and (self.end is None or value <= self.end))
+
+    def mask(self, index):
+        """Compare dates of all entries at once."""
+        return index.mask(start_date=self.start, end_date=self.end)
+
+    def bounds(self):
+        """Entries can only be filed in range."""
+        return _UNBOUNDED._replace(start_date=self.start, end_date=self.end)
+
+
+class CompanyName(_FieldFilter):
+    """Keep entries with company names matching a regular expression.
+
+    Args:
+        pattern (str): Regular expression searched for in company names.
+        flags (int, optional): Flags of regular expression.
+            Defaults to ``re.IGNORECASE``.
+
+    .. versionadded:: 0.7.0
+    """
+
+    position = 1
+    column = "company_names"
+    cost = 3
+
+    def __init__(self, pattern, flags=re.IGNORECASE):
+        self.pattern = re.compile(pattern, flags)
+
+    def __repr__(self):
+        return "CompanyName({0!r})".format(self.pattern.pattern)
+
+    def compile(self):
+        """Search for pattern in company name of each line."""
+        # Company names rarely repeat, so results are not remembered
+        search = self.pattern.search
+        return lambda fields: search(fields[1]) is not None
+
+    def test(self, value):
+        """Test whether pattern is found in company name."""
+        return self.pattern.search(value) is not None
+
+
+class Predicate(Filter):
+    """Filter wrapping an ``entry_filter`` function.
+
+    Functions are opaque to secedgar, so they can only be tested on entries.
+
+    Args:
+        fn (callable): Function given each entry, returning whether it should be kept.
+
+    .. versionadded:: 0.7.0
+    """
+
+    pushable = False
+    cost = 4
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __repr__(self):
+        return "Predicate({0!r})".format(self.fn)
+
+    def _evaluate(self, entry):
+        return self.fn(entry)
+
+    def compile(self):
+        """Raise TypeError, since functions can only be called on entries."""
+        raise TypeError("Functions cannot be compiled to test idx file lines.")
+
+    def mask(self, index):
+        """Call function on every entry of index."""
+        keep = index.mask()
+        keep[:] = [bool(self.fn(entry)) for entry in index]
+        return keep
+
+
+def as_filter(entry_filter):
+    """Get filter from a filter or an ``entry_filter`` function.
+
+    Args:
+        entry_filter (Union[secedgar.filters.Filter, callable]): Filter or function.
+
+    Returns:
+        secedgar.filters.Filter: Given filter, or function wrapped in a :class:`Predicate`.
+
+    .. versionadded:: 0.7.0
+    """
+    if isinstance(entry_filter, Filter):
+        return entry_filter
+    if not callable(entry_filter):
+        raise TypeError("entry_filter must be a Filter or a function, "
+                        "not {0}.".format(type(entry_filter).__name__))
+    return Predicate(entry_filter)
+
+
+class _Combination(Filter):
+
+    def __init__(self, *filters):
+        flat = []
+        for f in map(as_filter, filters):
+            # (a & b) & c is kept as a single All of a, b and c
+            flat.extend(f.filters if type(f) is type(self) else [f])
+        self.filters = tuple(sorted(flat, key=lambda f: f.cost))
+        self.pushable = all(f.pushable for f in self.filters)
+        self.cost = max((f.cost for f in self.filters), default=1)
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__,
+                                 ", ".join(repr(f) for f in self.filters))
+
+
+class All(_Combination):
+    """Keep entries passing all of the given filters.
+
+    Same as combining filters with ``&``.
+
+    Args:
+        filters (Union[secedgar.filters.Filter, callable]): Filters or ``entry_filter``
+            functions.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def _evaluate(self, entry):
+        return all(f(entry) for f in self.filters)
+
+    def compile(self):
+        """Test cheapest filters first and stop at the first one failing."""
+        tests = tuple(f.compile() for f in self.filters)
+        if not tests:
+            return lambda fields: True
+        if len(tests) == 1:
+            return tests[0]
+
+        def predicate(fields):
+            for test in tests:
+                if not test(fields):
+                    return False
+            return True
+        return predicate
+
+    def mask(self, index):
+        """Combine masks of all filters with ``&``."""
+        keep = index.mask()
+        for f in self.filters:
+            keep &= f.mask(index)
+        return keep
+
+    def bounds(self):
+        """Combine bounds of all filters, which all must be met."""
+        bounds = _UNBOUNDED
+        for f in self.filters:
+            other = f.bounds()
+            bounds = Bounds(
+                form_types=_intersect(bounds.form_types, other.form_types),
+                ciks=_intersect(bounds.ciks, other.ciks),
+                start_date=max((d for d in (bounds.start_date, other.start_date) if d),
+                               default=None),
+                end_date=min((d for d in (bounds.end_date, other.end_date) if d),
+                             default=None))
+        return bounds
+
+    def split(self):
+        """Push down all filters which can be pushed down."""
+        pushed = [f for f in self.filters if f.pushable]
+        rest = [f for f in self.filters if not f.pushable]
+        return (All(*pushed) if pushed else None, All(*rest) if rest else None)
+
+
+class Any(_Combination):
+    """Keep entries passing any of the given filters.
+
+    Same as combining filters with ``|``.
+
+    Args:
+        filters (Union[secedgar.filters.Filter, callable]): Filters or ``entry_filter``
+            functions.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def _evaluate(self, entry):
+        return any(f(entry) for f in self.filters)
+
+    def compile(self):
+        """Test cheapest filters first and stop at the first one passing."""
+        tests = tuple(f.compile() for f in self.filters)
+
+        def predicate(fields):
+            for test in tests:
+                if test(fields):
+                    return True
+            return False
+        return predicate
+
+    def mask(self, index):
+        """Combine masks of all filters with ``|``."""
+        keep = ~index.mask()
+        for f in self.filters:
+            keep |= f.mask(index)
+        return keep
+
+    def bounds(self):
+        """Get bounds covering the bounds of every filter."""
+        if not self.filters:
+            return _UNBOUNDED
+        bounds = [f.bounds() for f in self.filters]
+        starts = [b.start_date for b in bounds]
+        ends = [b.end_date for b in bounds]
+        return Bounds(form_types=_union(b.form_types for b in bounds),
+                      ciks=_union(b.ciks for b in bounds),
+                      start_date=None if None in starts else min(starts),
+                      end_date=None if None in ends else max(ends))
+
+
+class Not(Filter):
+    """Keep entries not passing the given filter.
+
+    Same as ``~``.
+
+    Args:
+        filter (Union[secedgar.filters.Filter, callable]): Filter or ``entry_filter``
+            function.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, filter):
+        self.filter = as_filter(filter)
+        self.pushable = self.filter.pushable
+        self.cost = self.filter.cost
+
+    def __repr__(self):
+        return "Not({0!r})".format(self.filter)
+
+    def _evaluate(self, entry):
+        return not self.filter(entry)
+
+    def compile(self):
+        """Negate compiled filter."""
+        test = self.filter.compile()
+        return lambda fields: not test(fields)
+
+    def mask(self, index):
+        """Negate mask of filter."""
+        return ~self.filter.mask(index)
+
+
+def _intersect(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a & b
+
+
+def _union(sets):
+    sets = list(sets)
+    if any(s is None for s in sets):
+        return None
+    return frozenset().union(*sets)
@@ -0,0 +1,558 @@
+"""Parsing of EDGAR index (idx) files."""
+import contextlib
+import datetime
+import gc
+import io
+import posixpath
+
+from secedgar.filters import as_filter
+
+
+class FilingEntry:
+    """Filing listed in an EDGAR idx file.
+
+    Entries have the same fields as the ``FilingEntry`` named tuples they replace, but use
+    ``__slots__`` so that the hundreds of thousands of entries of a quarter take little
+    memory. ``path`` is only built when it is asked for. Like the named tuples, entries can
+    be iterated over and indexed in the order of ``_fields``, and support ``_asdict`` and
+    ``_replace``.
+
+    Args:
+        cik (str): CIK of the filer.
+        company_name (str): Name of the filer.
+        form_type (str): Form type, e.g. "10-K".
+        date_filed (str): Date the filing was made, as given in the idx file.
+        file_name (str): Path of filing relative to ``https://www.sec.gov/Archives/``.
+        num_previously_valid (int, optional): Number of entries before this one which
+            passed the entry filter. Defaults to 0.
+
+    .. versionadded:: 0.7.0
+
+    .. note::
+       Entries are not instances of ``tuple``, and only compare equal to other entries.
+    """
+
+    __slots__ = ("cik", "company_name", "form_type", "date_filed", "file_name",
+                 "num_previously_valid")
+
+    _fields = ("cik", "company_name", "form_type", "date_filed", "file_name", "path",
+               "num_previously_valid")
+
+    def __init__(self, cik, company_name, form_type, date_filed, file_name,
+                 num_previously_valid=0):
+        self.cik = cik
+        self.company_name = company_name
+        self.form_type = form_type
+        self.date_filed = date_filed
+        self.file_name = file_name
+        self.num_previously_valid = num_previously_valid
+
+    @property
+    def path(self):
+        """str: Path of filing relative to ``https://www.sec.gov/``."""
+        return "Archives/" + self.file_name
+
+    def __iter__(self):
+        return iter(getattr(self, field) for field in self._fields)
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if not isinstance(other, FilingEntry):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return "FilingEntry({0})".format(", ".join(
+            "{0}={1!r}".format(field, getattr(self, field)) for field in self._fields))
+
+    def _asdict(self):
+        """Get dictionary of field names and values, like ``namedtuple._asdict``."""
+        return dict(zip(self._fields, self))
+
+    def _replace(self, **kwargs):
+        """Get copy with some fields replaced, like ``namedtuple._replace``.
+
+        ``path`` follows ``file_name`` and cannot be replaced.
+        """
+        values = {field: getattr(self, field) for field in self.__slots__}
+        unexpected = set(kwargs) - set(values)
+        if unexpected:
+            raise ValueError("Got unexpected field names: {0!r}".format(sorted(unexpected)))
+        values.update(kwargs)
+        return type(self)(**values)
+
+
+def _decode(line):
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:  # older idx files are Latin-1
+        return line.decode("latin-1")
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while entries are created in bulk.
+
+    Entries hold only strings and ints, so they never form cycles, but every few hundred
+    of them make the collector walk all entries created so far. Parsing a quarterly index
+    spends about half its time doing so.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _iter_fields(lines, seen=None):
+    """Yield fields of each entry in lines of an idx file as a tuple of str."""
+    share = (seen if seen is not None else {}).setdefault
+    for line in lines:
+        # Entries start with the CIK, which also skips the header and separator
+        if not line[:1].isdigit():
+            continue
+        if isinstance(line, bytes):
+            line = _decode(line)
+        parts = line.rstrip("\r\n").split("|")
+        if len(parts) != 5:
+            if len(parts) < 5:
+                continue
+            parts[1:-3] = ["|".join(parts[1:-3])]  # company name contains "|"
+        cik, company_name, form_type, date_filed, file_name = parts
+        if not (cik.isdigit() and company_name and form_type and file_name
+                and date_filed.replace("-", "").isdigit()):
+            continue
+        yield (share(cik, cik), company_name, share(form_type, form_type),
+               share(date_filed, date_filed), file_name)
+
+
+def _split(partial, chunk):
+    """Split ``chunk`` into complete lines, continuing the incomplete line ``partial``.
+
+    Returns:
+        tuple: List of complete lines and the incomplete line at the end of ``chunk``.
+    """
+    if partial:
+        chunk = partial + chunk
+    lines = chunk.split(b"\n" if isinstance(chunk, bytes) else "\n")
+    return lines, lines.pop()
+
+
+def iter_lines(chunks):
+    """Split chunks of an idx file into lines as the chunks arrive.
+
+    Chunks are never joined, so an idx file streamed from EDGAR is parsed while it is
+    received without holding all of it in memory.
+
+    Args:
+        chunks (iterable): Chunks of idx file as bytes or str, e.g. from
+            :meth:`secedgar.client.NetworkClient.iter_content`. Lines may span chunks.
+
+    Yields:
+        Union[bytes, str]: Lines without line breaks.
+
+    .. versionadded:: 0.7.0
+    """
+    partial = None
+    for chunk in chunks:
+        lines, partial = _split(partial, chunk)
+        yield from lines
+    if partial:
+        yield partial
+
+
+def _lines(data):
+    if isinstance(data, bytes):
+        return io.BytesIO(data)
+    if isinstance(data, str):
+        return io.StringIO(data)
+    return iter_lines(data)
+
+
+def iter_entries(lines):
+    """Parse entries from lines of an idx file, one line at a time.
+
+    Header lines and anything else which is not of the form
+    ``CIK|Company Name|Form Type|Date Filed|File Name`` are skipped. CIKs, form types and
+    dates repeat across many lines, so each distinct value is kept in memory only once.
+
+    Args:
+        lines (iterable): Lines of idx file as bytes or str, e.g. an open file.
+
+    Yields:
+        secedgar.idx.FilingEntry: Entries in the order they are listed.
+
+    .. versionadded:: 0.7.0
+    """
+    for fields in _iter_fields(lines):
+        yield FilingEntry(*fields)
+
+
+def parse_idx(data, entry_filter=None):
+    """Parse idx file into entries grouped by CIK.
+
+    Args:
+        data (Union[bytes, str, iterable]): Contents of idx file, or an iterable of its
+            chunks as bytes or str, which is parsed as the chunks arrive.
+        entry_filter (Union[secedgar.filters.Filter, callable], optional): Filter or function
+            given each entry, which returns whether the entry should be kept. Lines are
+            tested against the parts of a :class:`secedgar.filters.Filter` which only look
+            at fields of the idx file before entries are created for them.
+            Defaults to None (keep all entries).
+
+    Returns:
+        dict: CIKs as keys and lists of :class:`FilingEntry` as values, in the order
+            entries are listed. ``num_previously_valid`` of each entry is the number of
+            kept entries before it.
+
+    .. versionadded:: 0.7.0
+    """
+    return _group(_iter_fields(_lines(data)), entry_filter)
+
+
+def _group(rows, entry_filter=None):
+    """Group entries with fields in ``rows`` which pass ``entry_filter`` by CIK."""
+    return _by_cik(_EntryParser(entry_filter).select(rows))
+
+
+def _by_cik(entries):
+    filings = {}
+    with _gc_paused():
+        for entry in entries:
+            if entry.cik in filings:
+                filings[entry.cik].append(entry)
+            else:
+                filings[entry.cik] = [entry]
+    return filings
+
+
+class _EntryParser:
+    """Parse entries passing a filter from an idx file received in chunks.
+
+    Chunks can be fed as they arrive, e.g. from an asynchronous stream, and the entries
+    on the lines they complete are returned right away.
+
+    Args:
+        entry_filter (Union[secedgar.filters.Filter, callable], optional): See
+            :func:`parse_idx`. Defaults to None (keep all entries).
+    """
+
+    def __init__(self, entry_filter=None):
+        pushed = rest = None
+        if entry_filter is not None:
+            pushed, rest = as_filter(entry_filter).split()
+        self._test = pushed.compile() if pushed is not None else None
+        self._rest = rest
+        self._seen = {}
+        self._partial = None
+        self._count = 0
+
+    def feed(self, chunk):
+        """Get entries on the lines completed by ``chunk``."""
+        lines, self._partial = _split(self._partial, chunk)
+        with _gc_paused():
+            return list(self.select(_iter_fields(lines, self._seen)))
+
+    def close(self):
+        """Get entry on the last line if it has no line break."""
+        partial, self._partial = self._partial, None
+        return list(self.select(_iter_fields([partial] if partial else [], self._seen)))
+
+    def parse(self, chunks):
+        """Yield entries of idx file as its ``chunks`` arrive."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def select(self, rows):
+        """Yield entries for fields in ``rows`` which pass the filter."""
+        test, rest = self._test, self._rest
+        if test is None and rest is None:
+            for fields in rows:
+                yield FilingEntry(*fields, self._count)
+                self._count += 1
+            return
+        for fields in rows:
+            if test is not None and not test(fields):
+                continue
+            entry = FilingEntry(*fields, self._count)
+            if rest is not None and not rest(entry):
+                continue
+            self._count += 1
+            yield entry
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("ColumnarIndex requires the numpy package. "
+                          "Install it with `pip install numpy`.")
+    return numpy
+
+
+def _encode(values, codes):
+    """Get code of each value, adding values missing from ``codes`` dict."""
+    return [codes.setdefault(value, len(codes)) for value in values]
+
+
+def _as_day(date_filed):
+    """Convert date of idx file, e.g. "2020-11-13" or "20201113", to ``datetime.date``."""
+    date_filed = date_filed.replace("-", "")
+    return datetime.date(int(date_filed[:4]), int(date_filed[4:6]), int(date_filed[6:]))
+
+
+class ColumnarIndex:
+    """Entries of idx files stored as columns of NumPy arrays.
+
+    Filtering a :class:`ColumnarIndex` by form types, CIKs and dates compares whole columns
+    at once instead of calling a Python function for every entry, so a full quarter is
+    filtered in milliseconds. Company names and form types are dictionary encoded: each
+    column holds integer codes into an array of distinct values. Requires ``numpy``.
+
+    Use :meth:`from_idx` or :meth:`from_entries` to create an index.
+
+    Args:
+        cik (numpy.ndarray): CIKs as integers.
+        company_name_codes (numpy.ndarray): Codes of company names in ``company_names``.
+        company_names (numpy.ndarray): Distinct company names.
+        form_type_codes (numpy.ndarray): Codes of form types in ``form_types``.
+        form_types (numpy.ndarray): Distinct form types.
+        date_filed (numpy.ndarray): Dates filed as ``datetime64[D]``.
+        file_name (numpy.ndarray): Paths of filings relative to
+            ``https://www.sec.gov/Archives/``.
+
+    .. versionadded:: 0.7.0
+
+    Examples:
+        .. code-block:: python
+
+            from datetime import date
+            from secedgar import QuarterlyFilings
+
+            index = QuarterlyFilings(2020, 4, user_agent="Name (email)").get_index()
+            ten_ks = index.filter(form_types=["10-K", "10-K/A"],
+                                  start_date=date(2020, 11, 1))
+            df = ten_ks.to_pandas()
+    """
+
+    def __init__(self, cik, company_name_codes, company_names, form_type_codes, form_types,
+                 date_filed, file_name):
+        self.cik = cik
+        self.company_name_codes = company_name_codes
+        self.company_names = company_names
+        self.form_type_codes = form_type_codes
+        self.form_types = form_types
+        self.date_filed = date_filed
+        self.file_name = file_name
+
+    @classmethod
+    def _from_rows(cls, rows):
+        np = _import_numpy()
+        ciks, names, forms, dates, files = [], {}, {}, {}, []
+        name_codes, form_codes, date_codes = [], [], []
+        for cik, company_name, form_type, date_filed, file_name in rows:
+            ciks.append(cik)
+            name_codes.append(names.setdefault(company_name, len(names)))
+            form_codes.append(forms.setdefault(form_type, len(forms)))
+            date_codes.append(dates.setdefault(date_filed, len(dates)))
+            files.append(file_name)
+        # Dates repeat on almost every line, so only distinct ones are converted
+        days = np.array([_as_day(d) for d in dates], dtype="datetime64[D]")
+        return cls(cik=np.array(ciks, dtype=np.int64),
+                   company_name_codes=np.array(name_codes, dtype=np.int32),
+                   company_names=np.array(list(names), dtype=object),
+                   form_type_codes=np.array(form_codes, dtype=np.int32),
+                   form_types=np.array(list(forms), dtype=object),
+                   date_filed=days[np.array(date_codes, dtype=np.intp)],
+                   file_name=np.array(files, dtype=object))
+
+    @classmethod
+    def from_idx(cls, data):
+        """Parse idx file into columns.
+
+        Args:
+            data (Union[bytes, str, iterable]): Contents of idx file, or an iterable of its
+                chunks as bytes or str.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Index with all entries of idx file.
+        """
+        return cls._from_rows(_iter_fields(_lines(data)))
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Store entries in columns.
+
+        Args:
+            entries (iterable of secedgar.idx.FilingEntry): Entries to store.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Index with given entries.
+        """
+        return cls._from_rows((e.cik, e.company_name, e.form_type, e.date_filed, e.file_name)
+                              for e in entries)
+
+    @classmethod
+    def concat(cls, indexes):
+        """Join indexes, e.g. of several quarters, into one.
+
+        Args:
+            indexes (list of secedgar.idx.ColumnarIndex): Indexes to join.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Index with entries of all indexes in order.
+        """
+        np = _import_numpy()
+        indexes = list(indexes)
+
+        def merge(codes_attr, values_attr):
+            merged, columns = {}, []
+            for index in indexes:
+                remap = np.array(_encode(getattr(index, values_attr), merged), dtype=np.int32)
+                columns.append(remap[getattr(index, codes_attr)])
+            return (np.concatenate(columns) if columns else np.array([], dtype=np.int32),
+                    np.array(list(merged), dtype=object))
+
+        def join(attr, dtype):
+            return (np.concatenate([getattr(index, attr) for index in indexes]) if indexes
+                    else np.array([], dtype=dtype))
+
+        name_codes, names = merge("company_name_codes", "company_names")
+        form_codes, forms = merge("form_type_codes", "form_types")
+        return cls(cik=join("cik", np.int64),
+                   company_name_codes=name_codes,
+                   company_names=names,
+                   form_type_codes=form_codes,
+                   form_types=forms,
+                   date_filed=join("date_filed", "datetime64[D]"),
+                   file_name=join("file_name", object))
+
+    def __len__(self):
+        return len(self.cik)
+
+    def __iter__(self):
+        # Dates are given in ISO format, whatever their format in the idx file
+        for i, (cik, name, form, date, file_name) in enumerate(zip(
+                self.cik.tolist(), self.company_names[self.company_name_codes],
+                self.form_types[self.form_type_codes], self.date_filed.tolist(),
+                self.file_name)):
+            yield FilingEntry(str(cik), name, form, date.isoformat(), file_name, i)
+
+    @property
+    def accession_number(self):
+        """numpy.ndarray: Accession numbers taken from the file names."""
+        np = _import_numpy()
+        return np.array([posixpath.splitext(posixpath.basename(f))[0] for f in self.file_name],
+                        dtype=object)
+
+    def mask(self, form_types=None, ciks=None, start_date=None, end_date=None,
+             company_names=None, where=None):
+        """Get which entries match all of the given conditions.
+
+        Args:
+            form_types (iterable of str, optional): Form types to keep, e.g. ``["10-K"]``.
+                Defaults to None (keep all form types).
+            ciks (iterable of Union[int, str], optional): CIKs to keep. Defaults to None
+                (keep all CIKs).
+            start_date (Union[str, datetime.date], optional): First date filed to keep.
+                Defaults to None.
+            end_date (Union[str, datetime.date], optional): Last date filed to keep.
+                Defaults to None.
+            company_names (iterable of str, optional): Company names to keep.
+                Defaults to None (keep all companies).
+            where (secedgar.filters.Filter, optional): Filter entries must pass.
+                Defaults to None.
+
+        Returns:
+            numpy.ndarray: Boolean array which is True for entries matching.
+        """
+        np = _import_numpy()
+        keep = np.ones(len(self), dtype=bool)
+        if form_types is not None:
+            wanted = set(form_types)
+            codes = [code for code, form in enumerate(self.form_types) if form in wanted]
+            keep &= np.isin(self.form_type_codes, codes)
+        if ciks is not None:
+            keep &= np.isin(self.cik, np.array([int(cik) for cik in ciks], dtype=np.int64))
+        if start_date is not None:
+            keep &= self.date_filed >= np.datetime64(start_date, "D")
+        if end_date is not None:
+            keep &= self.date_filed <= np.datetime64(end_date, "D")
+        if company_names is not None:
+            wanted = set(company_names)
+            codes = [code for code, name in enumerate(self.company_names) if name in wanted]
+            keep &= np.isin(self.company_name_codes, codes)
+        if where is not None:
+            keep &= as_filter(where).mask(self)
+        return keep
+
+    def take(self, selection):
+        """Get index with selected entries only.
+
+        Args:
+            selection (numpy.ndarray): Boolean mask or positions of entries to take.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Index with selected entries.
+        """
+        return ColumnarIndex(cik=self.cik[selection],
+                             company_name_codes=self.company_name_codes[selection],
+                             company_names=self.company_names,
+                             form_type_codes=self.form_type_codes[selection],
+                             form_types=self.form_types,
+                             date_filed=self.date_filed[selection],
+                             file_name=self.file_name[selection])
+
+    def filter(self, form_types=None, ciks=None, start_date=None, end_date=None,
+               company_names=None, where=None):
+        """Get index with entries matching all of the given conditions.
+
+        See :meth:`mask` for arguments.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Index with matching entries.
+        """
+        return self.take(self.mask(form_types=form_types, ciks=ciks,
+                                   start_date=start_date, end_date=end_date,
+                                   company_names=company_names, where=where))
+
+    def to_pandas(self):
+        """Convert index to a ``pandas.DataFrame``.
+
+        Company names and form types become categorical columns. Requires ``pandas``.
+
+        Returns:
+            pandas.DataFrame: One row per entry.
+        """
+        import pandas as pd
+        return pd.DataFrame({
+            "cik": self.cik,
+            "company_name": pd.Categorical.from_codes(self.company_name_codes,
+                                                      self.company_names),
+            "form_type": pd.Categorical.from_codes(self.form_type_codes, self.form_types),
+            "date_filed": self.date_filed,
+            "file_name": self.file_name,
+            "accession_number": self.accession_number,
+        })
+
+    def to_parquet(self, path, **kwargs):
+        """Write index to a Parquet file.
+
+        Requires ``pandas`` and a Parquet engine such as ``pyarrow``.
+
+        Args:
+            path (str): Path of file to write.
+            kwargs: Keyword arguments to pass to ``pandas.DataFrame.to_parquet``.
+        """
+        self.to_pandas().to_parquet(path, **kwargs)
@@ -0,0 +1,337 @@
+"""Local SQLite database of the entries of EDGAR's index files."""
+import datetime
+import sqlite3
+import threading
+
+from secedgar.exceptions import EDGARQueryError
+from secedgar.filters import _iso, as_filter
+from secedgar.idx import ColumnarIndex, _group, _iter_fields, _lines
+from secedgar.utils import add_quarter, get_month, get_quarter
+
+FIRST_DAY = datetime.date(1993, 1, 1)
+"""datetime.date: First day covered by EDGAR's full index."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    first_day TEXT NOT NULL,
+    last_day TEXT NOT NULL,
+    closed INTEGER NOT NULL,
+    synced_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source_id INTEGER NOT NULL REFERENCES sources (id),
+    cik INTEGER NOT NULL,
+    company_name TEXT NOT NULL,
+    form_type TEXT NOT NULL,
+    date_filed TEXT NOT NULL,
+    day TEXT NOT NULL,
+    file_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_source ON entries (source_id);
+CREATE INDEX IF NOT EXISTS entries_cik ON entries (cik, day);
+CREATE INDEX IF NOT EXISTS entries_form_type ON entries (UPPER(form_type), day);
+CREATE INDEX IF NOT EXISTS entries_day ON entries (day);
+"""
+
+# Stay well below SQLite's limit on the number of parameters of a query
+_MAX_PARAMETERS = 500
+
+
+def _today():
+    return datetime.date.today()
+
+
+def _quarter_days(year, quarter):
+    """Get first and last day of quarter."""
+    next_year, next_quarter = add_quarter(year, quarter)
+    return (datetime.date(year, get_month(quarter), 1),
+            datetime.date(next_year, get_month(next_quarter), 1) - datetime.timedelta(days=1))
+
+
+class IndexStore:
+    """Keep entries of EDGAR's index files in a local SQLite database.
+
+    :meth:`sync` copies the ``master.idx`` files of the full index into the database, from
+    1993 to the present. Quarters which have ended are only fetched once, while the current
+    quarter and the daily indexes filed since it was last built are fetched again on every
+    sync. Give the store to :class:`secedgar.DailyFilings`, :class:`secedgar.QuarterlyFilings`
+    or :class:`secedgar.ComboFilings` as ``index_store`` to answer ``get_filings_dict``,
+    ``get_urls`` and ``get_index`` from the database whenever it covers their days, without
+    any requests.
+
+    Entries are kept in a table ``entries``, indexed by CIK, form type and date filed, which
+    has a column ``day`` with the date filed in the form YYYY-MM-DD. The index files they
+    were copied from, and the days each of them covers, are kept in a table ``sources``.
+
+    Args:
+        database (str): Path of SQLite database. Created if it does not exist.
+
+    .. versionadded:: 0.7.0
+
+    Examples:
+        .. code-block:: python
+
+            from datetime import date
+            from secedgar import ComboFilings
+            from secedgar.client import NetworkClient
+            from secedgar.filters import FormType
+            from secedgar.index_store import IndexStore
+
+            store = IndexStore("edgar.db")
+            store.sync(NetworkClient(user_agent="Name (email)"), start=date(2010, 1, 1))
+            filings = ComboFilings(date(2012, 1, 1), date(2019, 6, 30),
+                                   user_agent="Name (email)",
+                                   entry_filter=FormType("10-K"),
+                                   index_store=store)
+            urls = filings.get_urls()  # no index files are fetched
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Update statistics of query planner if needed and close database connection."""
+        with self._lock:
+            self._connection.execute("PRAGMA optimize")
+            self._connection.close()
+
+    def load_idx(self, name, data, first_day, last_day, closed=True):
+        """Replace entries of an index file with those in ``data``.
+
+        Args:
+            name (str): Name of index file, e.g. its path on EDGAR.
+            data (Union[bytes, str, iterable]): Contents of index file, or an iterable of its
+                chunks, which are inserted as they arrive.
+            first_day (datetime.date): First day the index file covers.
+            last_day (datetime.date): Last day the index file covers.
+            closed (bool, optional): Whether the index file will not change anymore, so that
+                :meth:`sync` does not fetch it again. Defaults to True.
+
+        Returns:
+            int: Number of entries loaded.
+        """
+        synced_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock, self._connection as connection:
+            row = connection.execute("SELECT id FROM sources WHERE name = ?",
+                                     (name,)).fetchone()
+            if row is None:
+                source_id = connection.execute(
+                    "INSERT INTO sources (name, first_day, last_day, closed, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (name, first_day.isoformat(), last_day.isoformat(), int(closed),
+                     synced_at)).lastrowid
+            else:
+                source_id = row[0]
+                connection.execute("DELETE FROM entries WHERE source_id = ?", (source_id,))
+                connection.execute(
+                    "UPDATE sources SET first_day = ?, last_day = ?, closed = ?, "
+                    "synced_at = ? WHERE id = ?",
+                    (first_day.isoformat(), last_day.isoformat(), int(closed), synced_at,
+                     source_id))
+            rows = ((source_id, cik, company_name, form_type, date_filed, _iso(date_filed),
+                     file_name)
+                    for cik, company_name, form_type, date_filed, file_name
+                    in _iter_fields(_lines(data)))
+            return connection.executemany(
+                "INSERT INTO entries (source_id, cik, company_name, form_type, date_filed, "
+                "day, file_name) VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+
+    def _drop_daily(self, first_day, last_day):
+        """Remove daily index files covered by the full index of their quarter."""
+        with self._lock, self._connection as connection:
+            ids = [row[0] for row in connection.execute(
+                "SELECT id FROM sources WHERE name LIKE '%daily-index%' "
+                "AND first_day BETWEEN ? AND ?", (first_day.isoformat(), last_day.isoformat()))]
+            for source_id in ids:
+                connection.execute("DELETE FROM entries WHERE source_id = ?", (source_id,))
+                connection.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+
+    def _is_closed(self, name):
+        with self._lock:
+            row = self._connection.execute("SELECT closed FROM sources WHERE name = ?",
+                                           (name,)).fetchone()
+        return row is not None and bool(row[0])
+
+    def sync(self, client, start=FIRST_DAY, end=None, daily=True, grace_days=7):
+        """Fetch index files which are missing or may have changed since the last sync.
+
+        The ``master.idx`` of each quarter is fetched unless it was fetched after the quarter
+        ended. The full index is rebuilt every night, so the quarter which has not ended
+        covers the days up to yesterday. With ``daily``, the daily indexes of later days are
+        fetched as well. They are dropped once the full index covers them. Weekends and past
+        days without a daily index, e.g. holidays, are recorded as index files without
+        entries, so that :meth:`covers` knows nothing was filed on them.
+
+        Args:
+            client (secedgar.client.NetworkClient): Client to fetch index files with.
+            start (datetime.date, optional): First day to sync. Defaults to January 1, 1993.
+            end (datetime.date, optional): Last day to sync. Defaults to today.
+            daily (bool, optional): Whether to fetch daily indexes of days not yet in the full
+                index. Defaults to True.
+            grace_days (int, optional): Days after the end of a quarter during which its
+                full index is still fetched again, for filings added late. Defaults to 7.
+
+        Returns:
+            list of str: Names of index files fetched.
+        """
+        # Avoid circular imports, since filing classes use the store
+        from secedgar.core.daily import DailyFilings
+        from secedgar.core.quarterly import QuarterlyFilings
+
+        today = _today()
+        end = min(end or today, today)
+        fetched = []
+        year, quarter = start.year, get_quarter(start)
+        while _quarter_days(year, quarter)[0] <= end:
+            first_day, last_day = _quarter_days(year, quarter)
+            closed = last_day + datetime.timedelta(days=grace_days) < today
+            covered = last_day if closed else min(last_day, today - datetime.timedelta(days=1))
+            filings = QuarterlyFilings(year, quarter, client=client)
+            if not self._is_closed(filings._master_idx_path):
+                try:
+                    data = filings._iter_master_idx_file()
+                except EDGARQueryError:  # quarter has no full index yet
+                    covered = first_day - datetime.timedelta(days=1)
+                else:
+                    self.load_idx(filings._master_idx_path, data, first_day, covered,
+                                  closed=closed)
+                    self._drop_daily(first_day, covered)
+                    fetched.append(filings._master_idx_path)
+            day = covered + datetime.timedelta(days=1)
+            while daily and day <= min(last_day, end):
+                filings = DailyFilings(day, client=client)
+                if day.weekday() >= 5:  # nothing is filed on weekends
+                    self.load_idx(filings._master_idx_path, b"", day, day)
+                else:
+                    try:
+                        data = filings._iter_master_idx_file()
+                    except EDGARQueryError:
+                        # Past days without a daily index had no filings, e.g. holidays,
+                        # while today's may not be published yet
+                        if day < today:
+                            self.load_idx(filings._master_idx_path, b"", day, day,
+                                          closed=False)
+                    else:
+                        self.load_idx(filings._master_idx_path, data, day, day, closed=False)
+                        fetched.append(filings._master_idx_path)
+                day += datetime.timedelta(days=1)
+            year, quarter = add_quarter(year, quarter)
+        if fetched:
+            # Statistics let SQLite pick the most selective index, e.g. CIK over form type
+            with self._lock:
+                self._connection.execute("ANALYZE")
+        return fetched
+
+    def sources(self):
+        """Get index files in the database.
+
+        Returns:
+            list of tuple: Name, first day, last day (as YYYY-MM-DD) and whether it is closed
+            for each index file, ordered by first day.
+        """
+        with self._lock:
+            return [(name, first_day, last_day, bool(closed))
+                    for name, first_day, last_day, closed in self._connection.execute(
+                        "SELECT name, first_day, last_day, closed FROM sources "
+                        "ORDER BY first_day, name")]
+
+    def covers(self, first_day, last_day):
+        """Get whether the database has all entries filed from ``first_day`` to ``last_day``.
+
+        Days after today are not filed on, so they are always covered.
+
+        Args:
+            first_day (datetime.date): First day.
+            last_day (datetime.date): Last day.
+
+        Returns:
+            bool: Whether all days from ``first_day`` up to ``last_day`` or today are covered.
+        """
+        last_day = min(last_day, _today())
+        day = first_day
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT first_day, last_day FROM sources WHERE last_day >= ? "
+                "AND first_day <= ? ORDER BY first_day",
+                (first_day.isoformat(), last_day.isoformat())).fetchall()
+        for first, last in rows:
+            if datetime.date.fromisoformat(first) > day:
+                return False
+            day = max(day, datetime.date.fromisoformat(last) + datetime.timedelta(days=1))
+            if day > last_day:
+                return True
+        return day > last_day
+
+    def _rows(self, first_day, last_day, entry_filter=None):
+        """Get fields of entries filed between two days, in the order of their index files.
+
+        Form types, CIKs and dates every entry passing ``entry_filter`` must have are looked
+        up using the indexes of the database.
+        """
+        bounds = as_filter(entry_filter).bounds() if entry_filter is not None else None
+        first, last = first_day.isoformat(), last_day.isoformat()
+        conditions, parameters = [], []
+        if bounds is not None:
+            first = max(first, bounds.start_date or first)
+            last = min(last, bounds.end_date or last)
+            for column, values in (("UPPER(form_type)", bounds.form_types),
+                                   ("cik", bounds.ciks)):
+                if values is not None and len(values) <= _MAX_PARAMETERS:
+                    conditions.append("{0} IN ({1})".format(column, ", ".join("?" * len(values))))
+                    parameters.extend(sorted(values))
+        query = ("SELECT cik, company_name, form_type, date_filed, file_name FROM entries "
+                 "JOIN sources ON sources.id = entries.source_id WHERE day BETWEEN ? AND ?{0} "
+                 "ORDER BY sources.first_day, entries.rowid").format(
+                     "".join(" AND " + c for c in conditions))
+        with self._lock:
+            rows = self._connection.execute(query, [first, last, *parameters]).fetchall()
+        shared = {}
+        share = shared.setdefault
+        for cik, company_name, form_type, date_filed, file_name in rows:
+            cik = str(cik)
+            yield (share(cik, cik), company_name, share(form_type, form_type),
+                   share(date_filed, date_filed), file_name)
+
+    def filings_dict(self, first_day, last_day, entry_filter=None):
+        """Get entries filed between two days, grouped by CIK.
+
+        Args:
+            first_day (datetime.date): First day.
+            last_day (datetime.date): Last day.
+            entry_filter (Union[secedgar.filters.Filter, callable], optional): Filter or
+                function to determine if an entry should be kept. Defaults to None.
+
+        Returns:
+            dict: CIKs as keys and lists of :class:`secedgar.idx.FilingEntry` as values, as
+            returned by :func:`secedgar.idx.parse_idx`.
+        """
+        return _group(self._rows(first_day, last_day, entry_filter), entry_filter)
+
+    def get_index(self, first_day, last_day, where=None):
+        """Get entries filed between two days as columns.
+
+        Args:
+            first_day (datetime.date): First day.
+            last_day (datetime.date): Last day.
+            where (secedgar.filters.Filter, optional): Filter entries must pass.
+                Defaults to None.
+
+        Returns:
+            secedgar.idx.ColumnarIndex: Entries filed between the two days.
+        """
+        index = ColumnarIndex._from_rows(self._rows(first_day, last_day, where))
+        return index if where is None else index.filter(where=where)
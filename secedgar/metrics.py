@@ -0,0 +1,346 @@
+"""Metrics of the requests made by :class:`secedgar.client.NetworkClient`."""
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENDPOINT_CLASSES = (
+    ("daily_index", "/Archives/edgar/daily-index/"),
+    ("full_index", "/Archives/edgar/full-index/"),
+    ("feed", "/Archives/edgar/Feed/"),
+    ("filing", "/Archives/edgar/data/"),
+    ("browse_edgar", "/cgi-bin/browse-edgar"),
+    ("company_tickers", "/files/company_tickers.json"),
+    ("api", "data.sec.gov/"),
+)
+"""Endpoint classes and the URL fragment identifying them, checked in order."""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+"""Upper bounds in seconds of the default latency histogram buckets."""
+
+
+def endpoint_class(url):
+    """Get class of EDGAR endpoint ``url`` belongs to.
+
+    Args:
+        url (str): URL of request.
+
+    Returns:
+        str: Name of endpoint class in :data:`ENDPOINT_CLASSES`, or "other".
+
+    .. versionadded:: 0.7.0
+    """
+    for name, fragment in ENDPOINT_CLASSES:
+        if fragment in url:
+            return name
+    return "other"
+
+
+class Histogram:
+    """Histogram of observed values with fixed buckets, like Prometheus histograms.
+
+    Args:
+        buckets (iterable of float): Upper bounds of buckets.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add ``value`` to histogram."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Get number of observations less than or equal to each bucket's upper bound.
+
+        Returns:
+            list of tuple: Upper bound and count for each bucket, ending with ``inf``.
+        """
+        total = 0
+        counts = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+    def quantile(self, q):
+        """Estimate ``q``-quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float: Upper bound of bucket, or None if nothing was observed.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return bound
+
+    def copy(self):
+        """Get copy of histogram."""
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.sum = self.sum
+        histogram.count = self.count
+        return histogram
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('{0}="{1}"'.format(k, v) for k, v in labels.items()) + "}"
+
+
+class ClientMetrics:
+    """Counters and latency histograms of requests made by a client.
+
+    All requests are grouped by endpoint class (see :func:`endpoint_class`), so that e.g.
+    filing downloads and index requests can be told apart. Every client records into its
+    :attr:`secedgar.client.NetworkClient.metrics`. Pass the same instance to several clients
+    to combine their metrics.
+
+    Args:
+        buckets (iterable of float, optional): Upper bounds in seconds of latency histogram
+            buckets. Defaults to :data:`DEFAULT_BUCKETS`.
+
+    Examples:
+        .. code-block:: python
+
+            from secedgar.client import NetworkClient
+
+            client = NetworkClient(user_agent="Name (email)")
+            client.metrics.serve_prometheus(port=9100)  # scrape http://localhost:9100/metrics
+            ...
+            print(client.metrics.latency["filing"].quantile(0.99))
+
+    .. versionadded:: 0.7.0
+    """
+
+    PREFIX = "secedgar_"
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Set all metrics back to zero."""
+        with self._lock:
+            self._requests = Counter()
+            self._bytes = Counter()
+            self._retries = Counter()
+            self._latency = {}
+            self._limiter_wait = 0.0
+            self._limiter_acquisitions = 0
+            self._coalesced = Counter()
+
+    def record_request(self, url, status, seconds, num_bytes=0):
+        """Record finished request.
+
+        Args:
+            url (str): URL requested.
+            status (Union[int, NoneType]): Status of response, or None if no response
+                was received.
+            seconds (float): Time taken by the request.
+            num_bytes (int, optional): Size of response body. Defaults to 0.
+        """
+        endpoint = endpoint_class(url)
+        with self._lock:
+            self._requests[endpoint, "error" if status is None else str(status)] += 1
+            self._bytes[endpoint] += num_bytes
+            if endpoint not in self._latency:
+                self._latency[endpoint] = Histogram(self._buckets)
+            self._latency[endpoint].observe(seconds)
+
+    def record_bytes(self, url, num_bytes):
+        """Record ``num_bytes`` bytes received for ``url``."""
+        endpoint = endpoint_class(url)
+        with self._lock:
+            self._bytes[endpoint] += num_bytes
+
+    def record_retry(self, url):
+        """Record retry of request for ``url``."""
+        endpoint = endpoint_class(url)
+        with self._lock:
+            self._retries[endpoint] += 1
+
+    def record_coalesced(self, url):
+        """Record request for ``url`` which was served by an identical request."""
+        endpoint = endpoint_class(url)
+        with self._lock:
+            self._coalesced[endpoint] += 1
+
+    def record_limiter_wait(self, seconds):
+        """Record acquisition from the rate limiter which waited ``seconds`` seconds."""
+        with self._lock:
+            self._limiter_wait += seconds or 0
+            self._limiter_acquisitions += 1
+
+    @property
+    def requests(self):
+        """dict: Number of responses with ``(endpoint class, status)`` tuples as keys.
+
+        Requests without response have status "error".
+        """
+        with self._lock:
+            return dict(self._requests)
+
+    @property
+    def bytes(self):
+        """dict: Number of body bytes received by endpoint class."""
+        with self._lock:
+            return dict(self._bytes)
+
+    @property
+    def retries(self):
+        """dict: Number of retried requests by endpoint class."""
+        with self._lock:
+            return dict(self._retries)
+
+    @property
+    def latency(self):
+        """dict: Copies of latency :class:`Histogram` by endpoint class."""
+        with self._lock:
+            return {k: v.copy() for k, v in self._latency.items()}
+
+    @property
+    def coalesced(self):
+        """dict: Number of requests served by an identical request by endpoint class."""
+        with self._lock:
+            return dict(self._coalesced)
+
+    @property
+    def limiter_wait(self):
+        """float: Total seconds spent waiting for the rate limiter."""
+        with self._lock:
+            return self._limiter_wait
+
+    @property
+    def limiter_acquisitions(self):
+        """int: Number of times the rate limiter was acquired."""
+        with self._lock:
+            return self._limiter_acquisitions
+
+    def status_counts(self):
+        """Get number of responses by status, summed over all endpoint classes.
+
+        Returns:
+            collections.Counter: Statuses as keys.
+        """
+        counts = Counter()
+        for (_, status), count in self.requests.items():
+            counts[status] += count
+        return counts
+
+    def to_prometheus(self):
+        """Export metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text.
+        """
+        prefix = self.PREFIX
+        lines = []
+
+        def family(name, kind, description, samples):
+            lines.append("# HELP {0}{1} {2}".format(prefix, name, description))
+            lines.append("# TYPE {0}{1} {2}".format(prefix, name, kind))
+            for suffix, labels, value in samples:
+                lines.append("{0}{1}{2}{3} {4}".format(prefix, name, suffix,
+                                                       _format_labels(**labels),
+                                                       _format_value(value)))
+
+        family("requests_total", "counter", "Responses received by endpoint class and status.",
+               [("", {"endpoint": e, "status": s}, v)
+                for (e, s), v in sorted(self.requests.items())])
+        latency_samples = []
+        for endpoint, histogram in sorted(self.latency.items()):
+            for bound, count in histogram.cumulative_counts():
+                latency_samples.append(("_bucket", {"endpoint": endpoint,
+                                                    "le": _format_value(bound)}, count))
+            latency_samples.append(("_sum", {"endpoint": endpoint}, histogram.sum))
+            latency_samples.append(("_count", {"endpoint": endpoint}, histogram.count))
+        family("request_duration_seconds", "histogram",
+               "Time taken by requests by endpoint class.", latency_samples)
+        family("response_bytes_total", "counter", "Body bytes received by endpoint class.",
+               [("", {"endpoint": e}, v) for e, v in sorted(self.bytes.items())])
+        family("retries_total", "counter", "Retried requests by endpoint class.",
+               [("", {"endpoint": e}, v) for e, v in sorted(self.retries.items())])
+        family("coalesced_requests_total", "counter",
+               "Requests served by an identical request in flight or just finished.",
+               [("", {"endpoint": e}, v) for e, v in sorted(self.coalesced.items())])
+        family("rate_limiter_wait_seconds_total", "counter",
+               "Time spent waiting for the rate limiter.", [("", {}, self.limiter_wait)])
+        family("rate_limiter_acquisitions_total", "counter",
+               "Number of times the rate limiter was acquired.",
+               [("", {}, self.limiter_acquisitions)])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write metrics in the Prometheus text format to ``path``.
+
+        The file is replaced atomically, so it can be read by e.g. node_exporter's
+        textfile collector at any time.
+
+        Args:
+            path (str): Path of file to write.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def serve_prometheus(self, port=0, host="127.0.0.1"):
+        """Serve metrics in the Prometheus text format over HTTP on a background thread.
+
+        Args:
+            port (int, optional): Port to listen on. Defaults to 0 (any free port).
+            host (str, optional): Host to listen on. Defaults to "127.0.0.1".
+
+        Returns:
+            http.server.ThreadingHTTPServer: Running server. Its ``server_address`` holds
+                the port used. Call ``shutdown`` to stop it.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # do not write every scrape to stderr
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
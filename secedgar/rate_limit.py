@@ -0,0 +1,308 @@
+"""Rate limiters used by :class:`secedgar.client.NetworkClient`."""
+import asyncio
+import email.utils
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how often requests can be made.
+
+    Tokens are refilled continuously at ``rate`` tokens per second, up to ``burst`` tokens.
+    Every request takes one token. If no token is available, the caller is given a
+    reservation in the future and waits until then, so callers are served in the order
+    they asked and the pipeline never idles while tokens are available.
+
+    Args:
+        rate (float): Number of tokens added per second.
+        burst (int, optional): Maximum number of tokens that can be saved up.
+            Defaults to 1, which spaces requests evenly at ``1 / rate`` seconds.
+
+    .. versionadded:: 0.7.0
+    """
+
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, rate, burst=1):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = self._clock()
+
+    @property
+    def rate(self):
+        """float: Number of tokens added per second."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        if not value > 0:
+            raise ValueError("Rate must be greater than 0. Given {0}.".format(value))
+        with self._lock:
+            self._rate = value
+
+    @property
+    def burst(self):
+        """int: Maximum number of tokens the bucket can hold."""
+        return self._burst
+
+    @burst.setter
+    def burst(self, value):
+        if not value >= 1:
+            raise ValueError("Burst must be at least 1. Given {0}.".format(value))
+        self._burst = value
+
+    def reserve(self, amount=1):
+        """Take ``amount`` tokens from the bucket.
+
+        Args:
+            amount (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Number of seconds the caller must wait before using the tokens.
+        """
+        return self._update(self._take, amount)
+
+    def pause(self, seconds):
+        """Hold back all reservations for ``seconds``.
+
+        Tokens saved up are dropped and the bucket is put in debt, so the next
+        reservation is given no earlier than ``seconds`` from now.
+
+        Args:
+            seconds (float): Number of seconds to pause for.
+        """
+        self._update(self._pause, seconds)
+
+    def _update(self, fn, *args):
+        """Call ``fn(*args)`` while holding the lock on the bucket state."""
+        with self._lock:
+            return fn(*args)
+
+    def _pause(self, seconds):
+        """Refill bucket and put it in debt for ``seconds``. Caller must hold the lock."""
+        self._take(0)
+        self._tokens = min(self._tokens, 0) - seconds * self._rate
+
+    def _take(self, amount):
+        """Refill bucket and take tokens. Caller must hold the lock.
+
+        Returns:
+            float: Number of seconds until the tokens are available.
+        """
+        now = self._clock()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0
+        return -self._tokens / self._rate
+
+    def acquire(self, amount=1):
+        """Block until ``amount`` tokens are available.
+
+        Returns:
+            float: Number of seconds spent waiting.
+        """
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, amount=1):
+        """Wait without blocking the event loop until ``amount`` tokens are available.
+
+        Returns:
+            float: Number of seconds spent waiting.
+        """
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class FileRateLimiter(RateLimiter):
+    """Token bucket shared by every process on a host through a lock file.
+
+    The bucket state is kept in ``path`` and updated while holding an exclusive
+    ``fcntl.flock``, so all clients created with the same ``path`` draw from one bucket,
+    no matter which process they live in. This keeps the total request rate of many
+    worker processes sharing an IP address under the SEC's limit. A :meth:`pause`
+    requested by one process holds back all of them.
+
+    Args:
+        path (str): Path of the file holding the shared bucket state. Created if it
+            does not exist.
+        rate (float): Number of tokens added per second. All processes sharing ``path``
+            should use the same rate.
+        burst (int, optional): Maximum number of tokens that can be saved up. Defaults to 1.
+
+    .. note::
+       Only available on platforms providing ``fcntl`` (i.e. not Windows).
+
+    Examples:
+        .. code-block:: python
+
+            from secedgar.client import NetworkClient
+            from secedgar.rate_limit import FileRateLimiter
+
+            limiter = FileRateLimiter("/tmp/secedgar.lock", rate=10)
+            client = NetworkClient(user_agent="Name (email)", limiter=limiter)
+
+    .. versionadded:: 0.7.0
+    """
+
+    _clock = staticmethod(time.time)
+    _state = struct.Struct("dd")
+
+    def __init__(self, path, rate, burst=1):
+        if fcntl is None:  # pragma: no cover
+            raise OSError("FileRateLimiter requires fcntl, which is not available.")
+        self._path = os.path.expanduser(path)
+        super().__init__(rate=rate, burst=burst)
+
+    @property
+    def path(self):
+        """str: Path of the file holding the shared bucket state."""
+        return self._path
+
+    def _update(self, fn, *args):
+        """Call ``fn(*args)`` on the bucket state read from :attr:`path` and write it back."""
+        with self._lock:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                data = os.pread(fd, self._state.size, 0)
+                if len(data) == self._state.size:
+                    self._tokens, self._updated = self._state.unpack(data)
+                else:  # new file, start with a full bucket
+                    self._tokens, self._updated = self.burst, self._clock()
+                result = fn(*args)
+                os.pwrite(fd, self._state.pack(self._tokens, self._updated), 0)
+                return result
+            finally:
+                os.close(fd)  # also releases the lock
+
+
+def parse_retry_after(value):
+    """Parse value of a ``Retry-After`` header.
+
+    Args:
+        value (Union[str, NoneType]): Either a number of seconds or an HTTP date.
+
+    Returns:
+        Union[float, NoneType]: Number of seconds to wait (never negative), or None if
+            ``value`` is missing or invalid.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class AdaptiveRateController:
+    """Adjust the rate of a limiter based on how the server responds (AIMD).
+
+    A throttled response (429 or 503) multiplies the limiter's rate by ``decrease``,
+    down to ``min_rate``, and pauses the limiter for the time advised by ``Retry-After``,
+    so all requests sharing the limiter stop at once. Every healthy response adds
+    ``increase`` requests per second back, up to ``max_rate``.
+
+    The rate is decreased at most once per overload: responses to requests which were
+    already sent when the rate was last decreased (see ``sent`` of :meth:`on_throttle`)
+    only extend the pause, so a burst of throttled responses to requests in flight
+    together halves the rate once rather than once per response.
+
+    Args:
+        limiter (RateLimiter): Limiter whose rate is controlled.
+        max_rate (float): Rate to recover to while responses are healthy.
+        min_rate (float, optional): Lowest rate to slow down to. Defaults to 0.1.
+        decrease (float, optional): Factor to multiply the rate by when throttled.
+            Defaults to 0.5.
+        increase (float, optional): Requests per second added back per healthy response.
+            Defaults to 0.1.
+        max_pause (float, optional): Longest pause to honor from ``Retry-After``.
+            Defaults to 600 seconds.
+
+    .. note::
+       The rate of a :class:`FileRateLimiter` is not part of the state it shares. Each
+       process adapts the rate of its own limiter, which only governs how fast that
+       process refills the shared bucket.
+
+    .. versionadded:: 0.7.0
+    """
+
+    _clock = staticmethod(time.monotonic)
+
+    THROTTLE_STATUSES = (429, 503)
+    """Status codes telling the client to slow down."""
+
+    def __init__(self, limiter, max_rate, min_rate=0.1, decrease=0.5, increase=0.1,
+                 max_pause=600):
+        if not 0 < decrease < 1:
+            raise ValueError("Decrease must be between 0 and 1. Given {0}.".format(decrease))
+        self._lock = threading.Lock()
+        self.limiter = limiter
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.decrease = decrease
+        self.increase = increase
+        self.max_pause = max_pause
+        self.throttles = 0
+        self._decreased = float("-inf")  # when the rate was last decreased
+        self._paused_until = float("-inf")
+
+    def is_throttled(self, status):
+        """Whether response status tells the client to slow down."""
+        return status in self.THROTTLE_STATUSES
+
+    def on_throttle(self, retry_after=None, sent=None):
+        """Slow down after a throttled response.
+
+        Args:
+            retry_after (Union[str, NoneType], optional): Value of ``Retry-After`` header
+                of the response. Defaults to None.
+            sent (Union[float, NoneType], optional): Time (``time.monotonic``) at which the
+                request was sent. The rate is only decreased if it was sent after the rate
+                was last decreased. Defaults to None, i.e. the request was just sent.
+
+        Returns:
+            float: Number of seconds requests are paused for.
+        """
+        pause = parse_retry_after(retry_after) or 0
+        pause = min(pause, self.max_pause)
+        with self._lock:
+            now = self._clock()
+            self.throttles += 1
+            if (now if sent is None else sent) >= self._decreased:
+                self.limiter.rate = max(self.min_rate, self.limiter.rate * self.decrease)
+                self._decreased = now
+            # Pauses overlap rather than add up
+            extend = now + pause - max(self._paused_until, now)
+            if extend > 0:
+                self._paused_until = now + pause
+                self.limiter.pause(extend)
+        return pause
+
+    def on_success(self):
+        """Speed back up after a healthy response."""
+        with self._lock:
+            rate = self.limiter.rate
+            if rate < self.max_rate:
+                self.limiter.rate = min(self.max_rate, rate + self.increase)
@@ -0,0 +1,527 @@
+"""Utilities for how downloaded filings are stored."""
+import contextlib
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+import zipfile
+
+from secedgar.utils import make_path
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+"""Suffix added to paths of filings stored with each compression method."""
+
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression requires the zstandard package. "
+                          "Install it with `pip install zstandard`.")
+    return zstandard
+
+
+def validate_compression(compression):
+    """Check that compression method is supported.
+
+    Args:
+        compression (Union[str, NoneType]): Compression method.
+
+    Raises:
+        ValueError: If compression is not None, "gzip" or "zstd".
+    """
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError("Compression must be one of {0} or None. Given {1}.".format(
+            ", ".join(sorted(COMPRESSION_SUFFIXES)), compression))
+
+
+def compressed_path(path, compression):
+    """Add suffix for compression method to path.
+
+    Args:
+        path (str): Path of uncompressed file.
+        compression (Union[str, NoneType]): Compression method.
+
+    Returns:
+        str: Path with suffix for compression method added (unchanged if no compression).
+    """
+    if compression is None:
+        return path
+    return path + COMPRESSION_SUFFIXES[compression]
+
+
+def open_compressed(path, compression=None, level=None):
+    """Open file to write bytes to, compressing them on the fly.
+
+    Args:
+        path (str): Path to write to. No suffix is added.
+        compression (Union[str, NoneType], optional): "gzip", "zstd" or None.
+            Defaults to None (no compression).
+        level (Union[int, NoneType], optional): Compression level. Defaults to 6 for gzip
+            and 3 for zstd.
+
+    Returns:
+        Binary file object opened for writing.
+    """
+    validate_compression(compression)
+    if compression is None:
+        return open(path, "wb")
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=level)
+    zstandard = _import_zstandard()
+    compressor = zstandard.ZstdCompressor(level=level)
+    return compressor.stream_writer(open(path, "wb"), closefd=True)
+
+
+def open_filing(path, mode="rb", encoding=None):
+    """Open stored filing, decompressing it transparently.
+
+    If ``path`` does not exist, paths with any of the :data:`COMPRESSION_SUFFIXES`
+    are tried, so filings can be opened using the path they would have had uncompressed.
+
+    Args:
+        path (str): Path to filing.
+        mode (str, optional): "rb" or "rt". Defaults to "rb".
+        encoding (str, optional): Encoding used in text mode. Defaults to None.
+
+    Returns:
+        File object to read filing from.
+
+    Examples:
+        .. code-block:: python
+
+            from secedgar.storage import open_filing
+
+            # Works whether filing was saved with compression="gzip" or not
+            with open_filing("/path/to/320193/10-K/0000320193-20-000096.txt", "rt") as f:
+                text = f.read()
+
+    .. versionadded:: 0.7.0
+    """
+    if mode not in ("rb", "rt"):
+        raise ValueError("Mode must be 'rb' or 'rt'. Given {0}.".format(mode))
+    if not os.path.exists(path):
+        for suffix in COMPRESSION_SUFFIXES.values():
+            if os.path.exists(path + suffix):
+                path += suffix
+                break
+    if path.endswith(COMPRESSION_SUFFIXES["gzip"]):
+        f = gzip.open(path, "rb")
+    elif path.endswith(COMPRESSION_SUFFIXES["zstd"]):
+        zstandard = _import_zstandard()
+        f = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    else:
+        f = open(path, "rb")
+    if mode == "rt":
+        return io.TextIOWrapper(f, encoding=encoding)
+    return f
+
+
+def _decompress(data, compression):
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.decompress(data)
+    return _import_zstandard().ZstdDecompressor().decompress(data)
+
+
+def _compressor(fileobj, compression, level=None):
+    """Wrap ``fileobj`` to compress bytes written to it. Closing it leaves ``fileobj`` open."""
+    if compression is None:
+        return contextlib.nullcontext(fileobj)
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=level)
+    compressor = _import_zstandard().ZstdCompressor(level=level)
+    return compressor.stream_writer(fileobj, closefd=False)
+
+
+class StorageSink:
+    """Base class for where downloaded filings are stored.
+
+    Sinks are used by :meth:`secedgar.client.NetworkClient.wait_for_download_async`, which
+    gives them the path a filing would have on the file system, i.e.
+    ``directory/dir_pattern/file_pattern`` of ``save``. Sinks either map that path to
+    another location on the file system which the filing is streamed to (subclasses of
+    :class:`FileSystemSink`), or receive the complete filing through :meth:`store`.
+
+    Sinks are used from several writer threads at once, so :meth:`store` must be
+    thread-safe. :meth:`flush` is called at the end of every download run.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def location(self, path):
+        """Get path on the file system to stream filing for ``path`` to.
+
+        Args:
+            path (str): Path of filing given to the downloader.
+
+        Returns:
+            Union[str, NoneType]: Path to write to, or None if the filing is passed to
+                :meth:`store` instead.
+        """
+        return None
+
+    def store(self, path, fileobj):
+        """Store complete filing.
+
+        Args:
+            path (str): Path of filing given to the downloader.
+            fileobj: Binary file object to read filing from.
+        """
+        raise NotImplementedError("{0} does not store filings itself.".format(
+            type(self).__name__))
+
+    def flush(self):
+        """Make everything stored so far durable."""
+        pass
+
+    def close(self):
+        """Flush and release resources held by the sink."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FileSystemSink(StorageSink):
+    """Store every filing as its own file at the path it is given. This is the default.
+
+    Filings are streamed to disk, can be compressed on the fly and interrupted downloads
+    can be resumed.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def location(self, path):
+        """Store filing at ``path`` itself."""
+        return path
+
+
+class ShardedFileSystemSink(FileSystemSink):
+    """Store filings as files spread over hashed subdirectories.
+
+    A filing for ``directory/320193/0000320193-20-000096.txt`` is stored at
+    ``directory/320193/ab/cd/0000320193-20-000096.txt``, where ``abcd`` are the first
+    characters of the MD5 hash of the file name. This keeps the number of entries per
+    directory small even when a single directory would otherwise hold every filing of a
+    quarter. Use :meth:`location` to find where a filing was stored.
+
+    Args:
+        levels (int, optional): Number of nested shard directories. Defaults to 2.
+        width (int, optional): Number of hexadecimal characters in the name of each shard
+            directory. Defaults to 2, i.e. 256 directories per level.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, levels=2, width=2):
+        if levels < 1 or width < 1 or levels * width > 32:
+            raise ValueError("levels and width must be positive and levels * width at most 32.")
+        self.levels = levels
+        self.width = width
+
+    def location(self, path):
+        """Get sharded path filing for ``path`` is stored at."""
+        directory, name = os.path.split(path)
+        digest = hashlib.md5(name.encode("utf-8")).hexdigest()
+        shards = [digest[i * self.width:(i + 1) * self.width] for i in range(self.levels)]
+        return os.path.join(directory, *shards, name)
+
+
+class ZipArchiveSink(StorageSink):
+    """Pack filings into append-only zip archives, e.g. one archive per day or quarter.
+
+    Paths are split into an archive name and a member name after the first ``depth``
+    directories below ``root``. With the default ``dir_pattern`` of ``DailyFilings.save``
+    (``{date}/{cik}``) and ``depth=1``, filings saved to ``root`` end up in one archive per
+    day, e.g. ``root/20201113.zip`` with members like ``320193/0000320193-20-000096.txt``.
+    For ``QuarterlyFilings.save`` (``{year}/QTR{quarter}/{cik}``), use ``depth=2`` to get
+    ``root/2020/QTR4.zip``.
+
+    Later runs add to existing archives in place. Filings already in an archive are kept and
+    not written again. The index (central directory) of each archive is written when the sink
+    is flushed, which happens at the end of every download run. Before a run first appends to
+    an archive, the end of the archive (its old index) is saved to ``<archive>.zip.journal``.
+    If a run crashes before flushing, the next run (or :meth:`read`) truncates the archive
+    back to where the run started and restores its old index, so the archive is as it was
+    after the previous run.
+
+    Args:
+        root (str): Directory filings are saved to, i.e. ``directory`` given to ``save``.
+        depth (int, optional): Number of directories below ``root`` naming the archive.
+            Defaults to 1.
+        compression (int, optional): Compression method of ``zipfile``.
+            Defaults to ``zipfile.ZIP_DEFLATED``.
+        compresslevel (int, optional): Compression level. Defaults to None (default level).
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, root, depth=1, compression=zipfile.ZIP_DEFLATED, compresslevel=None):
+        if depth < 1:
+            raise ValueError("depth must be at least 1. Given {0}.".format(depth))
+        self._root = os.path.abspath(root)
+        self.depth = depth
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        self._archives = {}  # archive path -> (lock, ZipFile, names in archive)
+
+    @property
+    def root(self):
+        """str: Directory filings are saved to."""
+        return self._root
+
+    def split(self, path):
+        """Get path of archive and name of member for filing at ``path``.
+
+        Raises:
+            ValueError: If ``path`` is not at least ``depth + 1`` levels below :attr:`root`.
+        """
+        relative = os.path.relpath(os.path.abspath(path), self._root)
+        parts = relative.split(os.sep)
+        if parts[0] == os.pardir or len(parts) <= self.depth:
+            raise ValueError("Path {0} is not inside an archive below {1}.".format(
+                path, self._root))
+        return (os.path.join(self._root, *parts[:self.depth]) + ".zip",
+                "/".join(parts[self.depth:]))
+
+    _journal_header = struct.Struct("<Q")  # offset the saved end of the archive starts at
+
+    @staticmethod
+    def _journal_path(archive_path):
+        return archive_path + ".journal"
+
+    def _recover(self, archive_path):
+        """Undo appends of a run which crashed before writing the index of ``archive_path``."""
+        journal_path = self._journal_path(archive_path)
+        if not os.path.exists(journal_path):
+            return
+        with open(journal_path, "rb") as f:
+            offset, = self._journal_header.unpack(f.read(self._journal_header.size))
+            end = f.read()
+        if offset == 0 and not end:  # archive was created by the crashed run
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+        else:
+            with open(archive_path, "r+b") as f:
+                f.truncate(offset)
+                f.seek(offset)
+                f.write(end)
+        os.remove(journal_path)
+
+    def _write_journal(self, archive_path, offset):
+        """Save end of ``archive_path`` from ``offset`` on, which appending overwrites."""
+        end = b""
+        if os.path.exists(archive_path):
+            with open(archive_path, "rb") as f:
+                f.seek(offset)
+                end = f.read()
+        journal_path = self._journal_path(archive_path)
+        with open(journal_path + ".tmp", "wb") as f:
+            f.write(self._journal_header.pack(offset))
+            f.write(end)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(journal_path + ".tmp", journal_path)  # journal is complete or missing
+
+    def _archive(self, archive_path):
+        with self._lock:
+            if archive_path not in self._archives:
+                make_path(os.path.dirname(archive_path), exist_ok=True)
+                self._recover(archive_path)
+                archive = zipfile.ZipFile(archive_path, "a", compression=self.compression,
+                                          compresslevel=self.compresslevel)
+                # Nothing is written before the first filing, which goes where the index is
+                self._write_journal(archive_path, archive.start_dir)
+                self._archives[archive_path] = (threading.Lock(), archive,
+                                                set(archive.namelist()))
+            return self._archives[archive_path]
+
+    def store(self, path, fileobj):
+        """Append filing to its archive unless it is already there."""
+        archive_path, name = self.split(path)
+        lock, archive, names = self._archive(archive_path)
+        with lock:
+            if name in names:
+                return
+            with archive.open(name, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(fileobj, dst)
+            names.add(name)
+
+    def flush(self):
+        """Write index of every open archive and close it."""
+        with self._lock:
+            archives, self._archives = self._archives, {}
+        for archive_path, (lock, archive, _) in archives.items():
+            with lock:
+                archive.close()
+                os.remove(self._journal_path(archive_path))
+
+    def read(self, path):
+        """Read filing stored for ``path``.
+
+        Filings stored during the current run are read from their open archive.
+
+        Returns:
+            bytes: Contents of filing.
+
+        Raises:
+            KeyError: If filing is not in its archive.
+        """
+        archive_path, name = self.split(path)
+        with self._lock:
+            entry = self._archives.get(archive_path)
+            if entry is None:
+                self._recover(archive_path)
+        if entry is not None:
+            lock, archive, _ = entry
+            with lock:
+                return archive.read(name)
+        if not os.path.exists(archive_path):
+            raise KeyError(path)
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.read(name)
+
+
+class SQLiteSink(StorageSink):
+    """Store filings as blobs in a SQLite database.
+
+    Filings are kept in a table ``filings`` with columns ``path`` (relative to ``root``, with
+    "/" as separator), ``content``, ``size`` (uncompressed) and ``compression``. Storing a
+    filing again replaces it. Transactions are committed every ``commit_every`` filings and
+    whenever the sink is flushed. On Python 3.11 and later, large filings are written to
+    their blob in chunks rather than read into memory.
+
+    Args:
+        database (str): Path of SQLite database. Created if it does not exist.
+        root (str, optional): Directory filings are saved to, i.e. ``directory`` given to
+            ``save``. Paths are stored relative to it. Defaults to None (paths as given).
+        compression (Union[str, NoneType], optional): Compress each blob with "gzip" or
+            "zstd". Defaults to None.
+        compression_level (Union[int, NoneType], optional): Compression level.
+            Defaults to the default level of the compression method.
+        commit_every (int, optional): Number of filings per transaction. Defaults to 1000.
+
+    .. versionadded:: 0.7.0
+    """
+
+    CHUNK_SIZE = 2 ** 20  # filings larger than this are written to their blob in chunks
+    SPOOL_SIZE = 2 ** 23  # compressed filings larger than this are spooled to disk
+
+    def __init__(self, database, root=None, compression=None, compression_level=None,
+                 commit_every=1000):
+        validate_compression(compression)
+        self._root = None if root is None else os.path.abspath(root)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.commit_every = commit_every
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS filings (path TEXT PRIMARY KEY, "
+                "content BLOB NOT NULL, size INTEGER NOT NULL, compression TEXT)")
+            self._connection.commit()
+
+    def key(self, path):
+        """Get key filing for ``path`` is stored under."""
+        if self._root is not None:
+            path = os.path.relpath(os.path.abspath(path), self._root)
+        return path.replace(os.sep, "/")
+
+    def store(self, path, fileobj):
+        """Insert or replace filing, writing large filings to their blob in chunks."""
+        if self.compression is None and fileobj.seekable():
+            start = fileobj.tell()
+            size = fileobj.seek(0, os.SEEK_END) - start
+            fileobj.seek(start)
+            self._insert(path, fileobj, size, size)
+            return
+        with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE) as spool:
+            size = 0
+            with _compressor(spool, self.compression, self.compression_level) as dst:
+                for chunk in iter(lambda: fileobj.read(self.CHUNK_SIZE), b""):
+                    dst.write(chunk)
+                    size += len(chunk)
+            length = spool.tell()
+            spool.seek(0)
+            self._insert(path, spool, length, size)
+
+    def _insert(self, path, blob, length, size):
+        """Insert ``length`` bytes of ``blob`` for filing of ``size`` bytes."""
+        with self._lock:
+            if length > self.CHUNK_SIZE and hasattr(self._connection, "blobopen"):
+                # Reserve blob and fill it in place to keep memory bounded (Python 3.11+)
+                cursor = self._connection.execute(
+                    "INSERT OR REPLACE INTO filings (path, content, size, compression) "
+                    "VALUES (?, zeroblob(?), ?, ?)",
+                    (self.key(path), length, size, self.compression))
+                with self._connection.blobopen("filings", "content", cursor.lastrowid) as dst:
+                    for chunk in iter(lambda: blob.read(self.CHUNK_SIZE), b""):
+                        dst.write(chunk)
+            else:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO filings (path, content, size, compression) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.key(path), blob.read(length), size, self.compression))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._connection.commit()
+                self._uncommitted = 0
+
+    def flush(self):
+        """Commit filings stored so far."""
+        with self._lock:
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        """Commit and close database connection."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def read(self, path):
+        """Read filing stored for ``path``.
+
+        Returns:
+            bytes: Contents of filing, decompressed.
+
+        Raises:
+            KeyError: If no filing is stored for ``path``.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, compression FROM filings WHERE path = ?",
+                (self.key(path),)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return _decompress(*row)
+
+    def paths(self):
+        """Get keys of all filings stored, in sorted order.
+
+        Returns:
+            list of str: Keys of filings.
+        """
+        with self._lock:
+            return [row[0] for row in self._connection.execute(
+                "SELECT path FROM filings ORDER BY path")]
@@ -0,0 +1,288 @@
+"""End-to-end throughput benchmarks of saving filings, run against :mod:`secedgar.tests.simulator`.
+
+Each scenario runs in a fresh process, so its peak memory use is measured on its own,
+while the simulator runs in the parent process and measures request latencies.
+
+Run all scenarios with::
+
+    python -m secedgar.tests.benchmark --filings-per-day 500 --latency 0.05
+
+Benchmark parsing a quarterly index of 500,000 lines against the regular expression parser
+of secedgar 0.6 with::
+
+    python -m secedgar.tests.benchmark --parse 500000
+
+See ``python -m secedgar.tests.benchmark --help`` for all options.
+"""
+import argparse
+import gc
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from multiprocessing import get_context
+
+from secedgar.client import NetworkClient
+from secedgar.core import CompanyFilings, DailyFilings, QuarterlyFilings
+from secedgar.idx import _by_cik, _EntryParser, parse_idx
+from secedgar.rate_limit import RateLimiter
+from secedgar.tests.simulator import EDGARSimulator
+from secedgar.transport import HTTPTransport
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # not available on Windows
+
+DAY = date(2020, 10, 1)
+YEAR, QUARTER = 2020, 4
+
+
+def _save_daily(client, directory, companies, count):
+    return DailyFilings(DAY, client=client).save(directory)
+
+
+def _save_quarterly(client, directory, companies, count):
+    return QuarterlyFilings(YEAR, QUARTER, client=client).save(directory, download_all=True)
+
+
+def _save_company(client, directory, companies, count):
+    ciks = [str(EDGARSimulator.cik(k)) for k in range(companies)]
+    return CompanyFilings(ciks, count=count, client=client).save(directory)
+
+
+SCENARIOS = {
+    "daily": _save_daily,
+    "quarterly": _save_quarterly,
+    "company": _save_company,
+}
+"""Functions saving filings for each benchmark scenario."""
+
+
+def _peak_rss():
+    """Peak resident set size of current process in bytes, or None if unknown."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if os.uname().sysname == "Darwin" else rss * 1024  # KiB on Linux
+
+
+def _run_scenario(scenario, base, directory, rate, concurrency, companies, count):
+    """Run ``scenario`` in the current process and measure what it saved."""
+    client = NetworkClient(user_agent="secedgar benchmark (benchmark@example.com)",
+                           limiter=RateLimiter(rate=rate),
+                           concurrency=concurrency,
+                           transport=HTTPTransport(base=base))
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        report = SCENARIOS[scenario](client, directory, companies, count)
+    elapsed = time.perf_counter() - start
+    filings = num_bytes = 0
+    for root, _, files in os.walk(directory):
+        filings += len(files)
+        num_bytes += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return {
+        "filings": filings,
+        "bytes": num_bytes,
+        "elapsed": elapsed,
+        "failures": len(report.failures) if report is not None else 0,
+        "peak_rss": _peak_rss(),
+    }
+
+
+def run_benchmark(scenario, simulator, rate=1000, concurrency=10, companies=None):
+    """Save filings for ``scenario`` from ``simulator`` in a new process.
+
+    Args:
+        scenario (str): One of :data:`SCENARIOS`.
+        simulator (secedgar.tests.simulator.EDGARSimulator): Running simulator.
+        rate (float, optional): Requests per second allowed by the client. Defaults to 1000.
+        concurrency (int, optional): Concurrent downloads. Defaults to 10.
+        companies (int, optional): Companies to save filings for in the "company" scenario.
+            Defaults to all companies of ``simulator``. Up to 100 filings are saved for each
+            company, which browse-edgar lists on a single page.
+
+    Returns:
+        dict: Filings and bytes saved, seconds elapsed, number of failed downloads and peak
+            resident set size of the process in bytes, as well as throughput and the
+            median and 99th percentile latency seen by ``simulator``.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError("Scenario must be one of {0}. Given {1}.".format(
+            ", ".join(SCENARIOS), scenario))
+    simulator.stats.reset()
+    directory = tempfile.mkdtemp(prefix="secedgar_benchmark_")
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(_run_scenario, scenario, simulator.url, directory, rate,
+                                 concurrency, companies or simulator.companies,
+                                 min(simulator.filings_per_company, 100)).result()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    result["filings_per_second"] = result["filings"] / result["elapsed"]
+    result["bytes_per_second"] = result["bytes"] / result["elapsed"]
+    result["requests"] = simulator.stats.requests
+    result["p50"] = simulator.stats.latency_percentile(50)
+    result["p99"] = simulator.stats.latency_percentile(99)
+    return result
+
+
+def _synthetic_idx(lines, seed=0):
+    """Make master.idx file with ``lines`` entries of a quarter."""
+    rng = random.Random(seed)
+    form_types = ["4", "8-K", "10-Q", "10-K", "SC 13G", "424B2", "D", "3"]
+    rows = ["Description: Master Index of EDGAR Dissemination Feed",
+            "Last Data Received: December 31, 2020", "",
+            "CIK|Company Name|Form Type|Date Filed|Filename", "-" * 80]
+    for i in range(lines):
+        cik = rng.randint(1000, 1800000)
+        rows.append("{0}|COMPANY {0} INC|{1}|2020-{2}-{3:02d}|edgar/data/{0}/{4:010d}.txt".format(
+            cik, rng.choice(form_types), rng.randint(10, 12), rng.randint(1, 28), i))
+    return "\n".join(rows).encode() + b"\n"
+
+
+def _parse_idx_regex(data):
+    """Parse idx file the way secedgar 0.6 did, as a baseline for :func:`parse_idx`."""
+    FilingEntry = namedtuple("FilingEntry", [
+        "cik", "company_name", "form_type", "date_filed", "file_name", "path",
+        "num_previously_valid"
+    ])
+    filings = {}
+    count = 0
+    for entry in re.findall(r'^[0-9]+[|].+[|].+[|][0-9\-]+[|].+$', data.decode("latin-1"),
+                            re.MULTILINE):
+        fields = entry.split("|")
+        fields[-1] = fields[-1].strip()
+        entry = FilingEntry(*fields, path="Archives/" + fields[-1],
+                            num_previously_valid=count)
+        count += 1
+        filings.setdefault(entry.cik, []).append(entry)
+    return filings
+
+
+def _parse_streamed(data, chunk_size=2**16):
+    """Parse idx file from chunks, like ``get_filings_dict`` does while it downloads."""
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    return _by_cik(_EntryParser().parse(chunks))
+
+
+PARSERS = {
+    "regex": _parse_idx_regex,
+    "parse_idx": parse_idx,
+    "streamed": _parse_streamed,
+}
+"""Functions parsing idx files into entries grouped by CIK, compared by the parse benchmark."""
+
+
+def run_parse_benchmark(lines=500000, repeat=3):
+    """Time parsing a synthetic quarterly idx file with each of :data:`PARSERS`.
+
+    Args:
+        lines (int, optional): Entries in idx file. Defaults to 500,000, about the size of
+            a quarterly index.
+        repeat (int, optional): Times each parser runs. The fastest run is reported.
+            Defaults to 3.
+
+    Returns:
+        dict: For each parser, the number of entries, seconds of the fastest run, speedup over
+            ``"regex"`` and peak memory traced while parsing in bytes.
+    """
+    data = _synthetic_idx(lines)
+    results = {}
+    for name, parse in PARSERS.items():
+        elapsed = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            filings = parse(data)
+            elapsed.append(time.perf_counter() - start)
+            entries = sum(map(len, filings.values()))
+            del filings
+        gc.collect()
+        tracemalloc.start()
+        try:
+            parse(data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results[name] = {"entries": entries, "elapsed": min(elapsed), "peak": peak}
+    for result in results.values():
+        result["speedup"] = results["regex"]["elapsed"] / result["elapsed"]
+    return results
+
+
+def _format_row(scenario, result):
+    def ms(seconds):
+        return "-" if seconds is None else "{0:.1f}".format(seconds * 1000)
+
+    rss = result["peak_rss"]
+    return "{0:<10} {1:>8} {2:>9.1f} {3:>10.2f} {4:>8} {5:>8} {6:>9} {7:>8}".format(
+        scenario, result["filings"], result["filings_per_second"],
+        result["bytes_per_second"] / 2**20, ms(result["p50"]), ms(result["p99"]),
+        "-" if rss is None else "{0:.1f}".format(rss / 2**20), result["failures"])
+
+
+def main(argv=None):
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS),
+                        help="Scenarios to run, out of {0}. Defaults to all.".format(
+                            ", ".join(SCENARIOS)))
+    parser.add_argument("--filings-per-day", type=int, default=200)
+    parser.add_argument("--days-per-quarter", type=int, default=5)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--filings-per-company", type=int, default=40)
+    parser.add_argument("--filing-size", type=int, default=10000, help="Bytes per filing.")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds per request.")
+    parser.add_argument("--bandwidth", type=int, default=None,
+                        help="Bytes per second per response.")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--rate", type=float, default=1000,
+                        help="Requests per second allowed by client.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--parse", type=int, default=None, metavar="LINES",
+                        help="Benchmark parsing an idx file of LINES entries instead.")
+    args = parser.parse_args(argv)
+    if args.parse is not None:
+        print("{0:<10} {1:>8} {2:>9} {3:>8} {4:>9}".format(
+            "parser", "entries", "seconds", "speedup", "peak MiB"))
+        for name, result in run_parse_benchmark(args.parse).items():
+            print("{0:<10} {1:>8} {2:>9.2f} {3:>7.1f}x {4:>9.1f}".format(
+                name, result["entries"], result["elapsed"], result["speedup"],
+                result["peak"] / 2**20), flush=True)
+        return
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error("unknown scenarios: {0}".format(", ".join(sorted(unknown))))
+
+    simulator = EDGARSimulator(filings_per_day=args.filings_per_day,
+                               companies=args.companies,
+                               filings_per_company=args.filings_per_company,
+                               filing_size=args.filing_size,
+                               days_per_quarter=args.days_per_quarter,
+                               latency=args.latency,
+                               bandwidth=args.bandwidth,
+                               error_rate=args.error_rate,
+                               throttle_rate=args.throttle_rate,
+                               retry_after=0)
+    print("{0:<10} {1:>8} {2:>9} {3:>10} {4:>8} {5:>8} {6:>9} {7:>8}".format(
+        "scenario", "filings", "filings/s", "MiB/s", "p50 ms", "p99 ms", "peak MiB",
+        "failures"))
+    with simulator:
+        for scenario in args.scenarios:
+            result = run_benchmark(scenario, simulator, rate=args.rate,
+                                   concurrency=args.concurrency)
+            print(_format_row(scenario, result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import requests
 from secedgar.cik_lookup import CIKLookup
 from secedgar.client import NetworkClient
 from secedgar.core import QuarterlyFilings
-from secedgar.tests.utils import AsyncMockResponse, MockResponse, datapath
+from secedgar.tests.utils import AsyncMockResponse, MockResponse, datapath, mock_idx_stream
 
 
 @pytest.fixture(scope="module")
@@ -47,21 +47,16 @@ def mock_user_agent():
 @pytest.fixture(scope="session")
 def mock_filing_response(monkeysession):
     monkeysession.setattr(
-        NetworkClient, "fetch",
+        NetworkClient, "_request_async",
         lambda *args, **kwargs: AsyncMockResponse(content=bytes(
-            "Testing...", "utf-8")).read())
+            "Testing...", "utf-8")))
 
 
 @pytest.fixture(scope="session")
 def mock_master_idx_file(monkeysession):
     """Mock idx file from DailyFilings."""
-
-    def _mock_master_idx_file(*args, **kwargs):
-        with open(datapath("filings", "master", "master.idx")) as f:
-            return f.read()
-
-    monkeysession.setattr(QuarterlyFilings, "_get_master_idx_file",
-                          _mock_master_idx_file)
+    with open(datapath("filings", "master", "master.idx"), "rb") as f:
+        mock_idx_stream(monkeysession, QuarterlyFilings, f.read())
 
 
 @pytest.fixture(scope="session")
@@ -1,8 +1,12 @@
+import asyncio
 from datetime import date
 
 import pytest
 from secedgar.client import NetworkClient
 from secedgar.core.combo import ComboFilings, fill_days
+from secedgar.core.daily import DailyFilings
+from secedgar.core.quarterly import QuarterlyFilings
+from secedgar.exceptions import EDGARQueryError
 
 
 def lambda_matches(a, b):
@@ -196,3 +200,18 @@ class TestComboFilings:
         with pytest.raises(TypeError):
             _ = ComboFilings(start_date=date(2022, 2, 28),
                              end_date=date(2022, 4, 15))
+
+    def test_get_urls_async_merges_quarters_and_days(self, mock_user_agent, monkeypatch):
+        async def quarterly_urls(self, client=None, **kwargs):
+            return {"1": ["q{0}".format(self.quarter)]}
+
+        async def daily_urls(self, client=None, **kwargs):
+            if self.date == date(2020, 4, 2):
+                raise EDGARQueryError("No idx file.")
+            return {"1": [str(self.date)]}
+
+        monkeypatch.setattr(QuarterlyFilings, "get_urls_async", quarterly_urls)
+        monkeypatch.setattr(DailyFilings, "get_urls_async", daily_urls)
+        combo = ComboFilings(start_date=date(2020, 1, 1), end_date=date(2020, 4, 2),
+                             user_agent=mock_user_agent)
+        assert asyncio.run(combo.get_urls_async()) == {"1": ["q1", "2020-04-01"]}
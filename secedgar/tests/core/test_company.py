@@ -1,11 +1,13 @@
 # Tests if filings are correctly received from EDGAR
+import asyncio
 import datetime
 import os
+import threading
 
 import pytest
 
 from secedgar.cik_lookup import CIKLookup
-from secedgar.client import NetworkClient
+from secedgar.client import AsyncNetworkClient, NetworkClient
 from secedgar.core import CompanyFilings, FilingType
 from secedgar.exceptions import FilingTypeError, NoFilingsError
 from secedgar.tests.utils import MockResponse
@@ -396,6 +398,46 @@ class TestCompanyFilings:
         assert all(
             len(f.get_urls().get(key)) == 5 for key in f.get_urls().keys())
 
+    def test_get_urls_async(self, mock_user_agent, mock_cik_validator_get_multiple_ciks,
+                            mock_single_cik_filing, monkeypatch):
+        requested = []
+
+        async def mock_get_async(self, url, params=None, **kwargs):
+            requested.append(dict(params))
+            return MockResponse(datapath_args=["filings", "aapl_10q_filings.xml"])
+
+        monkeypatch.setattr(AsyncNetworkClient, "_get_async", mock_get_async)
+        f = CompanyFilings(cik_lookup=["aapl", "msft", "amzn"],
+                           user_agent=mock_user_agent,
+                           filing_type=FilingType.FILING_10Q,
+                           count=5)
+        assert asyncio.run(f.get_urls_async()) == f.get_urls()
+        assert sorted(p["CIK"] for p in requested) == ["0000320193", "1234", "5678"]
+
+    def test_get_urls_async_looks_up_off_loop(self, mock_user_agent, mock_single_cik_filing,
+                                              monkeypatch):
+        threads = []
+
+        def mock_get_ciks(self):
+            threads.append(threading.current_thread())
+            return {"aapl": "0000320193"}
+
+        async def mock_get_async(self, url, params=None, **kwargs):
+            return MockResponse(datapath_args=["filings", "aapl_10q_filings.xml"])
+
+        async def get_urls():
+            urls = await f.get_urls_async()
+            return urls, threading.current_thread()
+
+        monkeypatch.setattr(CIKLookup, "get_ciks", mock_get_ciks)
+        monkeypatch.setattr(AsyncNetworkClient, "_get_async", mock_get_async)
+        f = CompanyFilings("aapl", user_agent=mock_user_agent,
+                           filing_type=FilingType.FILING_10Q, count=5)
+        urls, loop_thread = asyncio.run(get_urls())
+        assert len(urls["aapl"]) == 5
+        # Ticker lookups make blocking requests, so they must not run on the loop's thread
+        assert threads and threads[0] is not loop_thread
+
     @pytest.mark.parametrize("count", [10, 25, 30])
     def test_filing_returns_correct_number_of_urls(
             self, count, mock_user_agent, mock_cik_validator_get_multiple_ciks,
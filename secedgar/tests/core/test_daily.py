@@ -1,11 +1,13 @@
+import asyncio
 import os
 from datetime import date, datetime
 
 import pytest
 import secedgar.utils as utils
-from secedgar.client import NetworkClient
+from secedgar.client import AsyncNetworkClient, NetworkClient
 from secedgar.core.daily import DailyFilings
-from secedgar.tests.utils import MockResponse, datapath
+from secedgar.storage import open_filing
+from secedgar.tests.utils import MockResponse, datapath, mock_idx_stream
 
 cik_file_pairs = [("1000228", "0001209191-18-064398.txt"),
                   ("1000275", "0001140361-18-046093.txt"),
@@ -26,13 +28,8 @@ def mock_daily_quarter_directory(monkeymodule):
 @pytest.fixture(scope="module")
 def mock_daily_idx_file(monkeymodule):
     """Mock idx file from DailyFilings."""
-
-    def _mock_daily_idx_file(*args, **kwargs):
-        with open(datapath("filings", "daily", "master.20181231.idx")) as f:
-            return f.read()
-
-    monkeymodule.setattr(DailyFilings, "_get_master_idx_file",
-                         _mock_daily_idx_file)
+    with open(datapath("filings", "daily", "master.20181231.idx"), "rb") as f:
+        mock_idx_stream(monkeymodule, DailyFilings, f.read())
 
 
 class TestDaily:
@@ -63,14 +60,27 @@ class TestDaily:
             DailyFilings(bad_date)
 
     @pytest.mark.parametrize("key,url", [(cik,
-                                          "http://www.sec.gov/Archives/edgar/data/{cik}/{f}".format(
-                                              cik=cik, f=f))
+                                          "https://www.sec.gov/Archives/edgar/data/{cik}/{f}"
+                                          .format(cik=cik, f=f))
                                          for cik, f in cik_file_pairs])
     def test_get_urls(self, mock_user_agent, mock_daily_quarter_directory, mock_daily_idx_file,
                       key, url):
         daily_filing = DailyFilings(date(2018, 12, 31), user_agent=mock_user_agent)
         assert url in daily_filing.get_urls()[key]
 
+    def test_get_urls_async(self, mock_user_agent, mock_daily_quarter_directory,
+                            mock_daily_idx_file, monkeypatch):
+        async def mock_get_async(self, url, **kwargs):
+            if url.endswith("/"):
+                return MockResponse(
+                    datapath_args=["filings", "daily", "daily_index_2018_QTR4.htm"])
+            return MockResponse(datapath_args=["filings", "daily", "master.20181231.idx"])
+
+        monkeypatch.setattr(AsyncNetworkClient, "_get_async", mock_get_async)
+        urls = asyncio.run(DailyFilings(date(2018, 12, 31),
+                                        user_agent=mock_user_agent).get_urls_async())
+        assert urls == DailyFilings(date(2018, 12, 31), user_agent=mock_user_agent).get_urls()
+
     def test_get_listings_directory(self, mock_user_agent, mock_daily_quarter_directory):
         daily_filings = DailyFilings(date(2018, 12, 31),
                                      user_agent=mock_user_agent)
@@ -87,7 +97,7 @@ class TestDaily:
                                  mock_daily_idx_file, company_name):
         daily_filing = DailyFilings(date(2018, 12, 31),
                                     user_agent=mock_user_agent)
-        assert company_name in daily_filing._get_master_idx_file()
+        assert company_name.encode() in daily_filing._get_master_idx_file()
 
     @pytest.mark.parametrize("year,month,day,quarter", [(2018, 1, 1, 1),
                                                         (2017, 5, 1, 2),
@@ -154,6 +164,23 @@ class TestDaily:
         path_to_check = os.path.join(tmp_data_directory, subdir, file)
         assert os.path.exists(path_to_check)
 
+    def test_save_compressed(self, tmp_data_directory, mock_daily_quarter_directory,
+                             mock_daily_idx_file, mock_filing_response, mock_user_agent):
+        daily_filing = DailyFilings(date(2018, 12, 31), user_agent=mock_user_agent)
+        report = daily_filing.save(tmp_data_directory, dir_pattern="compressed/{cik}",
+                                   compression="gzip")
+        assert report.requests > 0 and report.failures == []
+        cik, file = cik_file_pairs[0]
+        path = os.path.join(tmp_data_directory, "compressed", cik, file)
+        with open_filing(path) as f:
+            assert f.read() == b"Testing..."
+        assert os.path.exists(path + ".gz")
+
+    def test_save_bad_compression(self, tmp_data_directory, mock_user_agent):
+        daily_filing = DailyFilings(date(2018, 12, 31), user_agent=mock_user_agent)
+        with pytest.raises(ValueError):
+            daily_filing.save(tmp_data_directory, compression="rar")
+
     @pytest.mark.parametrize("file", [cf[1] for cf in cik_file_pairs])
     def test_save_with_single_level_date_dir_pattern(
             self, tmp_data_directory, mock_user_agent, mock_daily_quarter_directory,
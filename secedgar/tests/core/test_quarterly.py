@@ -3,7 +3,7 @@ from datetime import date
 
 import pytest
 from secedgar.core.quarterly import QuarterlyFilings
-from secedgar.tests.utils import MockResponse
+from secedgar.tests.utils import MockResponse, mock_idx_stream
 
 
 @pytest.fixture(scope="module")
@@ -20,9 +20,8 @@ def mock_quarterly_quarter_directory(monkeymodule):
 
 @pytest.fixture
 def mock_master_idx_file(monkeypatch):
-    monkeypatch.setattr(
-        QuarterlyFilings, "_get_master_idx_file", lambda *args: MockResponse(
-            datapath_args=["filings", "master", "master.idx"]).text)
+    mock_idx_stream(monkeypatch, QuarterlyFilings,
+                    MockResponse(datapath_args=["filings", "master", "master.idx"]).content)
 
 
 class TestQuarterly:
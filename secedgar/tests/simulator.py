@@ -0,0 +1,536 @@
+"""Local HTTP server imitating the EDGAR endpoints used by secedgar.
+
+The simulator generates a deterministic set of companies and filings, so tests and
+benchmarks can run the whole download pipeline without touching the SEC's servers.
+Point a client at it with :meth:`EDGARSimulator.transport`.
+
+Examples:
+    .. code-block:: python
+
+        from datetime import date
+
+        from secedgar.client import NetworkClient
+        from secedgar.core import DailyFilings
+        from secedgar.tests.simulator import EDGARSimulator
+
+        with EDGARSimulator(filings_per_day=200, latency=0.05) as simulator:
+            client = NetworkClient(user_agent="Name (email)",
+                                   transport=simulator.transport())
+            DailyFilings(date(2020, 12, 10), client=client).save("/tmp/edgar")
+            print(simulator.stats.latency_percentile(99))
+"""
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import random
+import re
+import tarfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache
+
+from aiohttp import web
+
+from secedgar.transport import HTTPTransport
+
+FORM_TYPES = ("10-K", "10-Q", "8-K", "4", "S-1", "13F-HR", "SC 13G", "DEF 14A")
+"""Form types assigned to simulated filings in turn."""
+
+_ACCESSION = re.compile(r"^(\d{10})-(\d{2})-(\d{6})$")
+_CHUNK_SIZE = 2**14
+
+
+def _quarter_days(year, quarter, limit=None):
+    """Weekdays in quarter, optionally only the first ``limit`` of them."""
+    day = date(year, 3 * quarter - 2, 1)
+    days = []
+    while day.month <= 3 * quarter and day.year == year:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days[:limit]
+
+
+class SimulatorStats:
+    """Statistics of requests answered by :class:`EDGARSimulator`.
+
+    Attributes:
+        requests (int): Number of requests answered.
+        statuses (collections.Counter): Number of responses per status code.
+        bytes_sent (int): Number of body bytes sent.
+        latencies (list of float): Seconds between receiving each request and sending the
+            last byte of its response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded requests."""
+        with self._lock:
+            self.requests = 0
+            self.statuses = Counter()
+            self.bytes_sent = 0
+            self.latencies = []
+
+    def record(self, status, num_bytes, latency):
+        """Record answered request."""
+        with self._lock:
+            self.requests += 1
+            self.statuses[status] += 1
+            self.bytes_sent += num_bytes
+            self.latencies.append(latency)
+
+    def latency_percentile(self, percentile):
+        """Get latency percentile using the nearest-rank method.
+
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            float: Latency in seconds, or None if no requests were recorded.
+        """
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        rank = max(1, -(-len(latencies) * percentile // 100))  # ceil
+        return latencies[int(rank) - 1]
+
+
+class EDGARSimulator:
+    """HTTP server imitating EDGAR, run on a background thread.
+
+    The simulator serves:
+
+    * daily-index and full-index listings with their ``master.*.idx`` files,
+    * ``cgi-bin/browse-edgar`` XML for companies (date filters are ignored),
+    * filings under ``Archives/edgar/data/``, with ``ETag`` and ``Range`` support,
+    * Feed listings and ``.nc.tar.gz`` archives of each day's filings,
+    * ``files/company_tickers.json``,
+    * the ``submissions`` and ``api/xbrl`` JSON APIs of data.sec.gov under the same root.
+
+    Filings are filed on weekdays only. Companies have CIKs starting at 1000000 and
+    tickers ``SIM0``, ``SIM1``, and so on.
+
+    Args:
+        filings_per_day (int, optional): Filings in each daily index. Defaults to 100.
+        companies (int, optional): Number of companies filing. Defaults to 50.
+        filings_per_company (int, optional): Filings listed by browse-edgar for each
+            company. Defaults to 100.
+        filing_size (int, optional): Size of each filing in bytes. Defaults to 10000.
+        days_per_quarter (int, optional): Only use the first ``days_per_quarter`` weekdays
+            of each quarter, to keep quarterly indices small. Defaults to None (all weekdays).
+        latency (float, optional): Seconds to wait before answering each request.
+            Defaults to 0.
+        bandwidth (int, optional): Bytes per second sent for each response. Defaults to None
+            (unlimited).
+        error_rate (float, optional): Fraction of requests answered with status 500.
+            Defaults to 0.
+        throttle_rate (float, optional): Fraction of requests answered with status 429.
+            Defaults to 0.
+        retry_after (int, optional): Value of ``Retry-After`` header sent with 429 responses.
+            Defaults to 1.
+        seed (int, optional): Seed for choosing which requests fail. Defaults to 0.
+        host (str, optional): Host to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 0 (any free port).
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self,
+                 filings_per_day=100,
+                 companies=50,
+                 filings_per_company=100,
+                 filing_size=10000,
+                 days_per_quarter=None,
+                 latency=0,
+                 bandwidth=None,
+                 error_rate=0,
+                 throttle_rate=0,
+                 retry_after=1,
+                 seed=0,
+                 host="127.0.0.1",
+                 port=0):
+        if not 0 < filings_per_day <= 1000:
+            raise ValueError("filings_per_day must be between 1 and 1000.")
+        if companies < 1 or filings_per_company < 0:
+            raise ValueError("Need at least one company and a non-negative number of filings.")
+        if error_rate + throttle_rate > 1:
+            raise ValueError("error_rate and throttle_rate must not add up to more than 1.")
+        self.filings_per_day = filings_per_day
+        self.companies = companies
+        self.filings_per_company = filings_per_company
+        self.filing_size = filing_size
+        self.days_per_quarter = days_per_quarter
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+        self.stats = SimulatorStats()
+        self._random = random.Random(seed)
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """str: Root URL of the simulator, ending with "/"."""
+        return "http://{0}:{1}/".format(self.host, self.port)
+
+    def transport(self):
+        """Get transport sending requests for ``https://www.sec.gov/`` to the simulator.
+
+        Returns:
+            secedgar.transport.HTTPTransport: Transport to give to a client.
+        """
+        return HTTPTransport(base=self.url)
+
+    # Simulated data
+
+    @staticmethod
+    def cik(company):
+        """Get CIK of ``company``-th company."""
+        return 1000000 + company
+
+    def company_name(self, cik):
+        """Get name of company with ``cik``."""
+        return "Simulated Company {0}".format(int(cik) - 1000000)
+
+    def daily_filings(self, day):
+        """Get filings made on ``day``.
+
+        Args:
+            day (datetime.date): Day filings were made.
+
+        Returns:
+            list of tuple: Tuples of CIK, form type and accession number.
+        """
+        if day.weekday() >= 5:
+            return []
+        seq = day.timetuple().tm_yday * 1000
+        filings = []
+        for i in range(self.filings_per_day):
+            cik = self.cik((day.toordinal() + i) % self.companies)
+            accession = "{0:010d}-{1:02d}-{2:06d}".format(cik, day.year % 100, seq + i)
+            filings.append((cik, FORM_TYPES[i % len(FORM_TYPES)], accession))
+        return filings
+
+    def company_filings(self, cik):
+        """Get filings listed by browse-edgar for company with ``cik``.
+
+        Returns:
+            list of tuple: Tuples of form type and accession number, newest first.
+        """
+        return [(FORM_TYPES[i % len(FORM_TYPES)],
+                 "{0:010d}-99-{1:06d}".format(cik, 999999 - i))
+                for i in range(self.filings_per_company)]
+
+    @lru_cache(maxsize=1024)
+    def filing(self, accession):
+        """Get contents of filing with ``accession`` number."""
+        header = ("<SEC-DOCUMENT>{0}.txt\n<SEC-HEADER>\nACCESSION NUMBER: {0}\n"
+                  "</SEC-HEADER>\n").format(accession).encode("ascii")
+        filler = b"simulated filing text " * (self.filing_size // 22 + 1)
+        return (header + filler)[:max(self.filing_size, len(header))]
+
+    def _idx(self, days, date_format):
+        lines = [
+            "Description:           Master Index of EDGAR Dissemination Feed",
+            "Last Data Received:    {0:%b %d, %Y}".format(days[-1]) if days else "",
+            "Comments:              webmaster@sec.gov",
+            "Anonymous FTP:         ftp://ftp.sec.gov/edgar/",
+            " ", " ", " ",
+            "CIK|Company Name|Form Type|Date Filed|File Name",
+            "-" * 80,
+        ]
+        for day in days:
+            for cik, form_type, accession in self.daily_filings(day):
+                lines.append("{0}|{1}|{2}|{3}|edgar/data/{0}/{4}.txt".format(
+                    cik, self.company_name(cik), form_type, day.strftime(date_format),
+                    accession))
+        return "\n".join(lines) + "\n"
+
+    def _tarball(self, day):
+        buffer = io.BytesIO()
+        # Fixed gzip timestamp, so that the same archive (and ETag) is served every time
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=1, mtime=0) as gz, \
+                tarfile.open(fileobj=gz, mode="w") as tar:
+            for _, _, accession in self.daily_filings(day):
+                content = self.filing(accession)
+                info = tarfile.TarInfo(accession + ".nc")
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        return buffer.getvalue()
+
+    @staticmethod
+    def _listing(names):
+        rows = "\n".join('<tr><td><a href="{0}">{0}</a></td></tr>'.format(n) for n in names)
+        return "<html><body><table>\n{0}\n</table></body></html>\n".format(rows)
+
+    # Request handling
+
+    async def _respond(self, request, body, content_type="text/plain", status=200,
+                       headers=None):
+        """Send ``body``, limited to :attr:`bandwidth` bytes per second."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        request["bytes_sent"] = len(body)
+        if not self.bandwidth:
+            return web.Response(body=body, status=status, content_type=content_type,
+                                headers=headers)
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_type = content_type
+        response.content_length = len(body)
+        await response.prepare(request)
+        for i in range(0, len(body), _CHUNK_SIZE):
+            chunk = body[i:i + _CHUNK_SIZE]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+        await response.write_eof()
+        return response
+
+    @web.middleware
+    async def _inject_faults(self, request, handler):
+        start = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            response = web.Response(status=429, text="Request Rate Threshold Exceeded",
+                                    headers={"Retry-After": str(self.retry_after)})
+        elif roll < self.throttle_rate + self.error_rate:
+            response = web.Response(status=500, text="Internal Server Error")
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                response = e
+        self.stats.record(response.status, request.get("bytes_sent", 0),
+                          time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _quarter(request):
+        year, quarter = int(request.match_info["year"]), int(request.match_info["quarter"])
+        if not 1 <= quarter <= 4:
+            raise web.HTTPNotFound()
+        return year, quarter
+
+    @staticmethod
+    def _day(value):
+        try:
+            return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        except ValueError:
+            raise web.HTTPNotFound()
+
+    def _days(self, request):
+        return _quarter_days(*self._quarter(request), limit=self.days_per_quarter)
+
+    async def _daily_index(self, request):
+        names = ["master.{0:%Y%m%d}.idx".format(day) for day in self._days(request)]
+        return await self._respond(request, self._listing(names), "text/html")
+
+    async def _daily_idx(self, request):
+        day = self._day(request.match_info["day"])
+        if day not in self._days(request):
+            raise web.HTTPNotFound()
+        return await self._respond(request, self._idx([day], "%Y%m%d"))
+
+    async def _full_index(self, request):
+        self._quarter(request)
+        names = ["company.idx", "form.idx", "master.idx"]
+        return await self._respond(request, self._listing(names), "text/html")
+
+    async def _full_idx(self, request):
+        days = self._days(request)
+        loop = asyncio.get_running_loop()
+        idx = await loop.run_in_executor(None, self._idx, days, "%Y-%m-%d")
+        return await self._respond(request, idx)
+
+    async def _feed_index(self, request):
+        names = ["{0:%Y%m%d}.nc.tar.gz".format(day) for day in self._days(request)]
+        return await self._respond(request, self._listing(names), "text/html")
+
+    async def _feed_tarball(self, request):
+        day = self._day(request.match_info["day"])
+        if day not in self._days(request):
+            raise web.HTTPNotFound()
+        loop = asyncio.get_running_loop()
+        tarball = await loop.run_in_executor(None, self._tarball, day)
+        return await self._respond_ranged(request, tarball, "application/x-gzip")
+
+    async def _filing(self, request):
+        name = request.match_info["tail"].split("/")[-1]
+        match = _ACCESSION.match(name[:-len(".txt")]) if name.endswith(".txt") else None
+        if match is None:
+            raise web.HTTPNotFound()
+        return await self._respond_ranged(request, self.filing(match.group(0)))
+
+    async def _respond_ranged(self, request, content, content_type="text/plain"):
+        """Respond with ``content``, or the part of it asked for by a ``Range`` header."""
+        etag = '"{0}"'.format(hashlib.md5(content).hexdigest())
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        range_match = re.match(r"bytes=(\d+)-$", request.headers.get("Range", ""))
+        if_range = request.headers.get("If-Range")
+        if range_match and (if_range is None or if_range == etag):
+            start = int(range_match.group(1))
+            if start >= len(content):
+                raise web.HTTPRequestRangeNotSatisfiable(
+                    headers={"Content-Range": "bytes */{0}".format(len(content))})
+            headers["Content-Range"] = "bytes {0}-{1}/{2}".format(
+                start, len(content) - 1, len(content))
+            return await self._respond(request, content[start:], content_type, status=206,
+                                       headers=headers)
+        return await self._respond(request, content, content_type, headers=headers)
+
+    async def _browse_edgar(self, request):
+        query = request.query
+        if query.get("action") != "getcompany" or not query.get("CIK", "").isdigit():
+            raise web.HTTPBadRequest()
+        cik = int(query["CIK"])
+        if not 0 <= cik - 1000000 < self.companies:
+            raise web.HTTPNotFound()
+        filings = self.company_filings(cik)
+        if query.get("type"):
+            filings = [f for f in filings if f[0] == query["type"]]
+        start, count = int(query.get("start", 0)), int(query.get("count", 40))
+        entries = "".join(
+            "<filing><dateFiled>2020-01-02</dateFiled>"
+            "<filingHREF>https://www.sec.gov/Archives/edgar/data/{0}/{1}/{2}-index.htm"
+            "</filingHREF><type>{3}</type></filing>\n".format(
+                cik, accession.replace("-", ""), accession, form_type)
+            for form_type, accession in filings[start:start + min(count, 100)])
+        xml = ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<companyFilings>\n"
+               "<companyInfo><CIK>{0:010d}</CIK><name>{1}</name></companyInfo>\n"
+               "<results>\n{2}</results>\n</companyFilings>\n").format(
+                   cik, self.company_name(cik), entries)
+        return await self._respond(request, xml, "application/xml")
+
+    async def _company_tickers(self, request):
+        tickers = {str(k): {"cik_str": self.cik(k), "ticker": "SIM{0}".format(k),
+                            "title": self.company_name(self.cik(k))}
+                   for k in range(self.companies)}
+        return await self._respond(request, json.dumps(tickers), "application/json")
+
+    def _api_cik(self, request):
+        cik = int(request.match_info["cik"])
+        if not 0 <= cik - 1000000 < self.companies:
+            raise web.HTTPNotFound()
+        return cik
+
+    async def _submissions(self, request):
+        cik = self._api_cik(request)
+        filings = self.company_filings(cik)
+        data = {
+            "cik": str(cik),
+            "name": self.company_name(cik),
+            "tickers": ["SIM{0}".format(cik - 1000000)],
+            "filings": {
+                "recent": {
+                    "accessionNumber": [accession for _, accession in filings],
+                    "form": [form_type for form_type, _ in filings],
+                },
+                "files": [],
+            },
+        }
+        return await self._respond(request, json.dumps(data), "application/json")
+
+    @staticmethod
+    def _fact(end, value):
+        return {"end": end, "val": value, "fy": int(end[:4]), "form": "10-K"}
+
+    async def _company_facts(self, request):
+        cik = self._api_cik(request)
+        facts = {"us-gaap": {"Assets": {"units": {"USD": [
+            self._fact("{0}-12-31".format(year), cik * year) for year in range(2015, 2021)]}}}}
+        data = {"cik": cik, "entityName": self.company_name(cik), "facts": facts}
+        return await self._respond(request, json.dumps(data), "application/json")
+
+    async def _company_concept(self, request):
+        cik = self._api_cik(request)
+        data = {"cik": cik, "taxonomy": request.match_info["taxonomy"],
+                "tag": request.match_info["tag"], "entityName": self.company_name(cik),
+                "units": {"USD": [self._fact("2020-12-31", cik)]}}
+        return await self._respond(request, json.dumps(data), "application/json")
+
+    async def _frames(self, request):
+        info = request.match_info
+        data = {"taxonomy": info["taxonomy"], "tag": info["tag"], "uom": info["unit"],
+                "ccp": info["period"],
+                "data": [{"cik": self.cik(k), "entityName": self.company_name(self.cik(k)),
+                          "val": self.cik(k)} for k in range(self.companies)]}
+        return await self._respond(request, json.dumps(data), "application/json")
+
+    def make_app(self):
+        """Create ``aiohttp`` application serving the simulated endpoints.
+
+        Returns:
+            aiohttp.web.Application: Application which can also be run with ``web.run_app``.
+        """
+        app = web.Application(middlewares=[self._inject_faults])
+        quarter = r"{year:\d{4}}/QTR{quarter:\d}"
+        app.router.add_get("/Archives/edgar/daily-index/" + quarter + "/", self._daily_index)
+        app.router.add_get("/Archives/edgar/daily-index/" + quarter + r"/master.{day:\d{8}}.idx",
+                           self._daily_idx)
+        app.router.add_get("/Archives/edgar/full-index/" + quarter + "/", self._full_index)
+        app.router.add_get("/Archives/edgar/full-index/" + quarter + "/master.idx",
+                           self._full_idx)
+        app.router.add_get("/Archives/edgar/Feed/" + quarter + "/", self._feed_index)
+        app.router.add_get("/Archives/edgar/Feed/" + quarter + r"/{day:\d{8}}.nc.tar.gz",
+                           self._feed_tarball)
+        app.router.add_get("/Archives/edgar/data/{tail:.+}", self._filing)
+        app.router.add_get("/cgi-bin/browse-edgar", self._browse_edgar)
+        app.router.add_get("/files/company_tickers.json", self._company_tickers)
+        app.router.add_get(r"/submissions/CIK{cik:\d{10}}.json", self._submissions)
+        app.router.add_get(r"/api/xbrl/companyfacts/CIK{cik:\d{10}}.json",
+                           self._company_facts)
+        app.router.add_get(r"/api/xbrl/companyconcept/CIK{cik:\d{10}}/{taxonomy}/{tag}.json",
+                           self._company_concept)
+        app.router.add_get("/api/xbrl/frames/{taxonomy}/{tag}/{unit}/{period}.json",
+                           self._frames)
+        return app
+
+    # Server lifecycle
+
+    def start(self):
+        """Start serving on a background thread.
+
+        Returns:
+            EDGARSimulator: The simulator, once it accepts connections.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Simulator is already running.")
+        self._loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = runner.addresses[0][1]
+        self._runner = runner
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and wait for the background thread to finish."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,166 @@
+import datetime
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from secedgar.cache import IMMUTABLE, HTTPCache
+from secedgar.client import NetworkClient
+from secedgar.tests.utils import MockResponse
+
+
+@pytest.fixture
+def cache(tmp_data_directory):
+    return HTTPCache(os.path.join(tmp_data_directory, "cache"))
+
+
+def make_response(content=b"body", status_code=200, **headers):
+    response = MockResponse(content=content, status_code=status_code)
+    response.headers.update(headers)
+    return response
+
+
+class RecordingGet:
+    """Stand-in for ``requests.Session.get`` returning given responses in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def __call__(self, url, params=None, headers=None, **kwargs):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+
+class TestHTTPCache:
+
+    def test_put_and_get(self, cache):
+        url = "https://www.sec.gov/Archives/edgar/full-index/2000/QTR1/master.idx"
+        cache.put(url, make_response(b"idx", ETag='"abc"', **{"Content-Type": "text/plain"}))
+        entry = cache.get(url)
+        assert entry.body == b"idx"
+        assert entry.validators == {"If-None-Match": '"abc"'}
+        response = entry.to_response()
+        assert response.text == "idx"
+        assert response.headers["Content-Type"] == "text/plain"
+
+    def test_missing_entry(self, cache):
+        assert cache.get("https://www.sec.gov/missing") is None
+
+    @pytest.mark.parametrize("url,expected", [
+        ("https://www.sec.gov/Archives/edgar/full-index/2000/QTR1/master.idx", IMMUTABLE),
+        ("https://www.sec.gov/Archives/edgar/daily-index/1999/QTR4/", IMMUTABLE),
+        ("https://www.sec.gov/Archives/edgar/full-index/{0}/QTR4/master.idx".format(
+            datetime.date.today().year + 1), 0),
+        ("https://www.sec.gov/cgi-bin/browse-edgar?CIK=aapl", 0),
+    ])
+    def test_default_ttl_policies(self, cache, url, expected):
+        assert cache.ttl(url) == expected
+
+    def test_custom_ttl_policy(self, tmp_data_directory):
+        cache = HTTPCache(os.path.join(tmp_data_directory, "custom"),
+                          ttl_policies=[(r"browse-edgar", 60)], default_ttl=5)
+        assert cache.ttl("https://www.sec.gov/cgi-bin/browse-edgar") == 60
+        assert cache.ttl("https://www.sec.gov/files/company_tickers.json") == 5
+
+    def test_freshness(self, tmp_data_directory):
+        cache = HTTPCache(os.path.join(tmp_data_directory, "fresh"), default_ttl=60)
+        cache.put("https://www.sec.gov/a", make_response())
+        entry = cache.get("https://www.sec.gov/a")
+        assert cache.is_fresh(entry)
+        entry.meta["stored_at"] = time.time() - 120
+        assert not cache.is_fresh(entry)
+
+    @pytest.mark.parametrize("stored_on,fresh", [
+        (datetime.datetime(2020, 5, 15), False),  # cached while quarter was open
+        (datetime.datetime(2020, 7, 3), False),  # index may still be rebuilt
+        (datetime.datetime(2020, 7, 20), True),
+    ])
+    def test_closed_quarter_freshness(self, cache, stored_on, fresh):
+        url = "https://www.sec.gov/Archives/edgar/full-index/2020/QTR2/master.idx"
+        cache.put(url, make_response(b"partial idx"))
+        entry = cache.get(url)
+        entry.meta["stored_at"] = stored_on.timestamp()
+        assert cache.is_fresh(entry) is fresh
+
+    def test_lru_eviction(self, tmp_data_directory):
+        cache = HTTPCache(os.path.join(tmp_data_directory, "lru"), max_size=10)
+        cache.put("https://www.sec.gov/a", make_response(b"aaaa"))
+        cache.put("https://www.sec.gov/b", make_response(b"bbbb"))
+        cache.get("https://www.sec.gov/a")  # b is now least recently used
+        cache.put("https://www.sec.gov/c", make_response(b"cccc"))
+        assert cache.get("https://www.sec.gov/b") is None
+        assert cache.get("https://www.sec.gov/a") is not None
+        assert cache.size <= 10
+        assert cache.stats["evictions"] == 1
+
+    def test_entries_persist(self, tmp_data_directory):
+        directory = os.path.join(tmp_data_directory, "persist")
+        HTTPCache(directory).put("https://www.sec.gov/a", make_response(b"aaaa"))
+        reopened = HTTPCache(directory)
+        assert reopened.get("https://www.sec.gov/a").body == b"aaaa"
+        assert reopened.size == 4
+
+    def test_shared_directory(self, tmp_data_directory):
+        directory = os.path.join(tmp_data_directory, "shared")
+        first, second = HTTPCache(directory), HTTPCache(directory)
+        first.put("https://www.sec.gov/a", make_response(b"aaaa"))
+        assert second.get("https://www.sec.gov/a").body == b"aaaa"
+        assert second.size == 4
+        first.clear()  # e.g. evicted by the other process
+        assert second.get("https://www.sec.gov/a") is None
+        assert second.size == 0
+
+    def test_counters_thread_safe(self, cache):
+        def record(_):
+            for _ in range(1000):
+                cache.record_hit()
+                cache.record_miss()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(record, range(8)))
+        assert cache.stats["hits"] == cache.stats["misses"] == 8000
+
+    def test_clear(self, cache):
+        cache.put("https://www.sec.gov/a", make_response())
+        cache.clear()
+        assert cache.get("https://www.sec.gov/a") is None
+        assert cache.size == 0
+
+
+class TestClientCache:
+
+    def test_immutable_entry_served_without_request(self, cache, mock_user_agent, monkeypatch):
+        get = RecordingGet(make_response(b"idx", ETag='"v1"'))
+        monkeypatch.setattr(requests.Session, "get", get)
+        client = NetworkClient(user_agent=mock_user_agent, cache=cache)
+        url = client._prepare_query("Archives/edgar/full-index/2000/QTR1/master.idx")
+        for _ in range(3):
+            assert client._get_cached_response(url, None, {}).text == "idx"
+        assert len(get.headers) == 1
+        assert cache.stats["hits"] == 2 and cache.stats["misses"] == 1
+
+    def test_stale_entry_revalidated(self, cache, mock_user_agent, monkeypatch):
+        get = RecordingGet(make_response(b"page", ETag='"v1"'),
+                           make_response(b"", status_code=304))
+        monkeypatch.setattr(requests.Session, "get", get)
+        client = NetworkClient(user_agent=mock_user_agent, cache=cache)
+        url = client._prepare_query("cgi-bin/browse-edgar")
+        params = {"CIK": "320193"}
+        client._get_cached_response(url, params, {})
+        response = client._get_cached_response(url, params, {})
+        assert response.text == "page"
+        assert get.headers[1]["If-None-Match"] == '"v1"'
+        assert cache.stats["revalidations"] == 1
+
+    def test_changed_entry_replaced(self, cache, mock_user_agent, monkeypatch):
+        get = RecordingGet(make_response(b"old", ETag='"v1"'),
+                           make_response(b"new", ETag='"v2"'))
+        monkeypatch.setattr(requests.Session, "get", get)
+        client = NetworkClient(user_agent=mock_user_agent, cache=cache)
+        url = client._prepare_query("cgi-bin/browse-edgar")
+        client._get_cached_response(url, None, {})
+        assert client._get_cached_response(url, None, {}).text == "new"
+        assert cache.get(url).body == b"new"
@@ -1,4 +1,5 @@
 import json
+import weakref
 from unittest.mock import patch
 
 import pytest
@@ -34,8 +35,20 @@ def mock_get_cik_map(monkeypatch):
                      "3": {"cik_str": "1326801", "ticker": "FB", "title": "META PLATFORMS, INC."},
                      "4": {"cik_str": "1652044", "ticker": "GOOGL", "title": "Alphabet Inc."},
                      "5": {"cik_str": "1652044", "ticker": "GOOG", "title": "Alphabet Inc."}}
-    response_json = json.dumps(response_json)
-    monkeypatch.setattr(requests, 'get', MockResponse(content=bytes(response_json, "utf-8")))
+    response = MockResponse(content=bytes(json.dumps(response_json), "utf-8"))
+    monkeypatch.setattr(requests, 'get', response)
+    # Map is fetched through the client, other requests go to mocks set up before
+    get_response = NetworkClient.get_response
+
+    def mock_get_response(self, path, *args, **kwargs):
+        if path == "files/company_tickers.json":
+            return response
+        return get_response(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(NetworkClient, "get_response", mock_get_response)
+    get_cik_map.cache_clear()
+    yield
+    get_cik_map.cache_clear()
 
 
 @pytest.fixture
@@ -105,27 +118,63 @@ class TestCIKLookup(object):
         assert multiple_company_lookup.lookups == ['aapl', 'msft', 'fb']
 
     def test_multiple_results_company_name_search(self, mock_client_cik_lookup,
-                                                  mock_single_cik_multiple_results_response):
+                                                  mock_single_cik_multiple_results_response,
+                                                  mock_get_cik_map):
         multiple_results_cik = CIKLookup('paper', client=mock_client_cik_lookup)
         with pytest.warns(UserWarning):
             assert len(multiple_results_cik.ciks) == 0
 
     def test_multiple_results_raises_warnings(self, mock_client_cik_lookup,
-                                              mock_single_cik_multiple_results_response):
+                                              mock_single_cik_multiple_results_response,
+                                              mock_get_cik_map):
         multiple_results_cik = CIKLookup('paper', client=mock_client_cik_lookup)
         with pytest.warns(UserWarning):
             _ = multiple_results_cik.ciks
 
-    def test_cik_lookup_cik_hits_request(self, mock_client_cik_lookup):
+    def test_cik_lookup_cik_hits_request(self, mock_client_cik_lookup, mock_get_cik_map):
         with patch.object(CIKLookup, '_get_cik_from_html') as mock:
             CIKLookup(['Apple'], client=mock_client_cik_lookup).get_ciks()
             mock.assert_called()
 
+    def test_cik_map_fetched_through_client(self, mock_client_cik_lookup, mock_get_cik_map,
+                                            monkeypatch):
+        def bare_get(*args, **kwargs):
+            raise AssertionError("Map must be fetched with the client.")
+
+        monkeypatch.setattr(requests, "get", bare_get)
+        assert mock_client_cik_lookup.cache is None
+        assert CIKLookup(["aapl"], client=mock_client_cik_lookup).ciks == ["320193"]
+
+    def test_cik_map_cached_across_clients(self, mock_user_agent, mock_get_cik_map,
+                                           monkeypatch):
+        fetched = []
+        get_response = NetworkClient.get_response
+
+        def count_get_response(self, path, *args, **kwargs):
+            fetched.append(path)
+            return get_response(self, path, *args, **kwargs)
+
+        monkeypatch.setattr(NetworkClient, "get_response", count_get_response)
+        clients = [NetworkClient(user_agent=mock_user_agent) for _ in range(2)]
+        for client in clients:
+            assert CIKLookup(["aapl"], client=client).ciks == ["320193"]
+        assert fetched == ["files/company_tickers.json"]
+        assert get_cik_map.cache_info().currsize == 1
+        # Cache does not keep clients alive
+        client = weakref.ref(clients.pop())
+        assert client() is None
+
     def test_cik_lookup_cik_bypasses_request(self, mock_client_cik_lookup):
         with patch.object(CIKLookup, '_get_cik_from_html') as mock:
             CIKLookup(['1018724'], client=mock_client_cik_lookup).get_ciks()
             mock.assert_not_called()
 
+    def test_cik_lookup_ciks_skip_cik_map(self, mock_client_cik_lookup):
+        with patch("secedgar.cik_lookup.get_cik_map") as mock:
+            ciks = CIKLookup(['1018724', '320193'], client=mock_client_cik_lookup).get_ciks()
+            mock.assert_not_called()
+        assert ciks == {'1018724': '1018724', '320193': '320193'}
+
     @pytest.mark.parametrize(
         "bad_cik",
         [
@@ -138,7 +187,7 @@ class TestCIKLookup(object):
             CIKLookup(bad_cik, client=mock_client_cik_lookup)
 
     def test_validate_cik_after_cik_lookup(self, mock_client_cik_lookup,
-                                           mock_single_cik_not_found):
+                                           mock_single_cik_not_found, mock_get_cik_map):
         # string remains unchecked until query to allow for possibility of
         # using company name, ticker, or CIK as string
         with pytest.raises(EDGARQueryError):
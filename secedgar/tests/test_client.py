@@ -1,14 +1,24 @@
 import asyncio
+import gzip
+import json
 import math
 import os
+import threading
 import time
 
+import aiohttp
 import pytest
 import requests
 
-from secedgar.client import NetworkClient
+from secedgar.cache import HTTPCache
+from secedgar.client import (AsyncNetworkClient, DownloadFailure, DownloadReport,
+                             NetworkClient, _DiskWriter)
 from secedgar.exceptions import EDGARQueryError
-from secedgar.tests.utils import MockResponse
+from secedgar.rate_limit import FileRateLimiter
+from secedgar.tests.utils import AsyncMockResponse, MockResponse
+from secedgar.transport import HTTPTransport
+
+REAL_GET_RESPONSE = NetworkClient.get_response
 
 
 @pytest.fixture
@@ -191,3 +201,869 @@ class TestNetworkClient:
         asyncio.run(client.wait_for_download_async(inputs))
         end = time.time()
         assert num_requests / math.ceil(end - start) <= rate_limit
+
+    def test_download_report(self, mock_user_agent, tmp_data_directory, mock_filing_response):
+        client = NetworkClient(user_agent=mock_user_agent, rate_limit=10)
+        inputs = [("https://google.com", os.path.join(tmp_data_directory, str(i)))
+                  for i in range(5)]
+        report = asyncio.run(client.wait_for_download_async(inputs))
+        assert report.requests == 5
+        # 5 requests are spaced over 4 intervals of 0.1 seconds
+        assert report.elapsed >= 0.39
+        assert report.requests_per_second > 0
+        assert all(os.path.exists(path) for _, path in inputs)
+
+    def test_shared_limiter_used(self, mock_user_agent, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "client.lock")
+        first = NetworkClient(user_agent=mock_user_agent,
+                              limiter=FileRateLimiter(path, rate=5))
+        second = NetworkClient(user_agent=mock_user_agent,
+                               limiter=FileRateLimiter(path, rate=5))
+        assert first.limiter.reserve() == 0
+        assert second.limiter.reserve() > 0
+
+    def test_download_streamed_in_chunks(self, mock_user_agent, tmp_data_directory,
+                                         monkeypatch):
+        content = bytes(range(256)) * 10
+        monkeypatch.setattr(NetworkClient, "_request_async",
+                            lambda *args, **kwargs: AsyncMockResponse(content=content))
+        client = NetworkClient(user_agent=mock_user_agent, chunk_size=100)
+        path = os.path.join(tmp_data_directory, "streamed", "filing.txt")
+        asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        with open(path, "rb") as f:
+            assert f.read() == content
+        assert not os.path.exists(path + ".part")
+
+    def test_download_compressed(self, mock_user_agent, tmp_data_directory,
+                                 mock_filing_response):
+        client = NetworkClient(user_agent=mock_user_agent)
+        path = os.path.join(tmp_data_directory, "compressed", "filing.txt")
+        asyncio.run(client.wait_for_download_async([("https://google.com", path)],
+                                                   compression="gzip"))
+        assert not os.path.exists(path)
+        with gzip.open(path + ".gz") as f:
+            assert f.read() == b"Testing..."
+
+    @pytest.mark.parametrize(
+        "test_input,expectation",
+        [
+            (0.5, TypeError),
+            ("1", TypeError),
+            (0, ValueError)
+        ]
+    )
+    def test_client_bad_chunk_size(self, test_input, expectation, client):
+        with pytest.raises(expectation):
+            client.chunk_size = test_input
+
+    def test_rate_limit_updates_limiter(self, client):
+        client.rate_limit = 4
+        assert client.limiter.rate == 4
+
+    @pytest.mark.parametrize(
+        "test_input,expectation",
+        [
+            (0.5, TypeError),
+            ("1", TypeError),
+            (0, ValueError)
+        ]
+    )
+    def test_client_bad_concurrency(self, test_input, expectation, client):
+        with pytest.raises(expectation):
+            client.concurrency = test_input
+
+    def test_session_reused_between_requests(self, mock_single_filing_type_good_response,
+                                             client):
+        session = client.session
+        client.get_response("path")
+        client.get_response("path")
+        assert client.session is session
+
+    def test_close_resets_session(self, client):
+        session = client.session
+        client.close()
+        assert client.session is not session
+
+    def test_retry_settings_rebuild_session(self, client):
+        session = client.session
+        client.retry_count = 5
+        assert client.session is not session
+        assert client.session.get_adapter(client._BASE).max_retries.total == 5
+
+    def test_context_manager_closes_session(self, mock_user_agent):
+        with NetworkClient(user_agent=mock_user_agent) as client:
+            _ = client.session
+        assert client._session is None
+
+    def test_base_is_https(self, client):
+        assert client._prepare_query("Archives/").startswith("https://")
+
+
+class TestThrottling:
+
+    @staticmethod
+    def _throttled_response(retry_after="0"):
+        response = MockResponse(content=b"", status_code=429)
+        response.headers["Retry-After"] = retry_after
+        return response
+
+    def test_throttled_request_retried(self, client, monkeypatch):
+        responses = [self._throttled_response(),
+                     MockResponse(content=b"ok", status_code=200)]
+        monkeypatch.setattr(client.session, "get", lambda *args, **kwargs: responses.pop(0))
+        response = client._send("https://www.sec.gov/")
+        assert response.status_code == 200
+        assert client.rate_controller.throttles == 1
+        assert client.limiter.rate == pytest.approx(5.1)
+
+    def test_throttled_response_returned_after_retries(self, mock_user_agent, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, retry_count=2)
+        calls = []
+
+        def mock_get(*args, **kwargs):
+            calls.append(args)
+            return self._throttled_response()
+
+        monkeypatch.setattr(client.session, "get", mock_get)
+        assert client._send("https://www.sec.gov/").status_code == 429
+        assert len(calls) == 3
+        assert client.limiter.rate == 1.25
+
+    def test_server_errors_retried_through_limiter(self, mock_user_agent, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, retry_count=2)
+        acquired = []
+        monkeypatch.setattr(client.limiter, "acquire", lambda: acquired.append(1) or 0)
+        responses = [MockResponse(content=b"", status_code=500),
+                     MockResponse(content=b"", status_code=502),
+                     MockResponse(content=b"", status_code=500)]
+        monkeypatch.setattr(client.session, "get", lambda *args, **kwargs: responses.pop(0))
+        # Last response is returned rather than raising requests.exceptions.RetryError
+        assert client._send("https://www.sec.gov/").status_code == 500
+        assert len(acquired) == 3
+        assert client.rate_controller.throttles == 0
+
+    def test_session_only_retries_connection_errors(self, client):
+        assert not client.session.get_adapter(client._BASE).max_retries.status_forcelist
+
+    def test_rate_limit_sets_max_rate(self, client):
+        client.rate_limit = 5
+        assert client.rate_controller.max_rate == 5
+
+    def test_async_throttled_download_retried(self, client, tmp_data_directory,
+                                              monkeypatch):
+        attempts = []
+
+        def mock_request(link, session, headers=None):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise aiohttp.ClientResponseError(None, (), status=429,
+                                                  headers={"Retry-After": "0.3"})
+            return AsyncMockResponse(content=b"Testing...")
+
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(mock_request))
+        path = os.path.join(tmp_data_directory, "throttled", "filing.txt")
+        report = asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert report.requests == 1
+        assert attempts[1] - attempts[0] >= 0.3
+        with open(path, "rb") as f:
+            assert f.read() == b"Testing..."
+
+    def test_async_other_errors_not_throttled(self, client, tmp_data_directory,
+                                              monkeypatch):
+        def mock_request(link, session, headers=None):
+            raise aiohttp.ClientResponseError(None, (), status=404)
+
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(mock_request))
+        path = os.path.join(tmp_data_directory, "not_found", "filing.txt")
+        with pytest.warns(UserWarning):
+            asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert client.rate_controller.throttles == 0
+
+
+class SlowResponse(AsyncMockResponse):
+    async def __aenter__(self):
+        await asyncio.sleep(10)
+        return self
+
+
+class TestFailureIsolation:
+
+    @staticmethod
+    def _mock_requests(monkeypatch, outcomes):
+        """Make requests to each URL fail with given errors before succeeding."""
+        attempts = {}
+
+        def mock_request(link, session, headers=None):
+            attempts[link] = attempts.get(link, 0) + 1
+            errors = outcomes.get(link, [])
+            if attempts[link] <= len(errors):
+                raise errors[attempts[link] - 1]
+            return AsyncMockResponse(content=b"Testing...")
+
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(mock_request))
+        return attempts
+
+    @pytest.mark.parametrize("error", [
+        aiohttp.ClientResponseError(None, (), status=500),
+        aiohttp.ClientConnectionError("Connection reset"),
+        asyncio.TimeoutError(),
+    ])
+    def test_transient_error_retried(self, client, tmp_data_directory, monkeypatch, error):
+        attempts = self._mock_requests(monkeypatch, {"https://google.com": [error]})
+        path = os.path.join(tmp_data_directory, "transient", "filing.txt")
+        report = asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert attempts["https://google.com"] == 2
+        assert report.failures == []
+        assert os.path.exists(path)
+
+    def test_bad_download_does_not_stop_others(self, client, tmp_data_directory,
+                                               monkeypatch):
+        not_found = aiohttp.ClientResponseError(None, (), status=404)
+        attempts = self._mock_requests(monkeypatch, {"https://bad.com": [not_found]})
+        inputs = [(url, os.path.join(tmp_data_directory, "isolation", str(i)))
+                  for i, url in enumerate(["https://a.com", "https://bad.com", "https://b.com"])]
+        with pytest.warns(UserWarning, match="1 of 3 downloads failed"):
+            report = asyncio.run(client.wait_for_download_async(inputs))
+        assert attempts["https://bad.com"] == 1
+        assert report.requests == 3
+        failure, = report.failures
+        assert (failure.url, failure.path) == inputs[1]
+        assert failure.status == 404
+        assert failure.attempts == 1
+        assert report.failed_inputs == [inputs[1]]
+        assert os.path.exists(inputs[0][1])
+        assert os.path.exists(inputs[2][1])
+
+    def test_retries_exhausted(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, retry_count=2)
+        errors = [aiohttp.ClientResponseError(None, (), status=502)] * 3
+        self._mock_requests(monkeypatch, {"https://google.com": errors})
+        path = os.path.join(tmp_data_directory, "exhausted", "filing.txt")
+        with pytest.warns(UserWarning):
+            report = asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert report.failures[0].attempts == 3
+        assert report.failures[0].status == 502
+
+    def test_backoff_bounds(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent, backoff_factor=0.5)
+        assert all(0 <= client._backoff(3) <= 2 for _ in range(100))
+        client.backoff_factor = 0
+        assert client._backoff(3) == 0
+
+    def test_run_timeout(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=1)
+        monkeypatch.setattr(NetworkClient, "_request_async",
+                            staticmethod(lambda *args, **kwargs: SlowResponse(content=b"")))
+        inputs = [("https://a.com", os.path.join(tmp_data_directory, "timeout", "a")),
+                  ("https://b.com", os.path.join(tmp_data_directory, "timeout", "b"))]
+        start = time.monotonic()
+        with pytest.warns(UserWarning):
+            report = asyncio.run(client.wait_for_download_async(inputs, timeout=0.2))
+        assert time.monotonic() - start < 5
+        assert report.failed_inputs == inputs
+        assert [f.attempts for f in report.failures] == [1, 0]
+        assert report.abandoned == 0
+
+    def test_merge_reports(self):
+        first, second = DownloadReport(), DownloadReport()
+        first.requests, second.requests = 1, 2
+        second.failures.append(DownloadFailure("https://a.com", "a", status=404, attempts=1))
+        second.end = time.monotonic()
+        assert first.merge(second) is first
+        assert first.requests == 3
+        assert first.failed_inputs == [("https://a.com", "a")]
+
+
+class TestLazyInputs:
+
+    @staticmethod
+    def _inputs(directory, n):
+        return [("https://a.com/{0}".format(i), os.path.join(directory, "lazy", str(i)))
+                for i in range(n)]
+
+    def test_generator_pulled_lazily(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=2)
+        started = []
+        leads = []
+
+        def mock_request(link, session, headers=None):
+            started.append(link)
+            return AsyncMockResponse(content=b"Testing...")
+
+        def generate(inputs):
+            for i, item in enumerate(inputs):
+                leads.append(i - len(started))
+                yield item
+
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(mock_request))
+        inputs = self._inputs(tmp_data_directory, 30)
+        report = asyncio.run(client.wait_for_download_async(generate(inputs)))
+        assert report.requests == 30
+        assert report.failures == []
+        assert all(os.path.exists(path) for _, path in inputs)
+        assert max(leads) <= 2 * 2 + 2  # queue plus one item held by each worker
+
+    def test_async_iterable(self, mock_user_agent, tmp_data_directory, mock_filing_response):
+        client = NetworkClient(user_agent=mock_user_agent)
+        inputs = self._inputs(tmp_data_directory, 5)
+
+        async def generate():
+            for item in inputs:
+                await asyncio.sleep(0)
+                yield item
+
+        report = asyncio.run(client.wait_for_download_async(generate()))
+        assert report.requests == 5
+        assert all(os.path.exists(path) for _, path in inputs)
+
+    def test_timeout_closes_inputs(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=1)
+        monkeypatch.setattr(NetworkClient, "_request_async",
+                            staticmethod(lambda *args, **kwargs: SlowResponse(content=b"")))
+        inputs = self._inputs(tmp_data_directory, 10)
+        pulled, closed = [], []
+
+        def generate():
+            try:
+                for item in inputs:
+                    pulled.append(item)
+                    yield item
+            finally:
+                closed.append(True)
+
+        with pytest.warns(UserWarning):
+            report = asyncio.run(client.wait_for_download_async(generate(), timeout=0.2))
+        assert closed == [True]
+        assert len(pulled) < 10  # rest of inputs is not produced after timing out
+        assert report.failed_inputs == pulled
+        assert report.abandoned is None  # number left is unknown
+
+    def test_timeout_counts_abandoned_inputs(self, mock_user_agent, tmp_data_directory,
+                                             monkeypatch):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=1)
+        monkeypatch.setattr(NetworkClient, "_request_async",
+                            staticmethod(lambda *args, **kwargs: SlowResponse(content=b"")))
+        inputs = self._inputs(tmp_data_directory, 10)
+        with pytest.warns(UserWarning):
+            report = asyncio.run(client.wait_for_download_async(inputs, timeout=0.2))
+        assert len(report.failures) + report.abandoned == 10
+        assert report.abandoned > 0
+
+    def test_error_in_inputs_raised(self, mock_user_agent, tmp_data_directory,
+                                    mock_filing_response):
+        client = NetworkClient(user_agent=mock_user_agent)
+
+        def generate():
+            yield self._inputs(tmp_data_directory, 1)[0]
+            raise ValueError("Bad input.")
+
+        with pytest.raises(ValueError, match="Bad input."):
+            asyncio.run(client.wait_for_download_async(generate()))
+
+
+class TestConsumer:
+
+    @pytest.fixture
+    def mock_bodies(self, monkeypatch):
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(
+            lambda link, *args, **kwargs: AsyncMockResponse(content=link.encode())))
+
+    @staticmethod
+    def _inputs(n):
+        return [("https://a.com/{0}".format(i), i) for i in range(n)]
+
+    @pytest.mark.parametrize("asynchronous", [True, False])
+    def test_consumer(self, mock_user_agent, mock_bodies, tmp_data_directory, asynchronous):
+        client = NetworkClient(user_agent=mock_user_agent, chunk_size=4)
+        received = {}
+        if asynchronous:
+            async def consumer(key, body):
+                received[key] = body
+        else:
+            def consumer(key, body):
+                received[key] = body
+        report = asyncio.run(client.wait_for_download_async(self._inputs(5), consumer=consumer))
+        assert report.requests == 5
+        assert received == {i: "https://a.com/{0}".format(i).encode() for i in range(5)}
+
+    def test_consumer_error_recorded(self, mock_user_agent, mock_bodies):
+        client = NetworkClient(user_agent=mock_user_agent)
+
+        def consumer(key, body):
+            if key == 1:
+                raise ValueError("Cannot parse.")
+
+        with pytest.warns(UserWarning, match="1 of 3 downloads failed"):
+            report = asyncio.run(client.wait_for_download_async(self._inputs(3),
+                                                                consumer=consumer))
+        assert report.failed_inputs == [("https://a.com/1", 1)]
+        assert isinstance(report.failures[0].error, ValueError)
+
+    def test_consumer_with_compression(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent)
+        with pytest.raises(ValueError):
+            asyncio.run(client.wait_for_download_async([], compression="gzip",
+                                                       consumer=print))
+
+    def test_iter_downloads_async(self, mock_user_agent, mock_bodies):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=2)
+
+        async def collect():
+            return [item async for item in client.iter_downloads_async(self._inputs(20),
+                                                                       max_pending=1)]
+
+        assert sorted(asyncio.run(collect())) == [
+            (i, "https://a.com/{0}".format(i).encode()) for i in range(20)]
+
+    def test_iter_downloads_async_backpressure(self, mock_user_agent, mock_bodies):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=2)
+        pulled = []
+
+        def generate():
+            for item in self._inputs(50):
+                pulled.append(item)
+                yield item
+
+        async def take_one():
+            downloads = client.iter_downloads_async(generate(), max_pending=1)
+            first = await downloads.__anext__()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            await downloads.aclose()
+            return first
+
+        assert asyncio.run(take_one())[0] == 0
+        assert len(pulled) < 50  # downloads paused and stopped once iteration stopped
+
+
+class EchoTransport(HTTPTransport):
+    """Transport answering every URL with itself, tracking concurrent requests."""
+
+    def __init__(self, fail=(), delay=0):
+        super().__init__()
+        self.fail = fail
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, client, url, params=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if url.endswith(self.fail):
+                raise requests.ConnectionError("Connection refused.")
+            return MockResponse(content="{0} {1}".format(url, params).encode())
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    async def get_async(self, client, url, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self.get(client, url, **kwargs)
+
+
+class TestGetMany:
+
+    @pytest.fixture(autouse=True)
+    def real_get_response(self, monkeypatch):
+        # Other tests mock get_response for the whole session
+        monkeypatch.setattr(NetworkClient, "get_response", REAL_GET_RESPONSE)
+
+    def test_get_many(self, mock_user_agent):
+        transport = EchoTransport(delay=0.25)
+        client = NetworkClient(user_agent=mock_user_agent, rate_limit=10, concurrency=4,
+                               transport=transport)
+        start = time.monotonic()
+        results = list(client.get_many(("path/{0}".format(i) for i in range(10)),
+                                       params={"a": 1}))
+        assert time.monotonic() - start >= 0.85  # 10 requests at 10 per second
+        assert sorted(r.path for r in results) == sorted("path/{0}".format(i)
+                                                         for i in range(10))
+        assert all(r.ok and r.params == {"a": 1} for r in results)
+        assert results[0].response.text == "https://www.sec.gov/{0} {{'a': 1}}".format(
+            results[0].path)
+        assert transport.max_active > 1
+
+    def test_get_many_per_item_params(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent, transport=EchoTransport())
+        results = list(client.get_many([("a", {"CIK": "1"}), "b"], params={"CIK": "2"}))
+        assert {r.path: r.params for r in results} == {"a": {"CIK": "1"}, "b": {"CIK": "2"}}
+
+    def test_get_many_errors_reported(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent, transport=EchoTransport(fail="bad"))
+        results = {r.path: r for r in client.get_many(["good", "bad", "fine"])}
+        assert results["good"].ok and results["fine"].ok
+        assert not results["bad"].ok
+        assert isinstance(results["bad"].error, requests.ConnectionError)
+        assert results["bad"].response is None
+
+    def test_get_many_stops_early(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent, concurrency=2,
+                               transport=EchoTransport())
+        pulled = []
+
+        def generate():
+            for i in range(100):
+                pulled.append(i)
+                yield str(i)
+
+        results = client.get_many(generate())
+        next(results)
+        results.close()
+        assert len(pulled) <= 2 * 2 + 1
+
+
+class TestSingleFlight:
+
+    @pytest.fixture(autouse=True)
+    def real_get_response(self, monkeypatch):
+        monkeypatch.setattr(NetworkClient, "get_response", REAL_GET_RESPONSE)
+
+    def test_concurrent_requests_coalesced(self, mock_user_agent):
+        transport = EchoTransport(delay=0.2)
+        client = NetworkClient(user_agent=mock_user_agent, memo_ttl=0, transport=transport)
+        responses = []
+        threads = [threading.Thread(
+            target=lambda: responses.append(client.get_response("path", {"a": "1"})))
+            for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert transport.calls == 1
+        assert len(responses) == 5 and all(r is responses[0] for r in responses)
+        assert client.metrics.coalesced == {"other": 4}
+        client.get_response("path", {"a": "1"})
+        assert transport.calls == 2  # nothing in flight and nothing remembered
+
+    def test_memo(self, mock_user_agent, monkeypatch):
+        transport = EchoTransport()
+        client = NetworkClient(user_agent=mock_user_agent, memo_ttl=1, transport=transport)
+        first = client.get_response("path")
+        assert client.get_response("path") is first
+        assert client.get_response("path", {"a": "1"}) is not first
+        assert transport.calls == 2
+        now = time.monotonic()
+        monkeypatch.setattr(client._single_flight, "_clock", lambda: now + 2)
+        client.get_response("path")
+        assert transport.calls == 3
+
+    def test_no_memo_by_default(self, mock_user_agent):
+        transport = EchoTransport()
+        client = NetworkClient(user_agent=mock_user_agent, transport=transport)
+        assert client.get_response("path") is not client.get_response("path")
+        assert transport.calls == 2
+
+    def test_streamed_requests_not_coalesced(self, mock_user_agent):
+        transport = EchoTransport(delay=0.2)
+        client = NetworkClient(user_agent=mock_user_agent, transport=transport)
+        threads = [threading.Thread(target=lambda: client.get_response("path", stream=True))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert transport.calls == 3
+        assert client.metrics.coalesced == {}
+
+    def test_errors_shared_not_remembered(self, mock_user_agent):
+        transport = EchoTransport(fail="bad", delay=0.2)
+        client = NetworkClient(user_agent=mock_user_agent, retry_count=0, transport=transport)
+        errors = []
+
+        def get():
+            try:
+                client.get_response("bad")
+            except requests.ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=get) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 3 and transport.calls == 1
+        with pytest.raises(requests.ConnectionError):
+            client.get_response("bad")
+        assert transport.calls == 2
+
+    def test_unhashable_params_not_coalesced(self, mock_user_agent):
+        transport = EchoTransport()
+        client = NetworkClient(user_agent=mock_user_agent, transport=transport)
+        client.get_response("path", {"type": ["10-K", "10-Q"]})
+        client.get_response("path", {"type": ["10-K", "10-Q"]})
+        assert transport.calls == 2
+
+    def test_async_requests_coalesced(self, mock_user_agent):
+        transport = EchoTransport(delay=0.1)
+        client = NetworkClient(user_agent=mock_user_agent, memo_ttl=0, transport=transport)
+
+        async def get_all():
+            async with AsyncNetworkClient.from_client(client) as async_client:
+                return await asyncio.gather(*[async_client.get_response("path")
+                                              for _ in range(3)])
+
+        responses = asyncio.run(get_all())
+        assert transport.calls == 1
+        assert all(r is responses[0] for r in responses)
+        assert client.metrics.coalesced == {"other": 2}
+
+
+class TestBandwidth:
+
+    def test_download_limited(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(
+            lambda *args, **kwargs: AsyncMockResponse(content=b"x" * 20000)))
+        client = NetworkClient(user_agent=mock_user_agent, chunk_size=1000, bandwidth=40000)
+        inputs = [("https://a.com/{0}".format(i), os.path.join(tmp_data_directory, str(i)))
+                  for i in range(2)]
+        start = time.monotonic()
+        asyncio.run(client.wait_for_download_async(inputs))
+        assert time.monotonic() - start >= 0.9  # 40000 bytes at 40000 bytes per second
+
+    def test_get_response_limited(self, mock_user_agent, monkeypatch):
+        monkeypatch.setattr(NetworkClient, "get_response", REAL_GET_RESPONSE)
+        client = NetworkClient(user_agent=mock_user_agent, bandwidth=1000,
+                               transport=EchoTransport())
+        taken = []
+        monkeypatch.setattr(client.bandwidth_limiter, "acquire", taken.append)
+        responses = [client.get_response("path/{0}".format(i)) for i in range(3)]
+        assert taken == [len(r.content) for r in responses]
+
+    def test_adjust_live(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent)
+        assert client.bandwidth is None and client.bandwidth_limiter is None
+        client.bandwidth = 10 ** 6
+        limiter = client.bandwidth_limiter
+        assert limiter.rate == 10 ** 6 and limiter.burst == client.chunk_size
+        client.bandwidth = 10 ** 5
+        assert client.bandwidth_limiter is limiter and limiter.rate == 10 ** 5
+        client.bandwidth = None
+        assert client.bandwidth_limiter is None
+
+    def test_bad_bandwidth(self, mock_user_agent):
+        with pytest.raises(ValueError):
+            NetworkClient(user_agent=mock_user_agent, bandwidth=0)
+
+    def test_shared_limiter(self, mock_user_agent, tmp_data_directory):
+        limiter = FileRateLimiter(os.path.join(tmp_data_directory, "bandwidth.lock"), rate=10)
+        client = NetworkClient(user_agent=mock_user_agent, bandwidth_limiter=limiter)
+        assert client.bandwidth == 10
+        assert AsyncNetworkClient.from_client(client).bandwidth_limiter is limiter
+
+
+def mock_async_responses(monkeypatch, responses):
+    """Make ``AsyncNetworkClient`` return (or raise) given responses in order."""
+    calls = []
+
+    async def mock_get_async(self, url, **kwargs):
+        calls.append((url, kwargs))
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(AsyncNetworkClient, "_get_async", mock_get_async)
+    return calls
+
+
+class TestAsyncNetworkClient:
+
+    def test_get_response(self, mock_user_agent, monkeypatch):
+        calls = mock_async_responses(monkeypatch, [MockResponse(content=b"<a>ok</a>")])
+        client = AsyncNetworkClient(user_agent=mock_user_agent)
+        response = asyncio.run(client.get_response("path", {"CIK": "1"}))
+        assert response.text == "<a>ok</a>"
+        url, kwargs = calls[0]
+        assert url == "https://www.sec.gov/path"
+        assert kwargs["params"] == {"CIK": "1"}
+        assert kwargs["headers"]["User-Agent"] == mock_user_agent
+
+    def test_get_soup(self, mock_user_agent, monkeypatch):
+        mock_async_responses(monkeypatch, [MockResponse(content=b"<a>ok</a>")])
+        client = AsyncNetworkClient(user_agent=mock_user_agent)
+        assert asyncio.run(client.get_soup("path", {})).find("a").string == "ok"
+
+    def test_response_validated(self, mock_user_agent, monkeypatch):
+        mock_async_responses(monkeypatch,
+                             [MockResponse(datapath_args=["CIK", "cik_not_found.html"])])
+        client = AsyncNetworkClient(user_agent=mock_user_agent)
+        with pytest.raises(EDGARQueryError):
+            asyncio.run(client.get_response("path"))
+
+    def test_throttled_request_retried(self, mock_user_agent, monkeypatch):
+        throttled = MockResponse(content=b"", status_code=429)
+        throttled.headers["Retry-After"] = "0"
+        calls = mock_async_responses(monkeypatch, [throttled, MockResponse(content=b"ok")])
+        client = AsyncNetworkClient(user_agent=mock_user_agent)
+        assert asyncio.run(client.get_response("path")).status_code == 200
+        assert len(calls) == 2
+        assert client.rate_controller.throttles == 1
+
+    def test_connection_errors_retried(self, mock_user_agent, monkeypatch):
+        client = AsyncNetworkClient(user_agent=mock_user_agent, retry_count=1, memo_ttl=0)
+        mock_async_responses(monkeypatch, [aiohttp.ClientConnectionError(),
+                                           MockResponse(content=b"ok")])
+        assert asyncio.run(client.get_response("path")).status_code == 200
+        mock_async_responses(monkeypatch, [aiohttp.ClientConnectionError()] * 2)
+        with pytest.raises(aiohttp.ClientConnectionError):
+            asyncio.run(client.get_response("path"))
+
+    def test_cached_response(self, mock_user_agent, tmp_data_directory, monkeypatch):
+        cache = HTTPCache(os.path.join(tmp_data_directory, "async_cache"), default_ttl=60)
+        calls = mock_async_responses(monkeypatch, [MockResponse(content=b"ok")])
+        client = AsyncNetworkClient(user_agent=mock_user_agent, cache=cache, memo_ttl=0)
+
+        async def get_twice():
+            first = await client.get_response("path", {"a": "b"})
+            second = await client.get_response("path", {"a": "b"})
+            return first, second
+
+        first, second = asyncio.run(get_twice())
+        assert first.content == second.content == b"ok"
+        assert len(calls) == 1
+        assert calls[0][0] == "https://www.sec.gov/path?a=b"
+        assert cache.stats["hits"] == 1
+
+    def test_from_client_shares_rate_limit(self, mock_user_agent, tmp_data_directory):
+        cache = HTTPCache(os.path.join(tmp_data_directory, "shared_cache"))
+        client = NetworkClient(user_agent=mock_user_agent, rate_limit=5, retry_count=1,
+                               cache=cache)
+        async_client = AsyncNetworkClient.from_client(client)
+        assert async_client.limiter is client.limiter
+        assert async_client.rate_controller is client.rate_controller
+        assert async_client.cache is cache
+        assert async_client.rate_limit == 5
+        assert async_client.retry_count == 1
+
+    def test_context_manager_closes_session(self, mock_user_agent):
+        async def run():
+            async with AsyncNetworkClient(user_agent=mock_user_agent) as client:
+                session = client._get_async_session()
+                assert client._get_async_session() is session
+            return session
+
+        assert asyncio.run(run()).closed
+
+
+class TestDiskWriter:
+
+    def test_directories_created_once(self, tmp_data_directory, monkeypatch):
+        calls = []
+        monkeypatch.setattr("secedgar.client.make_path",
+                            lambda path, **kwargs: calls.append(path))
+        writer = _DiskWriter(max_workers=2)
+
+        async def make_dirs():
+            for _ in range(3):
+                await writer.make_dirs(tmp_data_directory)
+
+        asyncio.run(make_dirs())
+        writer.shutdown()
+        assert calls == [tmp_data_directory]
+
+    def test_writes_happen_off_event_loop(self, tmp_data_directory, monkeypatch):
+        threads = set()
+        writer = _DiskWriter(max_workers=1)
+        original_run = writer.run
+
+        async def recording_run(fn, *args):
+            def record(*a):
+                threads.add(threading.get_ident())
+                return fn(*a)
+            return await original_run(record, *args)
+
+        monkeypatch.setattr(writer, "run", recording_run)
+
+        async def chunks():
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+
+        path = os.path.join(tmp_data_directory, "off_loop", "file.txt")
+        asyncio.run(writer.write_stream(chunks(), path))
+        writer.shutdown()
+        assert threading.get_ident() not in threads
+        with open(path, "rb") as f:
+            assert f.read() == b"abc"
+
+
+class TestResumableDownloads:
+
+    @staticmethod
+    def _write_partial(path, content, meta):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".part", "wb") as f:
+            f.write(content)
+        with open(path + ".part.json", "w") as f:
+            json.dump(meta, f)
+
+    def test_partial_download_resumed_with_range(self, client, tmp_data_directory,
+                                                 monkeypatch):
+        path = os.path.join(tmp_data_directory, "resume", "filing.txt")
+        self._write_partial(path, b"abc", {"url": "https://google.com", "etag": '"v1"'})
+        sent_headers = []
+
+        def mock_request(link, session, headers=None):
+            sent_headers.append(headers)
+            response = AsyncMockResponse(content=b"def", status_code=206)
+            response.headers["ETag"] = '"v1"'
+            return response
+
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(mock_request))
+        asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert sent_headers == [{"Range": "bytes=3-", "If-Range": '"v1"'}]
+        with open(path, "rb") as f:
+            assert f.read() == b"abcdef"
+        assert not os.path.exists(path + ".part")
+        assert not os.path.exists(path + ".part.json")
+
+    def test_changed_file_fetched_in_full(self, client, tmp_data_directory, monkeypatch):
+        path = os.path.join(tmp_data_directory, "changed", "filing.txt")
+        self._write_partial(path, b"abc", {"url": "https://google.com", "etag": '"v1"'})
+        monkeypatch.setattr(NetworkClient, "_request_async",
+                            lambda *args, **kwargs: AsyncMockResponse(content=b"new content"))
+        asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        with open(path, "rb") as f:
+            assert f.read() == b"new content"
+
+    def test_partial_without_validator_not_resumed(self, client, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "no_validator", "filing.txt")
+        self._write_partial(path, b"abc", {"url": "https://google.com"})
+        writer = _DiskWriter(max_workers=1)
+        assert writer.resume_headers("https://google.com", path) == {}
+        writer.shutdown()
+
+    def test_interrupted_download_kept_for_resume(self, client, tmp_data_directory,
+                                                  monkeypatch):
+        class InterruptedStream:
+            async def iter_chunked(self, n):
+                yield b"abc"
+                raise aiohttp.ClientPayloadError("Connection lost")
+
+        class InterruptedResponse(AsyncMockResponse):
+            @property
+            def content(self):
+                return InterruptedStream()
+
+        def mock_request(*args, **kwargs):
+            response = InterruptedResponse(content=b"")
+            response.headers["Last-Modified"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+            return response
+
+        monkeypatch.setattr(NetworkClient, "_request_async", mock_request)
+        path = os.path.join(tmp_data_directory, "interrupted", "filing.txt")
+        with pytest.warns(UserWarning):
+            report = asyncio.run(client.wait_for_download_async([("https://google.com", path)]))
+        assert isinstance(report.failures[0].error, aiohttp.ClientPayloadError)
+        assert not os.path.exists(path)
+        with open(path + ".part", "rb") as f:
+            assert f.read() == b"abc"
+        writer = _DiskWriter(max_workers=1)
+        assert writer.resume_headers("https://google.com", path) == {
+            "Range": "bytes=3-", "If-Range": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        writer.shutdown()
@@ -0,0 +1,134 @@
+from datetime import date
+
+import pytest
+
+from secedgar.core.combo import ComboFilings
+from secedgar.core.filing_types import FilingType
+from secedgar.core.filings import filings
+from secedgar.filters import (CIK, All, Any, CompanyName, DateRange, FormType, Not,
+                              Predicate, as_filter)
+from secedgar.idx import ColumnarIndex, FilingEntry, parse_idx
+from secedgar.tests.test_idx import IDX
+
+
+def entry(cik="1", company_name="A CORP", form_type="10-K", date_filed="2020-11-13"):
+    return FilingEntry(cik, company_name, form_type, date_filed, "edgar/data/1/1.txt")
+
+
+class TestFilters:
+
+    @pytest.mark.parametrize("entry_filter,kept", [
+        (FormType("10-k"), True),
+        (FormType(FilingType.FILING_10K), True),
+        (FormType("10-Q"), False),
+        (CIK("0000000001", 2), True),
+        (CIK(2), False),
+        (DateRange(start=date(2020, 11, 13)), True),
+        (DateRange(start="2020-11-14"), False),
+        (DateRange(end="20201113"), True),
+        (CompanyName("^a "), True),
+        (CompanyName("INC$"), False),
+        (FormType("10-K") & CIK(2), False),
+        (FormType("10-Q") | CIK(1), True),
+        (~FormType("10-K"), False),
+        (FormType("10-K") & (lambda e: e.company_name == "A CORP"), True),
+        ((lambda e: False) | CIK(1), True),
+        (Not(lambda e: True), False),
+        (All(), True),
+        (Any(), False),
+    ])
+    def test_call(self, entry_filter, kept):
+        assert entry_filter(entry()) is kept
+
+    def test_amendments(self):
+        entry_filter = FormType("10-K", amendments=True)
+        assert entry_filter(entry(form_type="10-K/A"))
+        assert not FormType("10-K")(entry(form_type="10-K/A"))
+
+    def test_daily_dates(self):
+        assert DateRange(start="2020-11-13", end="2020-11-13")(entry(date_filed="20201113"))
+        assert not DateRange(end=date(2020, 11, 12))(entry(date_filed="20201113"))
+
+    def test_combinations_flattened_and_ordered(self):
+        entry_filter = (CompanyName("A") & CIK(1)) & (FormType("4") & (lambda e: True))
+        assert isinstance(entry_filter, All)
+        assert [type(f) for f in entry_filter.filters] == [CIK, FormType, CompanyName,
+                                                           Predicate]
+
+    def test_split(self):
+        fn = lambda e: True  # noqa: E731
+        pushed, rest = (FormType("4") & CIK(1) & fn).split()
+        assert pushed.pushable and rest.filters[0].fn is fn
+        assert (FormType("4") | fn).split()[0] is None
+        cik = CIK(1)
+        assert cik.split() == (cik, None)
+
+    def test_compile_opaque(self):
+        with pytest.raises(TypeError):
+            (CIK(1) & (lambda e: True)).compile()
+
+    def test_as_filter(self):
+        assert isinstance(as_filter(lambda e: True), Predicate)
+        with pytest.raises(TypeError):
+            as_filter("10-K")
+
+    def test_bounds(self):
+        bounds = (FormType("4", "10-K") & DateRange(start="2020-01-01")
+                  & (CIK(1) | CIK(2)) & DateRange(end=date(2020, 3, 31))).bounds()
+        assert bounds.form_types == {"4", "10-K"}
+        assert bounds.ciks == {"1", "2"}
+        assert (bounds.start_date, bounds.end_date) == ("2020-01-01", "2020-03-31")
+        assert (FormType("4") | CompanyName("A")).bounds().form_types is None
+        assert (FormType("4") & ~FormType("10-K")).bounds().form_types == {"4"}
+
+
+class TestPushdown:
+
+    def test_parse_idx(self):
+        seen = []
+
+        def fn(e):
+            seen.append(e.form_type)
+            return True
+
+        filings_dict = parse_idx(IDX, entry_filter=FormType("10-Q", "4") & fn)
+        # Entries failing the pushed down filter are never created
+        assert seen == ["10-Q", "4"]
+        assert [e.num_previously_valid for e in filings_dict["1000045"]] == [0, 1]
+
+    def test_parse_idx_matches_function(self):
+        entry_filter = CIK(1000045) | CompanyName("kingdon")
+        expected = parse_idx(IDX, entry_filter=lambda e: entry_filter(e))
+        assert parse_idx(IDX, entry_filter=entry_filter) == expected
+
+    def test_columnar_mask(self):
+        pytest.importorskip("numpy")
+        index = ColumnarIndex.from_idx(IDX)
+        entry_filter = (FormType("10-q", "13F-HR") & ~CompanyName("kingdon")) | (
+            DateRange(start="2020-11-14") | (lambda e: e.form_type == "4"))
+        expected = [bool(entry_filter(e)) for e in index]
+        assert entry_filter.mask(index).tolist() == expected == [True, False, True]
+        assert len(index.filter(where=CIK(1000097))) == 1
+
+    def test_combo_skips_idx_files_out_of_bounds(self, mock_user_agent):
+        combo = ComboFilings(date(2020, 1, 1), date(2020, 12, 31), user_agent=mock_user_agent,
+                             entry_filter=FormType("4") & DateRange(start=date(2020, 5, 1),
+                                                                    end=date(2020, 5, 1)))
+        assert [q.quarter for q in combo._quarterly_filings()] == [2]
+        combo = ComboFilings(date(2020, 12, 10), date(2020, 12, 15), user_agent=mock_user_agent,
+                             entry_filter=DateRange(end="2020-12-11"))
+        assert [d.date.day for d in combo._daily_filings()] == [10, 11]
+
+    def test_combo_partial_quarter(self, mock_user_agent):
+        combo = ComboFilings(date(2020, 1, 1), date(2020, 5, 30), user_agent=mock_user_agent,
+                             entry_filter=FormType("4"))
+        _, second = combo._quarterly_filings()
+        assert second.entry_filter(entry(form_type="4", date_filed="2020-05-30"))
+        assert not second.entry_filter(entry(form_type="4", date_filed="2020-05-31"))
+
+    def test_filings_filing_type(self, mock_user_agent):
+        daily = filings(start_date=date(2020, 1, 3), end_date=date(2020, 1, 3),
+                        filing_type=FilingType.FILING_4, user_agent=mock_user_agent,
+                        entry_filter=CompanyName("A"))
+        assert daily.entry_filter(entry(form_type="4"))
+        assert not daily.entry_filter(entry(form_type="10-K"))
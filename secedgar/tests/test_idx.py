@@ -0,0 +1,181 @@
+import gc
+import pickle
+from datetime import date
+
+import pytest
+
+from secedgar.idx import (ColumnarIndex, FilingEntry, _EntryParser, iter_entries, iter_lines,
+                          parse_idx)
+
+IDX = """Description:           Master Index of EDGAR Dissemination Feed
+Last Data Received:    November 13, 2020
+Comments:              webmaster@sec.gov
+Anonymous FTP:         ftp://ftp.sec.gov/edgar/
+
+CIK|Company Name|Form Type|Date Filed|Filename
+--------------------------------------------------------------------------------
+1000045|NICHOLAS FINANCIAL INC|10-Q|2020-11-13|edgar/data/1000045/0001564590-20-053019.txt
+1000097|KINGDON CAPITAL MANAGEMENT|13F-HR|2020-11-13|edgar/data/1000097/0001000097-20-000009.txt
+1000045|NICHOLAS FINANCIAL INC|4|2020-11-13|edgar/data/1000045/0001000045-20-000020.txt
+"""
+
+
+class TestFilingEntry:
+
+    def test_fields(self):
+        entry = FilingEntry("1000045", "NICHOLAS FINANCIAL INC", "10-Q", "2020-11-13",
+                            "edgar/data/1000045/0001564590-20-053019.txt")
+        assert entry.path == "Archives/edgar/data/1000045/0001564590-20-053019.txt"
+        assert entry._asdict()["path"] == entry.path
+        assert list(entry) == ["1000045", "NICHOLAS FINANCIAL INC", "10-Q", "2020-11-13",
+                               entry.file_name, entry.path, 0]
+        assert "form_type='10-Q'" in repr(entry)
+        assert not hasattr(entry, "__dict__")
+
+    def test_tuple_interface(self):
+        entry = FilingEntry("1", "A", "4", "2020-11-13", "edgar/data/1/1.txt", 3)
+        assert len(entry) == 7
+        assert entry[2] == "4"
+        assert entry[5] == "Archives/edgar/data/1/1.txt"
+        assert entry[-1] == 3
+        assert entry[:2] == ("1", "A")
+        cik, _, form_type, *_ = entry
+        assert (cik, form_type) == ("1", "4")
+        with pytest.raises(IndexError):
+            entry[7]
+        other = entry._replace(form_type="8-K", file_name="edgar/data/1/2.txt")
+        assert (other.form_type, other.path) == ("8-K", "Archives/edgar/data/1/2.txt")
+        assert entry.form_type == "4"
+        with pytest.raises(ValueError):
+            entry._replace(path="Archives/other.txt")
+
+    def test_equality(self):
+        fields = ("1", "A", "4", "2020-11-13", "edgar/data/1/1.txt")
+        assert FilingEntry(*fields) == FilingEntry(*fields)
+        assert len({FilingEntry(*fields), FilingEntry(*fields)}) == 1
+        assert FilingEntry(*fields) != FilingEntry(*fields, num_previously_valid=1)
+        assert FilingEntry(*fields) != tuple(FilingEntry(*fields))
+
+    def test_pickle(self):
+        entry = FilingEntry("1", "A", "4", "2020-11-13", "edgar/data/1/1.txt", 3)
+        assert pickle.loads(pickle.dumps(entry)) == entry
+
+
+class TestParse:
+
+    @pytest.mark.parametrize("data", [IDX, IDX.encode(), IDX.replace("\n", "\r\n").encode()])
+    def test_parse(self, data):
+        filings = parse_idx(data)
+        assert list(filings) == ["1000045", "1000097"]
+        assert [e.form_type for e in filings["1000045"]] == ["10-Q", "4"]
+        assert [e.num_previously_valid for e in filings["1000045"]] == [0, 2]
+        assert filings["1000097"][0].file_name == \
+            "edgar/data/1000097/0001000097-20-000009.txt"
+
+    def test_entry_filter(self):
+        filings = parse_idx(IDX, entry_filter=lambda e: e.form_type != "13F-HR")
+        assert list(filings) == ["1000045"]
+        assert [e.num_previously_valid for e in filings["1000045"]] == [0, 1]
+
+    def test_gc_paused_while_parsing(self):
+        enabled = []
+        parse_idx(IDX, entry_filter=lambda e: enabled.append(gc.isenabled()) or True)
+        assert enabled == [False] * 3
+        assert gc.isenabled()
+
+    def test_values_shared(self):
+        entries = list(iter_entries(IDX.encode().splitlines()))
+        assert entries[0].cik is entries[2].cik
+        assert entries[0].date_filed is entries[1].date_filed
+
+    @pytest.mark.parametrize("line", [
+        "1000045|NICHOLAS FINANCIAL INC|10-Q|2020-11-13",  # no file name
+        "1000045|NICHOLAS FINANCIAL INC|10-Q|Nov 13|edgar/data/1000045/1.txt",
+        "CIK1|NICHOLAS FINANCIAL INC|10-Q|2020-11-13|edgar/data/1000045/1.txt",
+        "1000045||10-Q|2020-11-13|edgar/data/1000045/1.txt",
+    ])
+    def test_bad_lines_skipped(self, line):
+        assert list(iter_entries([line])) == []
+
+    def test_pipe_in_company_name(self):
+        entry, = iter_entries(["1|A|B CORP|4|2020-11-13|edgar/data/1/1.txt\n"])
+        assert entry.company_name == "A|B CORP"
+        assert entry.form_type == "4"
+
+    def test_latin_1(self):
+        entry, = iter_entries(["1|SOCI\xc9T\xc9|4|2020-11-13|edgar/data/1/1.txt\n"
+                               .encode("latin-1")])
+        assert entry.company_name == "SOCI\xc9T\xc9"
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 10000])
+    def test_parse_chunks(self, chunk_size):
+        data = IDX.replace("NICHOLAS", "NICHOL\xc4S").replace("\n", "\r\n").encode()
+        chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+        assert parse_idx(chunks) == parse_idx(data)
+
+    def test_iter_lines(self):
+        assert list(iter_lines(["a\nb", "c\n", "", "d"])) == ["a", "bc", "d"]
+        assert list(iter_lines([b"a\r", b"\nb\n"])) == [b"a\r", b"b"]
+
+    def test_entries_parsed_as_chunks_arrive(self):
+        data = IDX.encode()
+        first_entry = data.index(b"\n1000045") + 1
+        parser = _EntryParser(lambda e: e.form_type != "13F-HR")
+        assert parser.feed(data[:first_entry + 10]) == []
+        entry, = parser.feed(data[first_entry + 10:data.index(b"\n", first_entry) + 1])
+        assert entry.form_type == "10-Q"
+        rest = parser.feed(data[data.index(b"\n", first_entry) + 1:-1]) + parser.close()
+        assert [e.num_previously_valid for e in rest] == [1]
+
+
+class TestColumnarIndex:
+
+    @pytest.fixture
+    def index(self):
+        pytest.importorskip("numpy")
+        return ColumnarIndex.from_idx(IDX.encode())
+
+    def test_columns(self, index):
+        assert len(index) == 3
+        assert index.cik.tolist() == [1000045, 1000097, 1000045]
+        assert index.form_types[index.form_type_codes].tolist() == ["10-Q", "13F-HR", "4"]
+        assert len(index.company_names) == 2
+        assert str(index.date_filed[0]) == "2020-11-13"
+        assert index.accession_number.tolist()[0] == "0001564590-20-053019"
+
+    def test_round_trip(self, index):
+        entries = list(iter_entries(IDX.splitlines()))
+        assert [e.file_name for e in index] == [e.file_name for e in entries]
+        assert [e.path for e in ColumnarIndex.from_entries(entries)] == \
+            [e.path for e in entries]
+
+    @pytest.mark.parametrize("kwargs,expected", [
+        ({}, [0, 1, 2]),
+        ({"form_types": ["4", "10-K"]}, [2]),
+        ({"ciks": ["1000045"]}, [0, 2]),
+        ({"ciks": [1000097], "form_types": {"4"}}, []),
+        ({"start_date": date(2020, 11, 14)}, []),
+        ({"start_date": "2020-11-13", "end_date": date(2020, 11, 13)}, [0, 1, 2]),
+    ])
+    def test_filter(self, index, kwargs, expected):
+        assert index.mask(**kwargs).nonzero()[0].tolist() == expected
+        assert len(index.filter(**kwargs)) == len(expected)
+
+    def test_daily_dates(self):
+        pytest.importorskip("numpy")
+        index = ColumnarIndex.from_idx("1|A|4|20201113|edgar/data/1/1.txt\n")
+        assert next(iter(index)).date_filed == "2020-11-13"
+
+    def test_concat(self, index):
+        other = ColumnarIndex.from_idx("1|A|4|2020-11-16|edgar/data/1/1.txt\n")
+        joined = ColumnarIndex.concat([index, other])
+        assert len(joined) == 4
+        assert joined.form_types.tolist() == ["10-Q", "13F-HR", "4"]
+        assert [e.company_name for e in joined][-2:] == ["NICHOLAS FINANCIAL INC", "A"]
+        assert len(ColumnarIndex.concat([])) == 0
+
+    def test_to_pandas(self, index):
+        pytest.importorskip("pandas")
+        df = index.to_pandas()
+        assert df["form_type"].dtype == "category"
+        assert df["cik"].tolist() == index.cik.tolist()
@@ -0,0 +1,124 @@
+import os
+from datetime import date
+
+import pytest
+
+from secedgar import index_store
+from secedgar.client import NetworkClient
+from secedgar.core.combo import ComboFilings
+from secedgar.core.daily import DailyFilings
+from secedgar.core.quarterly import QuarterlyFilings
+from secedgar.exceptions import EDGARQueryError
+from secedgar.filters import CIK, FormType
+from secedgar.idx import parse_idx
+from secedgar.index_store import IndexStore
+from secedgar.tests.test_idx import IDX
+from secedgar.tests.utils import mock_idx_stream
+
+Q4 = "Archives/edgar/full-index/2020/QTR4/master.idx"
+DAILY = ("1000045|NICHOLAS FINANCIAL INC|8-K|20201113|edgar/data/1000045/1.txt\n"
+         "1000180|SANDISK CORP|4|20201113|edgar/data/1000180/2.txt\n")
+
+
+@pytest.fixture
+def store(tmp_data_directory, monkeypatch):
+    monkeypatch.setattr(index_store, "_today", lambda: date(2021, 2, 1))
+    with IndexStore(os.path.join(tmp_data_directory, "index.db")) as store:
+        yield store
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("index file fetched")
+    for cls in (QuarterlyFilings, DailyFilings):
+        monkeypatch.setattr(cls, "_iter_master_idx_file", fail)
+        monkeypatch.setattr(cls, "_iter_master_idx_file_async", fail)
+
+
+class TestIndexStore:
+
+    def test_load_idx(self, store):
+        assert store.load_idx(Q4, IDX.encode(), date(2020, 10, 1), date(2020, 12, 31)) == 3
+        # Loading an index file again replaces its entries
+        assert store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31)) == 3
+        assert store.sources() == [(Q4, "2020-10-01", "2020-12-31", True)]
+        assert store.filings_dict(date(2020, 10, 1), date(2020, 12, 31)) == parse_idx(IDX)
+
+    def test_covers(self, store):
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        store.load_idx("daily", DAILY, date(2021, 1, 4), date(2021, 1, 4), closed=False)
+        assert store.covers(date(2020, 11, 13), date(2020, 11, 13))
+        assert store.covers(date(2020, 10, 1), date(2020, 12, 31))
+        assert not store.covers(date(2020, 7, 1), date(2020, 12, 31))
+        assert not store.covers(date(2020, 10, 1), date(2021, 1, 4))
+        # Days after today are not filed on
+        assert store.covers(date(2021, 1, 4), date(2099, 1, 1)) is False
+        store.load_idx("daily", DAILY, date(2021, 1, 1), date(2021, 2, 1), closed=False)
+        assert store.covers(date(2020, 10, 1), date(2021, 3, 31))
+
+    def test_filings_dict_filtered(self, store):
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        store.load_idx("daily", DAILY, date(2020, 11, 13), date(2020, 11, 13), closed=False)
+        entry_filter = FormType("4", "8-K") & CIK(1000045, "1000180") & (lambda e: True)
+        filings = store.filings_dict(date(2020, 11, 1), date(2020, 11, 30), entry_filter)
+        assert [e.form_type for e in filings["1000045"]] == ["4", "8-K"]
+        assert [e.num_previously_valid for e in filings["1000045"]] == [0, 1]
+        assert filings["1000180"][0].date_filed == "20201113"
+        assert store.filings_dict(date(2020, 10, 1), date(2020, 10, 31)) == {}
+
+    def test_sync(self, store, mock_user_agent, monkeypatch):
+        def missing(filings):
+            raise EDGARQueryError()
+
+        def daily_idx(filings):
+            # No daily index on New Year's Day, and today's is not published yet
+            if filings.date in (date(2021, 1, 1), date(2021, 2, 1)):
+                raise EDGARQueryError()
+            return DAILY.encode()
+        monkeypatch.setattr(QuarterlyFilings, "_iter_master_idx_file", missing)
+        monkeypatch.setattr(DailyFilings, "_iter_master_idx_file", daily_idx)
+        fetched = store.sync(NetworkClient(user_agent=mock_user_agent), start=date(2021, 1, 1))
+        assert len(fetched) == 20  # weekdays from January 4 to 29
+        assert store.covers(date(2021, 1, 1), date(2021, 1, 31))
+        assert not store.covers(date(2021, 1, 1), date(2021, 2, 1))
+        assert not store.covers(date(2020, 12, 31), date(2021, 1, 31))
+        sources = {first_day: (name, closed) for name, first_day, _, closed in store.sources()}
+        assert sources["2021-01-01"] == (
+            "Archives/edgar/daily-index/2021/QTR1/master.20210101.idx", False)
+        assert sources["2021-01-02"][1]  # weekends never change
+        assert store.filings_dict(date(2021, 1, 1), date(2021, 1, 3)) == {}
+
+    def test_get_index(self, store):
+        pytest.importorskip("numpy")
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        index = store.get_index(date(2020, 10, 1), date(2020, 12, 31), where=FormType("4"))
+        assert index.cik.tolist() == [1000045]
+
+
+class TestFilingsFromStore:
+
+    def test_quarterly(self, store, no_network, mock_user_agent):
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        filings = QuarterlyFilings(2020, 4, user_agent=mock_user_agent, index_store=store,
+                                   entry_filter=FormType("10-Q"))
+        urls = filings.get_urls()
+        assert list(urls) == ["1000045"]
+        assert urls["1000045"][0].endswith("0001564590-20-053019.txt")
+
+    def test_daily(self, store, no_network, mock_user_agent):
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        filings = DailyFilings(date(2020, 11, 13), user_agent=mock_user_agent,
+                               index_store=store)
+        assert len(filings.get_filings_dict()) == 2
+
+    def test_not_covered(self, store, mock_user_agent, monkeypatch):
+        mock_idx_stream(monkeypatch, QuarterlyFilings, IDX.encode())
+        filings = QuarterlyFilings(2020, 3, user_agent=mock_user_agent, index_store=store)
+        assert len(filings.get_filings_dict()) == 2
+
+    def test_combo(self, store, no_network, mock_user_agent):
+        store.load_idx(Q4, IDX, date(2020, 10, 1), date(2020, 12, 31))
+        filings = ComboFilings(date(2020, 10, 5), date(2020, 12, 31),
+                               user_agent=mock_user_agent, index_store=store)
+        assert sum(map(len, filings.get_urls().values())) == 3
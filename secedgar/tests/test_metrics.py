@@ -0,0 +1,154 @@
+import asyncio
+import os
+
+import pytest
+import requests
+
+from secedgar.client import AsyncNetworkClient, NetworkClient
+from secedgar.metrics import ClientMetrics, Histogram, endpoint_class
+from secedgar.tests.utils import AsyncMockResponse, MockResponse
+from secedgar.transport import HTTPTransport
+
+BASE = "https://www.sec.gov/"
+FILING = BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+
+
+class SequenceTransport(HTTPTransport):
+    """Transport answering with the given statuses in turn."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+
+    def get(self, client, url, **kwargs):
+        return MockResponse(content=b"abc", status_code=self.statuses.pop(0))
+
+    async def get_async(self, client, url, **kwargs):
+        return self.get(client, url, **kwargs)
+
+
+@pytest.fixture
+def metrics():
+    metrics = ClientMetrics(buckets=(0.1, 1))
+    metrics.record_request(FILING, 200, 0.05, num_bytes=100)
+    metrics.record_request(FILING, 429, 0.5)
+    metrics.record_request(BASE + "cgi-bin/browse-edgar", None, 2)
+    metrics.record_retry(FILING)
+    metrics.record_coalesced(FILING)
+    metrics.record_limiter_wait(0.25)
+    metrics.record_limiter_wait(0)
+    return metrics
+
+
+class TestHistogram:
+
+    def test_observe(self):
+        histogram = Histogram(buckets=(1, 0.1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+        assert histogram.cumulative_counts() == [(0.1, 2), (1, 3), (float("inf"), 4)]
+        assert histogram.sum == pytest.approx(3.65)
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.99) == float("inf")
+
+    def test_empty_quantile(self):
+        assert Histogram().quantile(0.5) is None
+
+
+@pytest.mark.parametrize("url,expected", [
+    (BASE + "Archives/edgar/daily-index/2020/QTR4/", "daily_index"),
+    (BASE + "Archives/edgar/full-index/2020/QTR4/master.idx", "full_index"),
+    (BASE + "Archives/edgar/Feed/2020/QTR4/20201001.nc.tar.gz", "feed"),
+    (FILING, "filing"),
+    (BASE + "cgi-bin/browse-edgar", "browse_edgar"),
+    (BASE + "files/company_tickers.json", "company_tickers"),
+    ("https://data.sec.gov/submissions/CIK0000320193.json", "api"),
+    (BASE + "cgi-bin/srqsb", "other"),
+])
+def test_endpoint_class(url, expected):
+    assert endpoint_class(url) == expected
+
+
+class TestClientMetrics:
+
+    def test_python_api(self, metrics):
+        assert metrics.requests == {("filing", "200"): 1, ("filing", "429"): 1,
+                                    ("browse_edgar", "error"): 1}
+        assert metrics.bytes == {"filing": 100, "browse_edgar": 0}
+        assert metrics.retries == {"filing": 1}
+        assert metrics.coalesced == {"filing": 1}
+        assert metrics.latency["filing"].count == 2
+        assert metrics.limiter_wait == 0.25
+        assert metrics.limiter_acquisitions == 2
+        assert metrics.status_counts() == {"200": 1, "429": 1, "error": 1}
+
+    def test_reset(self, metrics):
+        metrics.reset()
+        assert metrics.requests == {}
+        assert metrics.limiter_acquisitions == 0
+
+    def test_to_prometheus(self, metrics):
+        text = metrics.to_prometheus()
+        assert "# TYPE secedgar_requests_total counter" in text
+        assert 'secedgar_requests_total{endpoint="filing",status="429"} 1' in text
+        assert 'secedgar_request_duration_seconds_bucket{endpoint="filing",le="0.1"} 1' in text
+        assert 'secedgar_request_duration_seconds_bucket{endpoint="filing",le="+Inf"} 2' in text
+        assert 'secedgar_request_duration_seconds_count{endpoint="filing"} 2' in text
+        assert 'secedgar_response_bytes_total{endpoint="filing"} 100' in text
+        assert 'secedgar_retries_total{endpoint="filing"} 1' in text
+        assert 'secedgar_coalesced_requests_total{endpoint="filing"} 1' in text
+        assert "secedgar_rate_limiter_wait_seconds_total 0.25" in text
+
+    def test_write_prometheus(self, metrics, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "secedgar.prom")
+        metrics.write_prometheus(path)
+        with open(path) as f:
+            assert f.read() == metrics.to_prometheus()
+        assert os.listdir(tmp_data_directory) == ["secedgar.prom"]
+
+    def test_serve_prometheus(self, metrics):
+        server = metrics.serve_prometheus()
+        try:
+            url = "http://127.0.0.1:{0}/".format(server.server_address[1])
+            response = requests.get(url + "metrics")
+            assert response.status_code == 200
+            assert response.text == metrics.to_prometheus()
+            assert requests.get(url + "other").status_code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestClientRecordsMetrics:
+
+    def test_get_response(self, mock_user_agent):
+        client = NetworkClient(user_agent=mock_user_agent, rate_limit=10,
+                               transport=SequenceTransport(429, 200))
+        response = client._send(FILING)
+        assert response.status_code == 200
+        assert client.metrics.requests == {("filing", "429"): 1, ("filing", "200"): 1}
+        assert client.metrics.bytes == {"filing": 6}
+        assert client.metrics.retries == {"filing": 1}
+        assert client.metrics.limiter_acquisitions == 2
+
+    def test_get_response_async(self, mock_user_agent):
+        client = AsyncNetworkClient(user_agent=mock_user_agent,
+                                    transport=SequenceTransport(503, 200))
+        asyncio.run(client._send_async(FILING))
+        assert client.metrics.status_counts() == {"503": 1, "200": 1}
+        assert client.metrics.retries == {"filing": 1}
+
+    def test_download(self, mock_user_agent, monkeypatch, tmp_data_directory):
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(
+            lambda *args, **kwargs: AsyncMockResponse(content=b"Testing...")))
+        client = NetworkClient(user_agent=mock_user_agent, chunk_size=4)
+        inputs = [(FILING, os.path.join(tmp_data_directory, "filing.txt"))]
+        asyncio.run(client.wait_for_download_async(inputs))
+        assert client.metrics.requests == {("filing", "200"): 1}
+        assert client.metrics.bytes == {"filing": 10}
+        assert client.metrics.limiter_acquisitions == 1
+
+    def test_shared_metrics(self, mock_user_agent):
+        metrics = ClientMetrics()
+        client = NetworkClient(user_agent=mock_user_agent, metrics=metrics)
+        assert client.metrics is metrics
+        assert AsyncNetworkClient.from_client(client).metrics is metrics
@@ -0,0 +1,158 @@
+import asyncio
+import email.utils
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secedgar.rate_limit import (AdaptiveRateController, FileRateLimiter, RateLimiter,
+                                 parse_retry_after)
+
+
+class TestRateLimiter:
+
+    @pytest.mark.parametrize("bad_rate", [0, -1, -0.5])
+    def test_bad_rate(self, bad_rate):
+        with pytest.raises(ValueError):
+            RateLimiter(rate=bad_rate)
+
+    def test_bad_burst(self):
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+    def test_first_request_does_not_wait(self):
+        assert RateLimiter(rate=1).reserve() == 0
+
+    def test_reservations_are_spaced_by_rate(self):
+        limiter = RateLimiter(rate=10)
+        delays = [limiter.reserve() for _ in range(5)]
+        assert delays[0] == 0
+        for expected, delay in zip([0.1, 0.2, 0.3, 0.4], delays[1:]):
+            assert delay == pytest.approx(expected, abs=0.01)
+
+    def test_burst_allows_immediate_requests(self):
+        limiter = RateLimiter(rate=10, burst=3)
+        assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+        assert limiter.reserve() > 0
+
+    def test_rate_can_be_changed(self):
+        limiter = RateLimiter(rate=1)
+        limiter.reserve()
+        limiter.rate = 100
+        assert limiter.reserve() < 0.02
+
+    def test_pause_delays_next_reservation(self):
+        limiter = RateLimiter(rate=10, burst=5)
+        limiter.pause(2)
+        assert limiter.reserve() == pytest.approx(2.1, abs=0.01)
+
+    def test_acquire_async_keeps_rate(self):
+        limiter = RateLimiter(rate=20)
+
+        async def run():
+            await asyncio.gather(*[limiter.acquire_async() for _ in range(11)])
+
+        start = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - start >= 0.45
+
+
+def _reserve_from_file(path):
+    return FileRateLimiter(path, rate=1).reserve()
+
+
+class TestFileRateLimiter:
+
+    def test_instances_share_bucket(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "shared.lock")
+        first = FileRateLimiter(path, rate=10)
+        second = FileRateLimiter(path, rate=10)
+        assert first.reserve() == 0
+        assert second.reserve() == pytest.approx(0.1, abs=0.01)
+        assert first.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_processes_share_bucket(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "processes.lock")
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            delays = sorted(pool.map(_reserve_from_file, [path] * 3))
+        assert delays[0] == 0
+        assert delays[-1] == pytest.approx(2, abs=0.5)
+
+    def test_path_property(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "property.lock")
+        assert FileRateLimiter(path, rate=1).path == path
+
+    def test_pause_shared(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "pause.lock")
+        FileRateLimiter(path, rate=10).pause(1)
+        assert FileRateLimiter(path, rate=10).reserve() == pytest.approx(1.1, abs=0.05)
+
+
+class TestAdaptiveRateController:
+
+    @pytest.mark.parametrize("value,expected", [
+        (None, None),
+        ("120", 120),
+        ("1.5", 1.5),
+        ("-3", 0),
+        ("soon", None),
+    ])
+    def test_parse_retry_after(self, value, expected):
+        assert parse_retry_after(value) == expected
+
+    def test_parse_retry_after_date(self):
+        value = email.utils.formatdate(time.time() + 60, usegmt=True)
+        assert parse_retry_after(value) == pytest.approx(60, abs=2)
+
+    def test_bad_decrease(self):
+        with pytest.raises(ValueError):
+            AdaptiveRateController(RateLimiter(rate=10), max_rate=10, decrease=1)
+
+    def test_throttle_decreases_rate_multiplicatively(self):
+        limiter = RateLimiter(rate=10)
+        controller = AdaptiveRateController(limiter, max_rate=10, min_rate=2)
+        controller.on_throttle()
+        assert limiter.rate == 5
+        controller.on_throttle()
+        controller.on_throttle()
+        assert limiter.rate == 2
+        assert controller.throttles == 3
+
+    def test_concurrent_throttles_decrease_rate_once(self):
+        limiter = RateLimiter(rate=10)
+        controller = AdaptiveRateController(limiter, max_rate=10)
+        sent = time.monotonic()
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            list(pool.map(lambda _: controller.on_throttle("1", sent=sent), range(10)))
+        assert controller.throttles == 10
+        assert limiter.rate == 5
+        # Pauses overlap instead of adding up
+        assert limiter.reserve() == pytest.approx(1.2, abs=0.05)
+        # Request sent after the decrease decreases the rate again
+        controller.on_throttle(sent=time.monotonic())
+        assert limiter.rate == 2.5
+
+    def test_success_increases_rate_additively(self):
+        limiter = RateLimiter(rate=10)
+        controller = AdaptiveRateController(limiter, max_rate=10, increase=1)
+        controller.on_throttle()
+        controller.on_success()
+        assert limiter.rate == 6
+        for _ in range(10):
+            controller.on_success()
+        assert limiter.rate == 10
+
+    def test_retry_after_pauses_limiter(self):
+        limiter = RateLimiter(rate=10)
+        controller = AdaptiveRateController(limiter, max_rate=10, max_pause=3)
+        assert controller.on_throttle("2") == 2
+        assert limiter.reserve() == pytest.approx(2.2, abs=0.01)
+        assert controller.on_throttle("600") == 3
+
+    @pytest.mark.parametrize("status,expected", [(429, True), (503, True), (200, False),
+                                                 (404, False)])
+    def test_is_throttled(self, status, expected):
+        controller = AdaptiveRateController(RateLimiter(rate=10), max_rate=10)
+        assert controller.is_throttled(status) is expected
@@ -0,0 +1,326 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import date
+
+import aiohttp
+import pytest
+import requests
+
+from secedgar import index_store
+from secedgar.cik_lookup import CIKLookup
+from secedgar.client import NetworkClient
+from secedgar.core import ComboFilings, CompanyFilings, DailyFilings, QuarterlyFilings
+from secedgar.exceptions import NoFilingsError
+from secedgar.index_store import IndexStore
+from secedgar.rate_limit import RateLimiter
+from secedgar.tests.benchmark import PARSERS, run_benchmark, run_parse_benchmark
+from secedgar.tests.simulator import EDGARSimulator
+
+# Other tests mock these for the whole session, so keep the real ones to restore
+REAL_ATTRIBUTES = {
+    (requests.Session, "get"): requests.Session.get,
+    (aiohttp.ClientSession, "get"): aiohttp.ClientSession.get,
+    (NetworkClient, "get_response"): vars(NetworkClient)["get_response"],
+    (NetworkClient, "_request_async"): vars(NetworkClient)["_request_async"],
+    (CIKLookup, "get_ciks"): vars(CIKLookup)["get_ciks"],
+    (QuarterlyFilings, "_iter_master_idx_file"): QuarterlyFilings._iter_master_idx_file,
+    (QuarterlyFilings, "_iter_master_idx_file_async"):
+        QuarterlyFilings._iter_master_idx_file_async,
+}
+
+
+@pytest.fixture
+def real_network(monkeypatch):
+    for (cls, name), attr in REAL_ATTRIBUTES.items():
+        monkeypatch.setattr(cls, name, attr)
+
+
+@pytest.fixture
+def simulator():
+    with EDGARSimulator(filings_per_day=20, companies=4, filings_per_company=15,
+                        filing_size=500, days_per_quarter=2) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def client(real_network, simulator, mock_user_agent):
+    return NetworkClient(user_agent=mock_user_agent, limiter=RateLimiter(rate=1000),
+                         transport=simulator.transport())
+
+
+def count_files(directory):
+    return sum(len(files) for _, _, files in os.walk(directory))
+
+
+class TestEDGARSimulator:
+
+    def test_daily_index(self, simulator):
+        listing = requests.get(simulator.url + "Archives/edgar/daily-index/2020/QTR4/")
+        assert "master.20201001.idx" in listing.text
+        assert "master.20201002.idx" in listing.text
+        assert "master.20201005.idx" not in listing.text  # only first two days
+        idx = requests.get(simulator.url
+                           + "Archives/edgar/daily-index/2020/QTR4/master.20201001.idx")
+        lines = [line for line in idx.text.splitlines() if line.startswith("10")]
+        assert len(lines) == 20
+        assert lines[0].endswith(".txt")
+
+    def test_weekend_has_no_idx(self, simulator):
+        url = simulator.url + "Archives/edgar/daily-index/2020/QTR4/master.20201003.idx"
+        assert requests.get(url).status_code == 404
+
+    def test_filing_supports_range(self, simulator):
+        url = simulator.url + "Archives/edgar/data/1000001/0001000001-20-275000.txt"
+        full = requests.get(url)
+        assert full.status_code == 200
+        assert len(full.content) == 500
+        partial = requests.get(url, headers={"Range": "bytes=100-",
+                                             "If-Range": full.headers["ETag"]})
+        assert partial.status_code == 206
+        assert partial.content == full.content[100:]
+
+    def test_browse_edgar_paginates(self, simulator):
+        url = simulator.url + "cgi-bin/browse-edgar"
+        params = {"action": "getcompany", "CIK": "1000002", "count": 10}
+        first = requests.get(url, params=dict(params, start=0))
+        second = requests.get(url, params=dict(params, start=10))
+        assert first.text.count("<filing>") == 10
+        assert second.text.count("<filing>") == 5
+
+    def test_json_apis(self, simulator):
+        tickers = requests.get(simulator.url + "files/company_tickers.json").json()
+        assert tickers["0"] == {"cik_str": 1000000, "ticker": "SIM0",
+                                "title": "Simulated Company 0"}
+        submissions = requests.get(simulator.url + "submissions/CIK0001000003.json").json()
+        assert len(submissions["filings"]["recent"]["accessionNumber"]) == 15
+        assert requests.get(simulator.url + "submissions/CIK0001000004.json").status_code == 404
+
+    @pytest.mark.parametrize("kwargs,status", [
+        ({"throttle_rate": 1, "retry_after": 3}, 429),
+        ({"error_rate": 1}, 500),
+    ])
+    def test_fault_injection(self, kwargs, status):
+        with EDGARSimulator(**kwargs) as simulator:
+            response = requests.get(simulator.url + "files/company_tickers.json")
+        assert response.status_code == status
+        if status == 429:
+            assert response.headers["Retry-After"] == "3"
+        assert simulator.stats.statuses[status] == 1
+
+    def test_latency(self):
+        with EDGARSimulator(latency=0.05) as simulator:
+            requests.get(simulator.url + "files/company_tickers.json")
+        assert simulator.stats.latency_percentile(99) >= 0.05
+
+    def test_bad_rates(self):
+        with pytest.raises(ValueError):
+            EDGARSimulator(error_rate=0.6, throttle_rate=0.6)
+
+
+class TestEndToEnd:
+
+    def test_daily_save(self, client, simulator, tmp_data_directory):
+        report = DailyFilings(date(2020, 10, 1), client=client).save(tmp_data_directory)
+        assert report.failures == []
+        assert count_files(tmp_data_directory) == 20
+        assert simulator.stats.statuses[200] == 22  # listing, idx and filings
+        assert sum(client.metrics.requests.values()) == 22
+        assert client.metrics.bytes["filing"] == 20 * 500
+
+    def test_daily_save_in_running_loop(self, client, tmp_data_directory):
+        async def save():  # e.g. called from a Jupyter cell
+            return DailyFilings(date(2020, 10, 1), client=client).save(tmp_data_directory)
+
+        assert asyncio.run(save()).failures == []
+        assert count_files(tmp_data_directory) == 20
+
+    def test_daily_save_no_filings(self, client, tmp_data_directory):
+        directory = os.path.join(tmp_data_directory, "none")
+        filings = DailyFilings(date(2020, 10, 1), client=client,
+                               entry_filter=lambda entry: False)
+        with pytest.raises(NoFilingsError):
+            filings.save(directory)
+        assert not os.path.exists(directory)
+
+    def test_save_filings_rejects_unknown_kwargs(self, client, tmp_data_directory):
+        filings = DailyFilings(date(2020, 10, 1), client=client)
+        with pytest.raises(TypeError):
+            filings._save_filings(tmp_data_directory, timeout=1)
+        assert count_files(tmp_data_directory) == 0
+
+    def test_daily_save_retries_faults(self, real_network, mock_user_agent,
+                                       tmp_data_directory):
+        with EDGARSimulator(filings_per_day=30, error_rate=0.2, retry_after=0,
+                            seed=1) as simulator:
+            client = NetworkClient(user_agent=mock_user_agent, retry_count=5,
+                                   limiter=RateLimiter(rate=1000),
+                                   transport=simulator.transport())
+            report = DailyFilings(date(2020, 10, 1), client=client).save(tmp_data_directory)
+        assert report.failures == []
+        assert count_files(tmp_data_directory) == 30
+        assert simulator.stats.statuses[500] > 0
+
+    def test_quarterly_save_download_all(self, client, tmp_data_directory):
+        filings = QuarterlyFilings(2020, 4, client=client)
+        report = filings.save(tmp_data_directory, download_all=True)
+        assert report.failures == []
+        assert count_files(tmp_data_directory) == 40
+
+    def test_download_all_resumes_tarball(self, client, simulator, tmp_data_directory):
+        tarball = simulator._tarball(date(2020, 10, 1))
+        link = "https://www.sec.gov/Archives/edgar/Feed/2020/QTR4/20201001.nc.tar.gz"
+        feed = os.path.join(tmp_data_directory, ".feed")
+        os.makedirs(feed)
+        # Left behind by an earlier run which was interrupted
+        part = os.path.join(feed, "20201001.nc.tar.gz.part")
+        with open(part, "wb") as f:
+            f.write(tarball[:len(tarball) // 2])
+        with open(part + ".json", "w") as f:
+            json.dump({"url": link, "etag": '"{0}"'.format(hashlib.md5(tarball).hexdigest()),
+                       "last_modified": None}, f)
+        filings = QuarterlyFilings(2020, 4, client=client)
+        report = filings.save(tmp_data_directory, download_all=True)
+        assert report.failures == []
+        assert simulator.stats.statuses[206] == 1
+        assert count_files(tmp_data_directory) == 40
+        assert not os.path.exists(feed)
+
+    def test_company_save(self, client, tmp_data_directory):
+        filings = CompanyFilings(["1000000", "1000001"], count=10, client=client)
+        report = filings.save(tmp_data_directory)
+        assert report.failures == []
+        assert count_files(tmp_data_directory) == 20
+
+    def test_daily_process(self, client, tmp_data_directory):
+        received = {}
+
+        def consumer(entry, content):
+            received[entry.file_name] = content
+
+        report = DailyFilings(date(2020, 10, 1), client=client).process(consumer)
+        assert report.failures == []
+        assert len(received) == 20
+        assert all(len(content) == 500 for content in received.values())
+
+    def test_company_iter_filings_async(self, client):
+        filings = CompanyFilings(["1000000", "1000001"], count=10, client=client)
+
+        async def collect():
+            return [item async for item in filings.iter_filings_async()]
+
+        items = asyncio.run(collect())
+        assert len(items) == 20
+        assert {entry.cik for entry, _ in items} == {"1000000", "1000001"}
+        assert all(content.startswith(b"<SEC-DOCUMENT>") for _, content in items)
+
+    def test_combo_process(self, client):
+        received = []
+        filings = ComboFilings(date(2020, 10, 1), date(2020, 10, 2), client=client)
+
+        async def consumer(entry, content):
+            received.append(entry)
+
+        assert filings.process(consumer).failures == []
+        assert len(received) == 40
+
+    @pytest.mark.parametrize("filings,requests_needed,total", [
+        # First page of first CIK
+        (lambda client: CompanyFilings(["1000000", "1000001"], count=10, client=client), 1, 20),
+        # Listing of daily indexes and idx file of first day
+        (lambda client: ComboFilings(date(2020, 10, 1), date(2020, 10, 2), client=client), 2,
+         40),
+    ])
+    def test_entries_produced_lazily(self, client, simulator, filings, requests_needed,
+                                     total):
+        filings = filings(client)
+
+        async def first_and_rest():
+            async with filings._async_client() as async_client:
+                entries = await filings._entries_async(async_client)
+                first = await entries.__anext__()
+                requests_made = simulator.stats.requests
+                return first, requests_made, [item async for item in entries]
+
+        first, requests_made, rest = asyncio.run(first_and_rest())
+        assert first[0].endswith(".txt")
+        assert requests_made == requests_needed
+        assert len(rest) + 1 == total
+
+    def test_combo_get_index(self, client):
+        pytest.importorskip("numpy")
+        filings = ComboFilings(date(2020, 10, 1), date(2020, 10, 2), client=client)
+        index = filings.get_index()
+        assert len(index) == 40
+        assert len(asyncio.run(filings.get_index_async())) == 40
+
+    @pytest.mark.parametrize("cache_idx", [False, True])
+    def test_iter_entries(self, client, simulator, cache_idx):
+        client.chunk_size = 100  # entries span chunks
+        filings = QuarterlyFilings(2020, 4, client=client, cache_idx=cache_idx)
+        entries = filings.iter_entries()
+        assert next(entries).file_name.startswith("edgar/data/")
+        assert len(list(entries)) == 39
+        assert (filings._master_idx_file is not None) == cache_idx
+        requests_made = simulator.stats.statuses[200]
+        assert sum(map(len, filings.get_filings_dict().values())) == 40
+        assert simulator.stats.statuses[200] == requests_made + (0 if cache_idx else 1)
+        assert client.metrics.bytes["full_index"] > 40 * 80
+
+    def test_iter_entries_async_retries_faults(self, real_network, mock_user_agent):
+        with EDGARSimulator(filings_per_day=30, error_rate=0.3, retry_after=0,
+                            seed=3) as simulator:
+            client = NetworkClient(user_agent=mock_user_agent, retry_count=8,
+                                   backoff_factor=0, limiter=RateLimiter(rate=1000),
+                                   transport=simulator.transport())
+            filings = DailyFilings(date(2020, 10, 1), client=client)
+
+            async def collect():
+                return [entry async for entry in filings.iter_entries_async()]
+
+            assert len(asyncio.run(collect())) == 30
+        assert simulator.stats.statuses[500] > 0
+
+    def test_index_store_sync(self, client, tmp_data_directory, monkeypatch):
+        monkeypatch.setattr(index_store, "_today", lambda: date(2020, 10, 2))
+        store = IndexStore(os.path.join(tmp_data_directory, "index.db"))
+        fetched = store.sync(client, start=date(2020, 4, 1))
+        assert fetched == ["Archives/edgar/full-index/2020/QTR2/master.idx",
+                           "Archives/edgar/full-index/2020/QTR3/master.idx",
+                           "Archives/edgar/full-index/2020/QTR4/master.idx",
+                           "Archives/edgar/daily-index/2020/QTR4/master.20201002.idx"]
+        # Quarter 3 ended less than a week ago, quarter 4 has not ended
+        assert [closed for _, _, _, closed in store.sources()] == [True, False, False, False]
+        assert store.covers(date(2020, 4, 1), date(2020, 12, 31))
+        monkeypatch.setattr(index_store, "_today", lambda: date(2021, 1, 4))
+        assert store.sync(client, start=date(2020, 4, 1)) == [
+            "Archives/edgar/full-index/2020/QTR3/master.idx",
+            "Archives/edgar/full-index/2020/QTR4/master.idx",
+            "Archives/edgar/full-index/2021/QTR1/master.idx",
+            "Archives/edgar/daily-index/2021/QTR1/master.20210104.idx"]
+        # Daily index is dropped once the full index of its quarter covers it
+        assert "daily-index/2020" not in str(store.sources())
+        filings = ComboFilings(date(2020, 9, 1), date(2020, 12, 31), client=client,
+                               index_store=store)
+        assert sum(map(len, filings.get_urls().values())) == 40
+        store.close()
+
+    def test_run_parse_benchmark(self):
+        results = run_parse_benchmark(lines=1000, repeat=1)
+        assert list(results) == list(PARSERS)
+        assert all(r["entries"] == 1000 for r in results.values())
+        assert results["regex"]["speedup"] == 1
+        assert results["parse_idx"]["peak"] < results["regex"]["peak"]
+
+    def test_run_benchmark(self, simulator):
+        result = run_benchmark("daily", simulator)
+        assert result["filings"] == 20
+        assert result["failures"] == 0
+        assert result["filings_per_second"] > 0
+        assert result["p50"] <= result["p99"]
+        assert result["requests"] == 22
+
+    def test_run_benchmark_bad_scenario(self, simulator):
+        with pytest.raises(ValueError):
+            run_benchmark("yearly", simulator)
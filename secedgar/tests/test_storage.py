@@ -0,0 +1,222 @@
+import asyncio
+import gzip
+import io
+import multiprocessing
+import os
+import zipfile
+
+import pytest
+
+from secedgar.client import NetworkClient
+from secedgar.storage import (FileSystemSink, ShardedFileSystemSink, SQLiteSink,
+                              StorageSink, ZipArchiveSink, compressed_path,
+                              open_compressed, open_filing, validate_compression)
+from secedgar.tests.utils import AsyncMockResponse
+
+BASE = "https://www.sec.gov/Archives/edgar/data/"
+
+
+def _store_and_crash(root, path):
+    """Store filing in a zip archive and exit without flushing the sink."""
+    ZipArchiveSink(root).store(path, io.BytesIO(b"other"))
+    os._exit(1)
+
+
+class TestCompression:
+
+    @pytest.mark.parametrize("compression,expected", [
+        (None, "filing.txt"),
+        ("gzip", "filing.txt.gz"),
+        ("zstd", "filing.txt.zst"),
+    ])
+    def test_compressed_path(self, compression, expected):
+        assert compressed_path("filing.txt", compression) == expected
+
+    @pytest.mark.parametrize("bad_compression", ["zip", "GZIP", 1])
+    def test_bad_compression(self, bad_compression):
+        with pytest.raises(ValueError):
+            validate_compression(bad_compression)
+
+    def test_gzip_round_trip(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "filing.txt")
+        with open_compressed(compressed_path(path, "gzip"), "gzip", level=1) as f:
+            f.write(b"<SEC-DOCUMENT>")
+        with gzip.open(path + ".gz") as f:
+            assert f.read() == b"<SEC-DOCUMENT>"
+        with open_filing(path, "rt", encoding="utf-8") as f:
+            assert f.read() == "<SEC-DOCUMENT>"
+
+    def test_zstd_round_trip(self, tmp_data_directory):
+        pytest.importorskip("zstandard")
+        path = os.path.join(tmp_data_directory, "zstd_filing.txt")
+        with open_compressed(compressed_path(path, "zstd"), "zstd") as f:
+            f.write(b"<SEC-DOCUMENT>")
+        with open_filing(path) as f:
+            assert f.read() == b"<SEC-DOCUMENT>"
+
+    def test_open_uncompressed_filing(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "plain_filing.txt")
+        with open_compressed(path) as f:
+            f.write(b"plain")
+        with open_filing(path) as f:
+            assert f.read() == b"plain"
+
+    def test_open_filing_bad_mode(self, tmp_data_directory):
+        with pytest.raises(ValueError):
+            open_filing(os.path.join(tmp_data_directory, "plain_filing.txt"), "w")
+
+
+class TestSinks:
+
+    def test_base_sink_stores_nothing(self):
+        with pytest.raises(NotImplementedError):
+            StorageSink().store("filing.txt", io.BytesIO(b""))
+
+    def test_file_system_sink(self):
+        assert FileSystemSink().location(os.path.join("a", "b.txt")) == os.path.join("a", "b.txt")
+
+    def test_sharded_sink(self):
+        sink = ShardedFileSystemSink(levels=2, width=2)
+        location = sink.location(os.path.join("root", "320193", "filing.txt"))
+        directory, name = os.path.split(location)
+        shards = os.path.relpath(directory, os.path.join("root", "320193")).split(os.sep)
+        assert name == "filing.txt"
+        assert [len(shard) for shard in shards] == [2, 2]
+        assert sink.location(os.path.join("other", "filing.txt")).endswith(
+            os.path.join(*shards, "filing.txt"))
+
+    def test_bad_sharding(self):
+        with pytest.raises(ValueError):
+            ShardedFileSystemSink(levels=0)
+
+    def test_zip_sink(self, tmp_data_directory):
+        sink = ZipArchiveSink(tmp_data_directory)
+        path = os.path.join(tmp_data_directory, "20201001", "320193", "filing.txt")
+        sink.store(path, io.BytesIO(b"first"))
+        sink.store(path, io.BytesIO(b"second"))  # already in archive
+        sink.flush()
+        archive = os.path.join(tmp_data_directory, "20201001.zip")
+        with zipfile.ZipFile(archive) as f:
+            assert f.namelist() == ["320193/filing.txt"]
+        # Archives are appended to by later runs
+        other = os.path.join(tmp_data_directory, "20201001", "789019", "filing.txt")
+        with ZipArchiveSink(tmp_data_directory) as sink:
+            sink.store(other, io.BytesIO(b"other"))
+            assert sink.read(path) == b"first"
+        assert sink.read(other) == b"other"
+
+    def test_zip_sink_reads_open_archive(self, tmp_data_directory):
+        path = os.path.join(tmp_data_directory, "20201001", "320193", "filing.txt")
+        other = os.path.join(tmp_data_directory, "20201001", "789019", "filing.txt")
+        with ZipArchiveSink(tmp_data_directory) as sink:
+            sink.store(path, io.BytesIO(b"first"))
+            assert sink.read(path) == b"first"
+            sink.store(other, io.BytesIO(b"other"))
+            with pytest.raises(KeyError):
+                sink.read(os.path.join(tmp_data_directory, "20201001", "1", "missing.txt"))
+        with zipfile.ZipFile(os.path.join(tmp_data_directory, "20201001.zip")) as f:
+            assert f.testzip() is None
+            assert sorted(f.namelist()) == ["320193/filing.txt", "789019/filing.txt"]
+
+    @pytest.mark.parametrize("existing", [True, False])
+    def test_zip_sink_crash_recovered(self, tmp_data_directory, existing):
+        path = os.path.join(tmp_data_directory, "20201001", "320193", "filing.txt")
+        other = os.path.join(tmp_data_directory, "20201001", "789019", "filing.txt")
+        archive = os.path.join(tmp_data_directory, "20201001.zip")
+        if existing:
+            with ZipArchiveSink(tmp_data_directory) as sink:
+                sink.store(path, io.BytesIO(b"first"))
+            with open(archive, "rb") as f:
+                before = f.read()
+        crashed = multiprocessing.Process(target=_store_and_crash,
+                                          args=(tmp_data_directory, other))
+        crashed.start()
+        crashed.join()
+        assert crashed.exitcode == 1
+        assert os.path.exists(archive + ".journal")
+        sink = ZipArchiveSink(tmp_data_directory)
+        with pytest.raises(KeyError):
+            sink.read(other)
+        assert not os.path.exists(archive + ".journal")
+        if existing:
+            with open(archive, "rb") as f:
+                assert f.read() == before
+        else:
+            assert not os.path.exists(archive)
+        with sink:
+            sink.store(other, io.BytesIO(b"other"))
+        assert sink.read(other) == b"other"
+
+    def test_zip_sink_depth(self, tmp_data_directory):
+        sink = ZipArchiveSink(tmp_data_directory, depth=2)
+        assert sink.split(os.path.join(tmp_data_directory, "2020", "QTR4", "1", "f.txt")) == (
+            os.path.join(sink.root, "2020", "QTR4.zip"), "1/f.txt")
+
+    @pytest.mark.parametrize("path", [os.path.join("elsewhere", "1", "f.txt"), "f.txt"])
+    def test_zip_sink_bad_path(self, tmp_data_directory, path):
+        sink = ZipArchiveSink(os.path.join(tmp_data_directory, "root"))
+        with pytest.raises(ValueError):
+            sink.split(os.path.join(tmp_data_directory, "root", os.pardir, path))
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_sqlite_sink(self, tmp_data_directory, compression):
+        database = os.path.join(tmp_data_directory, "filings.db")
+        path = os.path.join(tmp_data_directory, "320193", "filing.txt")
+        with SQLiteSink(database, root=tmp_data_directory, compression=compression,
+                        commit_every=1) as sink:
+            sink.store(path, io.BytesIO(b"<SEC-DOCUMENT>"))
+        sink = SQLiteSink(database, root=tmp_data_directory)
+        assert sink.paths() == ["320193/filing.txt"]
+        assert sink.read(path) == b"<SEC-DOCUMENT>"
+        with pytest.raises(KeyError):
+            sink.read("missing.txt")
+        sink.close()
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_sqlite_sink_streams_large_filings(self, tmp_data_directory, compression):
+        database = os.path.join(tmp_data_directory, "large.db")
+        content = os.urandom(1000)
+        path = os.path.join(tmp_data_directory, "320193", "filing.txt")
+        with SQLiteSink(database, root=tmp_data_directory, compression=compression) as sink:
+            sink.CHUNK_SIZE = 64  # write blob in chunks
+            sink.store(path, io.BufferedReader(io.BytesIO(content)))
+            assert sink.read(path) == content
+
+
+class TestDownloadToSink:
+
+    @pytest.fixture
+    def mock_download(self, monkeypatch):
+        monkeypatch.setattr(NetworkClient, "_request_async", staticmethod(
+            lambda link, *args, **kwargs: AsyncMockResponse(content=link.encode())))
+
+    def inputs(self, directory):
+        return [(BASE + "{0}/{0}-20-000001.txt".format(cik),
+                 os.path.join(directory, "20201001", cik, "filing.txt"))
+                for cik in ("320193", "789019")]
+
+    def test_download_to_zip(self, mock_download, mock_user_agent, tmp_data_directory):
+        sink = ZipArchiveSink(tmp_data_directory)
+        client = NetworkClient(user_agent=mock_user_agent, storage=sink, chunk_size=8)
+        inputs = self.inputs(tmp_data_directory)
+        report = asyncio.run(client.wait_for_download_async(inputs))
+        assert report.failures == []
+        assert os.listdir(tmp_data_directory) == ["20201001.zip"]
+        for link, path in inputs:
+            assert sink.read(path) == link.encode()
+
+    def test_download_to_sharded(self, mock_download, mock_user_agent, tmp_data_directory):
+        sink = ShardedFileSystemSink()
+        client = NetworkClient(user_agent=mock_user_agent)
+        inputs = self.inputs(tmp_data_directory)
+        asyncio.run(client.wait_for_download_async(inputs, storage=sink))
+        for link, path in inputs:
+            with open(sink.location(path), "rb") as f:
+                assert f.read() == link.encode()
+            assert not os.path.exists(path)
+
+    def test_compression_needs_file_system(self, mock_user_agent, tmp_data_directory):
+        client = NetworkClient(user_agent=mock_user_agent,
+                               storage=ZipArchiveSink(tmp_data_directory))
+        with pytest.raises(ValueError):
+            asyncio.run(client.wait_for_download_async([], compression="gzip"))
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import shutil
+from datetime import date
+
+import aiohttp
+import pytest
+
+from secedgar.client import AsyncNetworkClient, NetworkClient
+from secedgar.core.daily import DailyFilings
+from secedgar.exceptions import EDGARQueryError
+from secedgar.tests.utils import MockResponse, datapath
+from secedgar.transport import FallbackTransport, HTTPTransport, MirrorTransport
+
+BASE = "https://www.sec.gov/"
+DAILY_INDEX = "Archives/edgar/daily-index/2018/QTR4/"
+
+
+@pytest.fixture
+def client(mock_user_agent):
+    return NetworkClient(user_agent=mock_user_agent)
+
+
+@pytest.fixture
+def mirror(tmp_data_directory):
+    root = os.path.join(tmp_data_directory, "mirror")
+    os.makedirs(os.path.join(root, *DAILY_INDEX.split("/")))
+    shutil.copyfile(datapath("filings", "daily", "master.20181231.idx"),
+                    os.path.join(root, *DAILY_INDEX.split("/"), "master.20181231.idx"))
+    filing_dir = os.path.join(root, "Archives", "edgar", "data", "1000228")
+    os.makedirs(filing_dir)
+    with open(os.path.join(filing_dir, "0001209191-18-064398.txt"), "wb") as f:
+        f.write(b"<SEC-DOCUMENT>mirrored")
+    return MirrorTransport(root)
+
+
+class RecordingTransport(HTTPTransport):
+    """HTTP transport which records requests instead of sending them."""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, client, url, **kwargs):
+        self.urls.append(url)
+        return MockResponse(content=b"from network")
+
+    async def get_async(self, client, url, **kwargs):
+        return self.get(client, url, **kwargs)
+
+
+class TestMirrorTransport:
+
+    def test_root_must_exist(self, tmp_data_directory):
+        with pytest.raises(ValueError):
+            MirrorTransport(os.path.join(tmp_data_directory, "does_not_exist"))
+
+    def test_get_file(self, mirror, client):
+        url = BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+        assert mirror.is_local(url)
+        response = mirror.get(client, url)
+        assert response.status_code == 200
+        assert response.content == b"<SEC-DOCUMENT>mirrored"
+        assert response.headers["Content-Length"] == "22"
+        assert "Last-Modified" in response.headers
+
+    def test_get_directory_listing(self, mirror, client):
+        response = mirror.get(client, BASE + DAILY_INDEX)
+        assert response.status_code == 200
+        assert "master.20181231.idx" in response.text
+
+    @pytest.mark.parametrize("url,params", [
+        (BASE + "Archives/edgar/data/1/missing.txt", None),
+        (BASE + "cgi-bin/browse-edgar", {"action": "getcompany"}),
+        (BASE + "Archives/../../etc/passwd", None),
+        ("https://example.com/Archives/edgar/", None),
+    ])
+    def test_not_in_mirror(self, mirror, client, url, params):
+        assert not mirror.is_local(url, params)
+        assert mirror.get(client, url, params=params).status_code == 404
+
+    def test_get_streamed(self, mirror, client):
+        response = mirror.get(client, BASE + DAILY_INDEX + "master.20181231.idx", stream=True)
+        assert not response._content_consumed
+        with response:
+            body = b"".join(response.iter_content(100))
+        assert body.startswith(b"Description:")
+        assert response.raw.closed
+
+    def test_error_page_validated(self, mirror, client):
+        with open(os.path.join(mirror.root, "error.html"), "w") as f:
+            f.write("<html>No matching CIK.</html>")
+        with pytest.raises(EDGARQueryError):
+            mirror.get(client, BASE + "error.html")
+
+    @pytest.mark.parametrize("headers,status,expected", [
+        ({"Range": "bytes=14-"}, 206, b"mirrored"),
+        ({"Range": "bytes=14-", "If-Range": '"other"'}, 200, b"<SEC-DOCUMENT>mirrored"),
+        ({}, 200, b"<SEC-DOCUMENT>mirrored"),
+    ])
+    def test_open_async_range(self, mirror, client, headers, status, expected):
+        url = BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+
+        async def read():
+            async with mirror.open_async(client, url, None, headers=headers) as response:
+                body = b"".join([chunk async for chunk in response.content.iter_chunked(4)])
+                return response, body
+
+        response, body = asyncio.run(read())
+        assert response.status == status
+        assert body == expected
+        if status == 206:
+            assert response.headers["Content-Range"] == "bytes 14-21/22"
+
+    def test_open_async_range_past_end(self, mirror, client):
+        url = BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+        with pytest.raises(aiohttp.ClientResponseError) as e:
+            mirror.open_async(client, url, None, headers={"Range": "bytes=22-"})
+        assert e.value.status == 416
+
+    def test_open_async_missing_raises(self, mirror, client):
+        with pytest.raises(aiohttp.ClientResponseError):
+            mirror.open_async(client, BASE + "Archives/missing.txt", None)
+
+
+class TestFallbackTransport:
+
+    def test_needs_transport(self):
+        with pytest.raises(ValueError):
+            FallbackTransport([])
+
+    def test_mirror_first_then_network(self, mirror, client):
+        network = RecordingTransport()
+        transport = FallbackTransport([mirror, network])
+        local_url = BASE + DAILY_INDEX + "master.20181231.idx"
+        remote_url = BASE + DAILY_INDEX + "master.20181228.idx"
+        assert transport.is_local(local_url)
+        assert b"Company Name" in transport.get(client, local_url).content
+        assert transport.get(client, remote_url).content == b"from network"
+        assert network.urls == [remote_url]
+
+
+class TestClientWithMirror:
+
+    def test_local_requests_skip_limiter(self, mock_user_agent, mirror):
+        client = NetworkClient(user_agent=mock_user_agent, rate_limit=1, transport=mirror)
+        for _ in range(3):
+            assert client._send(BASE + DAILY_INDEX).status_code == 200
+        assert client.limiter.reserve() == 0
+
+    def test_daily_filings_read_from_mirror(self, mock_user_agent, mirror):
+        network = RecordingTransport()
+        client = AsyncNetworkClient(user_agent=mock_user_agent,
+                                    transport=FallbackTransport([mirror, network]))
+        filings = DailyFilings(date(2018, 12, 31), client=client)
+        urls = asyncio.run(filings.get_urls_async(client))
+        assert (BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+                in urls["1000228"])
+        assert network.urls == []
+
+    def test_download_from_mirror(self, mock_user_agent, mirror, tmp_data_directory):
+        client = NetworkClient(user_agent=mock_user_agent, chunk_size=4, transport=mirror)
+        path = os.path.join(tmp_data_directory, "from_mirror", "filing.txt")
+        url = BASE + "Archives/edgar/data/1000228/0001209191-18-064398.txt"
+        report = asyncio.run(client.wait_for_download_async([(url, path)]))
+        assert report.failures == []
+        with open(path, "rb") as f:
+            assert f.read() == b"<SEC-DOCUMENT>mirrored"
+
+    def test_from_client_shares_transport(self, mock_user_agent, mirror):
+        client = NetworkClient(user_agent=mock_user_agent, transport=mirror)
+        assert AsyncNetworkClient.from_client(client).transport is mirror
+
+    def test_default_transport_is_http(self, client):
+        assert isinstance(client.transport, HTTPTransport)
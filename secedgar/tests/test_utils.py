@@ -136,3 +136,13 @@ class TestUtils:
             assert os.path.exists(path_expanded)
         finally:
             os.rmdir(path_expanded)
+
+    def test_run_sync(self):
+        async def value():
+            return 1
+
+        async def nested():  # event loop already running
+            return utils.run_sync(value())
+
+        assert utils.run_sync(value()) == 1
+        assert utils.run_sync(nested()) == 1
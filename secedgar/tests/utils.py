@@ -32,6 +32,39 @@ class MockResponse(requests.Response):
         return self
 
 
+def mock_idx_stream(monkeypatch, cls, content, chunk_size=1000):
+    """Stream ``content`` in chunks instead of fetching idx files of ``cls``.
+
+    Chunks are small, so that lines are split across chunks like on the network.
+    """
+    def chunks():
+        return [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    async def stream_async():
+        for chunk in chunks():
+            yield chunk
+
+    async def iter_master_idx_file_async(*args, **kwargs):
+        return stream_async()
+
+    monkeypatch.setattr(cls, "_iter_master_idx_file", lambda *args, **kwargs: iter(chunks()))
+    monkeypatch.setattr(cls, "_iter_master_idx_file_async", iter_master_idx_file_async)
+
+
+class AsyncMockStreamReader:
+    """Mimics ``aiohttp.StreamReader`` for given content."""
+
+    def __init__(self, content):
+        self._content = content
+
+    async def read(self):
+        return self._content
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self._content), n):
+            yield self._content[i:i + n]
+
+
 class AsyncMockResponse(MockResponse):
     def __init__(self, datapath_args=[],
                  status_code=200,
@@ -55,6 +88,14 @@ class AsyncMockResponse(MockResponse):
     async def read(self):
         return self._content
 
+    @property
+    def status(self):
+        return self.status_code
+
+    @property
+    def content(self):
+        return AsyncMockStreamReader(self._content)
+
 
 class AsyncLimitedResponsesSession:
     def __init__(self, response=AsyncMockResponse(content=bytes("Testing...", "utf-8")), limit=10):
@@ -0,0 +1,348 @@
+"""Transports used by :class:`secedgar.client.NetworkClient` to fetch EDGAR resources."""
+import asyncio
+import email.utils
+import html
+import io
+import mimetypes
+import os
+import re
+from abc import ABC, abstractmethod
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+EDGAR_BASE = "https://www.sec.gov/"
+"""Base of all URLs built by :class:`secedgar.client.NetworkClient`."""
+
+
+class Transport(ABC):
+    """Abstract base class for ways of fetching EDGAR URLs.
+
+    Transports are given the client making the request, so they can use its sessions.
+    URLs served locally (see :meth:`is_local`) do not count towards the client's rate limit.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def is_local(self, url, params=None):
+        """Whether ``url`` is served without sending a request to EDGAR.
+
+        Args:
+            url (str): Full URL without query string.
+            params (dict, optional): Query parameters. Defaults to None.
+
+        Returns:
+            bool: True if the resource is available locally.
+        """
+        return False
+
+    @abstractmethod
+    def get(self, client, url, **kwargs):
+        """Fetch ``url`` synchronously.
+
+        Args:
+            client (secedgar.client.NetworkClient): Client making the request.
+            url (str): Full URL without query string.
+            kwargs: Keyword arguments accepted by ``requests.Session.get``.
+
+        Returns:
+            response (requests.Response): Response for ``url``.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def get_async(self, client, url, **kwargs):
+        """Fetch ``url`` asynchronously.
+
+        Args:
+            client (secedgar.client.AsyncNetworkClient): Client making the request.
+            url (str): Full URL without query string.
+            kwargs: Keyword arguments accepted by ``aiohttp.ClientSession.get``.
+
+        Returns:
+            response (requests.Response): Response for ``url`` with its body read.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def open_async(self, client, url, session, headers=None):
+        """Start streaming ``url`` asynchronously.
+
+        Args:
+            client (secedgar.client.NetworkClient): Client making the request.
+            url (str): URL to stream.
+            session (aiohttp.ClientSession): Session used for downloads.
+            headers (dict, optional): Extra headers to send. Defaults to None.
+
+        Returns:
+            Asynchronous context manager giving a response with ``status``, ``headers`` and
+            ``content.iter_chunked``, like ``aiohttp.ClientResponse``. Responses with an
+            error status raise ``aiohttp.ClientResponseError``.
+        """
+        pass  # pragma: no cover
+
+
+class HTTPTransport(Transport):
+    """Fetch URLs from EDGAR over HTTP. This is the default transport.
+
+    Args:
+        base (str, optional): Server to send requests to instead of ``https://www.sec.gov/``,
+            e.g. a proxy or the simulator in ``secedgar.tests.simulator``. URLs starting
+            with ``https://www.sec.gov/`` are rewritten to start with ``base``.
+            Defaults to None (requests go to EDGAR).
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, base=None):
+        self.base = base
+
+    def _rewrite(self, url):
+        if self.base is not None and url.startswith(EDGAR_BASE):
+            return self.base + url[len(EDGAR_BASE):]
+        return url
+
+    def get(self, client, url, **kwargs):
+        """Fetch ``url`` with the client's pooled ``requests.Session``."""
+        return client.session.get(self._rewrite(url), **kwargs)
+
+    async def get_async(self, client, url, **kwargs):
+        """Fetch ``url`` with the client's pooled ``aiohttp.ClientSession``."""
+        return await client._get_async(self._rewrite(url), **kwargs)
+
+    def open_async(self, client, url, session, headers=None):
+        """Start get request for ``url`` using ``session``."""
+        return client._request_async(self._rewrite(url), session, headers=headers)
+
+
+class _MirrorFile(io.BufferedReader):
+    """File used as ``raw`` of a response, closed by ``requests.Response.close``."""
+
+    def release_conn(self):
+        self.close()
+
+
+class _MirrorStreamReader:
+    """Read file in chunks on the default executor, like ``aiohttp.StreamReader``."""
+
+    def __init__(self, path, offset=0):
+        self._path = path
+        self._offset = offset
+
+    async def iter_chunked(self, n):
+        loop = asyncio.get_running_loop()
+        f = await loop.run_in_executor(None, open, self._path, "rb")
+        try:
+            f.seek(self._offset)
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, n)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            f.close()
+
+
+class _MirrorStreamResponse:
+    """Asynchronous context manager streaming a file of a :class:`MirrorTransport`."""
+
+    def __init__(self, url, path, headers, status=200, offset=0):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = _MirrorStreamReader(path, offset)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class MirrorTransport(Transport):
+    """Serve URLs from a local mirror of the SEC's website.
+
+    The mirror is a directory laid out like ``https://www.sec.gov/``, e.g. a daily index is
+    expected at ``<root>/Archives/edgar/daily-index/2020/QTR4/master.20201113.idx``. Requests
+    for directories are answered with a generated listing of their files. Requests with
+    query parameters (e.g. ``cgi-bin/browse-edgar``) and files missing from the mirror get
+    a 404 response, so combine this transport with :class:`HTTPTransport` using
+    :class:`FallbackTransport` for a partial mirror.
+
+    Args:
+        root (str): Directory containing the mirror.
+        base (str, optional): URL the mirror's root corresponds to.
+            Defaults to ``https://www.sec.gov/``.
+
+    Examples:
+        .. code-block:: python
+
+            from secedgar.client import NetworkClient
+            from secedgar.transport import FallbackTransport, HTTPTransport, MirrorTransport
+
+            transport = FallbackTransport([MirrorTransport("/data/edgar"), HTTPTransport()])
+            client = NetworkClient(user_agent="Name (email)", transport=transport)
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, root, base=EDGAR_BASE):
+        self._root = os.path.abspath(os.path.expanduser(root))
+        if not os.path.isdir(self._root):
+            raise ValueError("Mirror root must be an existing directory. Given {0}.".format(root))
+        self._base = base
+
+    @property
+    def root(self):
+        """str: Directory containing the mirror."""
+        return self._root
+
+    def _local_path(self, url, params=None):
+        """Get path in mirror for ``url``, or None if it cannot be served from the mirror."""
+        if params or "?" in url or not url.startswith(self._base):
+            return None
+        relative = url[len(self._base):]
+        path = os.path.normpath(os.path.join(self._root, *relative.split("/")))
+        if path != self._root and not path.startswith(self._root + os.sep):
+            return None  # path escapes the mirror
+        return path
+
+    def is_local(self, url, params=None):
+        """Whether ``url`` exists in the mirror."""
+        path = self._local_path(url, params)
+        return path is not None and os.path.exists(path)
+
+    @staticmethod
+    def _file_headers(path):
+        stat = os.stat(path)
+        content_type = mimetypes.guess_type(path)[0] or "text/plain"
+        return CaseInsensitiveDict({
+            "Content-Type": content_type,
+            "Content-Length": str(stat.st_size),
+            "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+        })
+
+    @staticmethod
+    def _listing(url, path):
+        """Generate HTML listing of directory, similar to EDGAR's directory pages."""
+        rows = "\n".join(
+            '<tr><td><a href="{0}">{0}</a></td></tr>'.format(html.escape(name))
+            for name in sorted(os.listdir(path)))
+        return ("<html><head><title>Index of {0}</title></head><body>\n"
+                "<table>\n{1}\n</table>\n</body></html>\n").format(html.escape(url), rows)
+
+    def get(self, client, url, params=None, stream=False, **kwargs):
+        """Read ``url`` from the mirror.
+
+        Files are streamed from disk if ``stream`` is True. Like responses of
+        :class:`HTTPTransport`, responses are checked for EDGAR error messages.
+
+        Returns:
+            response (requests.Response): Response with status 200 if ``url`` is in the mirror,
+                otherwise 404.
+
+        Raises:
+            EDGARQueryError: If the mirrored file is an EDGAR error page.
+        """
+        response = requests.Response()
+        response.url = url
+        path = self._local_path(url, params)
+        if path is not None and os.path.isdir(path):
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict({"Content-Type": "text/html"})
+            response.raw = io.BytesIO(self._listing(url, path).encode("utf-8"))
+        elif path is not None and os.path.isfile(path):
+            response.status_code = 200
+            response.headers = self._file_headers(path)
+            response.raw = _MirrorFile(io.FileIO(path, "rb"))
+        else:
+            response.status_code = 404
+            response.reason = "Not Found"
+            response.raw = io.BytesIO(b"")
+        response.encoding = "utf-8"
+        if response.status_code == 200:
+            response.reason = "OK"
+        if not stream:
+            response.content  # read whole body, as requests does
+            response.raw.close()
+        return client._validate_response(response, stream=stream)
+
+    async def get_async(self, client, url, **kwargs):
+        """Read ``url`` from the mirror on the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.get(client, url, **kwargs))
+
+    def open_async(self, client, url, session, headers=None):
+        """Stream file for ``url`` from the mirror.
+
+        A ``Range`` header of the form ``bytes=<start>-`` is honored with status 206 and
+        only the rest of the file is sent, unless its ``If-Range`` does not match the
+        file's ``Last-Modified``, in which case the whole file is sent with status 200.
+
+        Raises:
+            aiohttp.ClientResponseError: If ``url`` is not a file in the mirror (404), or
+                the range starts past its end (416).
+        """
+        path = self._local_path(url)
+        if path is None or not os.path.isfile(path):
+            raise aiohttp.ClientResponseError(None, (), status=404,
+                                              message="Not found in mirror: {0}".format(url))
+        file_headers = self._file_headers(path)
+        headers = headers or {}
+        match = re.fullmatch(r"bytes=(\d+)-", headers.get("Range", "").strip())
+        if_range = headers.get("If-Range")
+        if match is None or (if_range is not None and
+                             if_range != file_headers["Last-Modified"]):
+            return _MirrorStreamResponse(url, path, file_headers)
+        start, size = int(match.group(1)), int(file_headers["Content-Length"])
+        if start >= size:
+            raise aiohttp.ClientResponseError(None, (), status=416,
+                                              message="Range not satisfiable: {0}".format(url))
+        file_headers["Content-Length"] = str(size - start)
+        file_headers["Content-Range"] = "bytes {0}-{1}/{2}".format(start, size - 1, size)
+        return _MirrorStreamResponse(url, path, file_headers, status=206, offset=start)
+
+
+class FallbackTransport(Transport):
+    """Use the first transport serving a URL locally, otherwise the last transport.
+
+    Args:
+        transports (list of Transport): Transports in order of preference. The last one
+            is used for everything not available locally, and is usually an
+            :class:`HTTPTransport`.
+
+    .. versionadded:: 0.7.0
+    """
+
+    def __init__(self, transports):
+        if not transports:
+            raise ValueError("FallbackTransport needs at least one transport.")
+        self._transports = list(transports)
+
+    @property
+    def transports(self):
+        """List[Transport]: Transports in order of preference."""
+        return self._transports
+
+    def _select(self, url, params=None):
+        for transport in self._transports[:-1]:
+            if transport.is_local(url, params):
+                return transport
+        return self._transports[-1]
+
+    def is_local(self, url, params=None):
+        """Whether any of the transports serves ``url`` locally."""
+        return any(t.is_local(url, params) for t in self._transports)
+
+    def get(self, client, url, **kwargs):
+        """Fetch ``url`` with the preferred transport serving it."""
+        return self._select(url, kwargs.get("params")).get(client, url, **kwargs)
+
+    async def get_async(self, client, url, **kwargs):
+        """Fetch ``url`` asynchronously with the preferred transport serving it."""
+        return await self._select(url, kwargs.get("params")).get_async(client, url, **kwargs)
+
+    def open_async(self, client, url, session, headers=None):
+        """Stream ``url`` with the preferred transport serving it."""
+        return self._select(url).open_async(client, url, session, headers=headers)
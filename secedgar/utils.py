@@ -1,5 +1,7 @@
+import asyncio
 import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
 def sanitize_date(date):
@@ -81,3 +83,24 @@ def add_quarter(year, quarter):
     else:
         quarter += 1
     return year, quarter
+
+
+def run_sync(coro):
+    """Run coroutine to completion from synchronous code.
+
+    Uses ``asyncio.run``, unless an event loop is already running in this thread (e.g. in
+    Jupyter), where ``asyncio.run`` raises ``RuntimeError``. The coroutine is then run in
+    its own event loop on a separate thread, and the calling thread waits for it.
+
+    Args:
+        coro (coroutine): Coroutine to run.
+
+    Returns:
+        Result of ``coro``.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()